@@ -1,120 +1,93 @@
+import importlib
 import os
-import sys
 import traceback
-import threading
-import time
 from flask import Flask, session
-from utils.database import Database
+from config import Config
+from utils.database import Database, init_app as init_database
+from models.category import get_category_catalog
+from utils.data_version import get_data_versions
+from utils.fragment_cache import init_app as init_fragment_cache, get_fragment_cache
+from utils.compression import init_app as init_compression
+from utils.assets import init_app as init_assets
+from utils.startup import StartupProfile
+from utils.timing import init_app as init_timing, get_route_latencies
+from utils.metrics import init_app as init_metrics
 
 # ✅ CONFIGURACIÓN OBLIGATORIA PARA RAILWAY
 os.environ['FLASK_APP'] = 'app.py'
 os.environ['FLASK_RUN_PORT'] = '5000'
 
+# Controladores de la aplicación: (módulo, clase). Se instancian al registrarlos,
+# no al importar el módulo
+CONTROLLERS = [
+    ('controllers.auth_controller', 'AuthController'),
+    ('controllers.dashboard_controller', 'DashboardController'),
+    ('controllers.income_controller', 'IncomeController'),
+    ('controllers.expense_controller', 'ExpenseController'),
+    ('controllers.budget_controller', 'BudgetController'),
+    ('controllers.savings_controller', 'SavingsController'),
+    ('controllers.admin_controller', 'AdminController'),
+]
+
+def register_controllers(app):
+    """Crear los controladores y registrar sus blueprints; un controlador roto no
+    tumba el resto. Quedan en ``app.extensions['controllers']`` por blueprint."""
+    controllers = app.extensions.setdefault('controllers', {})
+    for module_name, class_name in CONTROLLERS:
+        try:
+            controller = getattr(importlib.import_module(module_name), class_name)()
+            app.register_blueprint(controller.bp)
+            controllers[controller.bp.name] = controller
+        except Exception as e:
+            print(f"❌ Error registrando {module_name}: {e}")
+            traceback.print_exc()
+    return len(controllers)
+
 def create_app():
-    start_time = time.time()
-    
-    # ✅ DEBUG INICIAL
-    print("=== 🐛 INICIANDO DEBUG INTEGRADO ===")
-    print(f"📁 Directorio actual: {os.getcwd()}")
-    print(f"🐍 Python path: {sys.path}")
-    print(f"📋 Archivos en directorio: {os.listdir('.')}")
+    profile = StartupProfile()
     
-    app = Flask(__name__, 
-                template_folder='templates',
-                static_folder='static')
+    with profile.step('flask'):
+        app = Flask(__name__, 
+                    template_folder='templates',
+                    static_folder='static')
     
     # ✅ CONFIGURACIÓN AUTOMÁTICA PARA RAILWAY Y LOCAL
-    print("\n=== 🔍 DETECTANDO ENTORNO ===")
-    
-    # Detectar si estamos en Railway
-    is_railway = 'RAILWAY_ENVIRONMENT' in os.environ or 'PORT' in os.environ
+    is_railway = Config.IS_RAILWAY
     
     if is_railway:
-        print("🟢 Entorno: Railway (Producción)")
         # Configuración para Railway
         app.secret_key = os.getenv('SECRET_KEY', 'clave-secreta-railway-123')
         app.config['DEBUG'] = False
         
     else:
-        print("🔵 Entorno: Local (Desarrollo)")
         # Configuración para desarrollo local
         app.secret_key = 'clave-secreta-local-123'
         app.config['DEBUG'] = True
     
-    print("=== ✅ CONFIGURACIÓN COMPLETADA ===\n")
-    
-    # ✅ VERIFICACIÓN DE CONEXIÓN A BASE DE DATOS (NO BLOQUEANTE)
-    print("🗄️ Iniciando verificación de base de datos (no bloqueante)...")
-    
-    def check_database():
-        """Función para verificar BD en segundo plano"""
-        try:
-            print("   🔍 Importando Database...")
-            from utils.database import Database
-            db = Database()
-            print("   ✅ Database importado e instanciado")
-            
-            # Probar conexión simple
-            print("   🔌 Probando conexión a MySQL...")
-            result = db.execute_query("SELECT 1", fetch_one=True)
-            print(f"   🎉 Conexión a base de datos exitosa: {result}\n")
-            return True
-            
-        except Exception as e:
-            print(f"   ⚠️ Error en conexión a BD: {e}")
-            print("   💡 La aplicación continuará, pero algunas funciones pueden no estar disponibles")
-            print("   🔧 Verifica la configuración de MySQL en Railway\n")
-            return False
-    
-    # Ejecutar la verificación en un hilo para no bloquear el inicio
-    db_thread = threading.Thread(target=check_database, daemon=True)
-    db_thread.start()
-    
-    # ✅ REGISTRO DE CONTROLADORES (PRIMERO, PARA INICIO RÁPIDO)
-    print("🚀 Registrando controladores (inicio rápido)...")
-    
-    try:
-        # DEBUG: Verificar carpeta controllers
-        if os.path.exists('controllers'):
-            print("✅ Carpeta 'controllers' encontrada")
-            controller_files = os.listdir('controllers')
-            print(f"📁 Archivos en controllers: {controller_files}")
-        else:
-            print("❌ Carpeta 'controllers' NO encontrada")
+    with profile.step('extensiones'):
+        # ✅ TIEMPOS POR PETICIÓN (Server-Timing, log ⏱️ e histograma por ruta)
+        # Antes que la base de datos: sus hooks corren después y cuentan el commit
+        init_timing(app)
         
-        # Importar controladores con manejo de errores individual
-        controllers_to_import = [
-            ('auth_controller', 'auth_controller'),
-            ('dashboard_controller', 'dashboard_controller'),
-            ('income_controller', 'income_controller'),
-            ('expense_controller', 'expense_controller'),
-            ('budget_controller', 'budget_controller'),
-            ('savings_controller', 'savings_controller'),
-            ('admin_controller', 'admin_controller')
-        ]
+        # ✅ MÉTRICAS DE PROMETHEUS EN /metrics (sumadas entre workers de gunicorn)
+        init_metrics(app)
         
-        registered_controllers = 0
+        # ✅ SESIÓN DE BASE DE DATOS POR PETICIÓN (commit antes de responder; 500 si falla)
+        # La primera conexión se abre con la primera petición que la necesita
+        init_database(app)
         
-        for controller_file, controller_name in controllers_to_import:
-            try:
-                module = __import__(f'controllers.{controller_file}', fromlist=[controller_name])
-                controller = getattr(module, controller_name)
-                app.register_blueprint(controller.bp)
-                print(f"✅ {controller_file} registrado")
-                registered_controllers += 1
-            except ImportError as e:
-                print(f"❌ Error importando {controller_file}: {e}")
-            except AttributeError as e:
-                print(f"❌ Error en estructura de {controller_file}: {e}")
-            except Exception as e:
-                print(f"❌ Error inesperado en {controller_file}: {e}")
+        # ✅ {% cache %} EN PLANTILLAS (fragmentos renderizados por usuario)
+        init_fragment_cache(app)
         
-        print(f"📊 Controladores registrados: {registered_controllers}/{len(controllers_to_import)}\n")
+        # ✅ COMPRESIÓN GZIP/BROTLI DE HTML Y JSON (after_request)
+        init_compression(app)
         
-    except Exception as e:
-        print(f"❌ Error general en controladores: {e}")
-        traceback.print_exc()
-        print("🔧 Continuando con la aplicación...\n")
+        # ✅ ASSETS PROPIOS CON HASH Y CACHÉ INMUTABLE (build_assets.py)
+        init_assets(app)
+    
+    # ✅ REGISTRO DE CONTROLADORES (bcrypt y la analítica de admin se cargan en su primer uso)
+    with profile.step('controladores'):
+        registered = register_controllers(app)
     
     # ✅ CONTEXT PROCESSORS
     @app.context_processor
@@ -131,9 +104,8 @@ def create_app():
     def debug_info():
         info = {
             'directorio_actual': os.getcwd(),
-            'archivos': os.listdir('.'),
             'entorno': 'railway' if is_railway else 'local',
-            'python_path': sys.path,
+            'arranque': profile.as_dict(),
             'status': 'running',
             'port': os.environ.get('PORT'),
             'flask_port': os.environ.get('FLASK_RUN_PORT')
@@ -143,7 +115,9 @@ def create_app():
     # ✅ RUTA DE HEALTH CHECK
     @app.route('/health')
     def health_check():
-        return {'status': 'healthy', 'message': 'App funcionando', 'environment': 'railway' if is_railway else 'local', 'port': os.environ.get('PORT')}
+        return {'status': 'healthy', 'message': 'App funcionando', 'environment': 'railway' if is_railway else 'local', 'port': os.environ.get('PORT'),
+                'db_pool': Database.pool_stats(), 'fragment_cache': get_fragment_cache().stats(),
+                'latencias': get_route_latencies().snapshot()}
     
     # ✅ NUEVA RUTA PARA VER ESTRUCTURA DE LA TABLA
     @app.route('/ver-estructura-tabla')
@@ -218,6 +192,11 @@ def create_app():
                 except Exception as e:
                     results.append(f"❌ {cmd} - Error: {e}")
             
+            # Los nombres e iconos pueden haber cambiado: recargar el catálogo de categorías
+            # y cambiar los ETag de las APIs (las respuestas incluyen la categoría)
+            get_category_catalog().invalidate()
+            get_data_versions().touch_all()
+            
             return "<br>".join(results)
             
         except Exception as e:
@@ -291,6 +270,10 @@ def create_app():
                         
             except Exception as e:
                 results.append(f"❌ Error en creación: {e}")
+            finally:
+                # Categorías creadas, borradas o con icono nuevo: recargar el catálogo
+                get_category_catalog().invalidate()
+                get_data_versions().touch_all()
             
             # 4. Verificar que se crearon correctamente
             try:
@@ -353,8 +336,9 @@ def create_app():
         </html>
         '''
     
-    end_time = time.time()
-    print(f"🌈 Aplicación Flask inicializada correctamente en {end_time - start_time:.2f} segundos")
+    app.extensions['startup_profile'] = profile
+    print(f"🌈 App lista ({'Railway' if is_railway else 'local'}, {registered}/{len(CONTROLLERS)} controladores) "
+          f"en {profile.report()}")
     return app
 
 # ✅ INSTANCIA PRINCIPAL
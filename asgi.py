@@ -0,0 +1,103 @@
+"""Servidor ASGI: APIs JSON asíncronas junto a la app Flask.
+
+Las APIs que sondean los navegadores (gastos, presupuestos, progreso y
+ahorros) solo esperan a MySQL. Aquí corren como corrutinas sobre el pool
+``aiomysql`` (``utils.async_database``): mientras una espera, el bucle atiende
+las demás, y unos pocos workers aguantan cientos de sondeos a la vez. Usan las
+mismas consultas (``*_query``) y el mismo JSON que las vistas síncronas.
+
+Todo lo demás pasa a la app Flask de siempre (``a2wsgi``, en un pool de hilos).
+
+    WEB_ASGI=1 gunicorn asgi:app -c gunicorn.conf.py
+    uvicorn asgi:app --port 5000          # desarrollo
+"""
+import io
+import traceback
+
+from a2wsgi import WSGIMiddleware
+from a2wsgi.wsgi import build_environ
+from flask import jsonify
+
+from app import app as flask_app
+from utils.async_database import get_async_database
+from utils.http_cache import conditional_on_user_data
+from utils.serving import worker_plan
+
+# Controladores que creó create_app(), por blueprint
+_controllers = flask_app.extensions['controllers']
+expense_controller = _controllers['expenses']
+budget_controller = _controllers['budgets']
+savings_controller = _controllers['savings']
+
+# Ruta -> vista asíncrona (mismas URL que las del blueprint correspondiente)
+ASYNC_ROUTES = {
+    '/expenses/api': conditional_on_user_data(expense_controller.api_expenses_async),
+    '/budgets/api': conditional_on_user_data(budget_controller.api_budgets_async),
+    '/budgets/api/progress': conditional_on_user_data(budget_controller.api_budget_progress_async),
+    '/savings/api': conditional_on_user_data(savings_controller.api_savings_async),
+}
+
+
+class AsyncApiApp:
+    """App ASGI: las rutas de ``routes`` con vistas asíncronas y el resto a Flask"""
+
+    def __init__(self, flask_app, routes, wsgi_threads=None):
+        self.flask_app = flask_app
+        self.routes = routes
+        self.wsgi = WSGIMiddleware(flask_app, workers=wsgi_threads or worker_plan()['threads'])
+        self.db = get_async_database()
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self.lifespan(receive, send)
+        view = self.routes.get(scope['path']) if scope['type'] == 'http' else None
+        if view is None or scope['method'] not in ('GET', 'HEAD'):
+            return await self.wsgi(scope, receive, send)
+        await self.dispatch(view, scope, send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                try:
+                    await self.db.start()
+                except Exception as e:
+                    # Sin MySQL al arrancar el pool se abrirá en la primera consulta
+                    print(f"⚠️ Pool asíncrono sin abrir: {e}")
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.db.close()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def dispatch(self, view, scope, send):
+        """Ejecutar la vista dentro de un contexto de petición de Flask (``request``,
+        ``session``, ``jsonify``) y aplicar los ``before_request`` y
+        ``after_request`` de la app (tiempos, compresión, cookie de sesión) como
+        haría Flask"""
+        environ = build_environ(scope, io.BytesIO(b''))
+        # Los contextos de Flask viven en contextvars: cada petición (tarea) tiene el suyo
+        with self.flask_app.request_context(environ):
+            try:
+                rv = self.flask_app.preprocess_request()
+                if rv is None:
+                    rv = await view()
+                response = self.flask_app.process_response(self.flask_app.make_response(rv))
+            except Exception as e:
+                # También un commit fallido en after_request: la respuesta pasa a ser un 500
+                print(f"❌ Error en API asíncrona {scope['path']}: {e}")
+                traceback.print_exc()
+                response = self.flask_app.make_response((jsonify({'error': 'Error interno'}), 500))
+                response = self.flask_app.process_response(response)
+
+            body = b'' if scope['method'] == 'HEAD' else response.get_data()
+            await send({
+                'type': 'http.response.start',
+                'status': response.status_code,
+                'headers': [(name.lower().encode('latin1'), value.encode('latin1'))
+                            for name, value in response.headers.items()],
+            })
+            await send({'type': 'http.response.body', 'body': body})
+
+
+app = AsyncApiApp(flask_app, ASYNC_ROUTES)
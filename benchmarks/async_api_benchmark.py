@@ -0,0 +1,142 @@
+"""APIs de sondeo: servidor síncrono (gthread) frente al asíncrono (asgi.py) con MySQL real.
+
+Levanta uno tras otro, con los mismos workers:
+
+- ``sync``: ``gunicorn app:app -c gunicorn.conf.py`` (gthread)
+- ``async``: ``WEB_ASGI=1 gunicorn asgi:app -c gunicorn.conf.py`` (uvicorn + aiomysql)
+
+y reparte ``--concurrency`` clientes entre ``/expenses/api``, ``/budgets/api``,
+``/budgets/api/progress`` y ``/savings/api`` con la sesión de ``--user-id``
+(cookie firmada con la clave de la app, sin pasar por el login). Los clientes no
+mandan ``If-None-Match``: cada petición consulta MySQL.
+
+Necesita una base de datos MySQL/MariaDB local con el esquema de la app y
+datos para ese usuario; se configura como la app (``MYSQLHOST``,
+``MYSQLPORT``, ``MYSQLUSER``, ``MYSQLPASSWORD``, ``MYSQLDATABASE``). Con
+``--db-latency-ms`` las conexiones pasan por un proxy local que retrasa cada
+respuesta de MySQL, como una base de datos en otra máquina.
+
+Uso (desde la raíz del proyecto)::
+
+    python benchmarks/async_api_benchmark.py --user-id 1 [--concurrency 50 200] \\
+        [--workers 2] [--duration 15] [--db-latency-ms 5]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import urllib.error
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from load_test import print_result, run_load, start_server
+
+API_PATHS = ['/expenses/api', '/budgets/api', '/budgets/api/progress', '/savings/api']
+
+SERVERS = {
+    'sync': ['app:app', '-c', 'gunicorn.conf.py'],
+    'async': ['asgi:app', '-c', 'gunicorn.conf.py'],
+}
+
+
+def session_cookie(user_id):
+    """Cookie de sesión de Flask para ``user_id`` (misma clave que los servidores)"""
+    from app import app
+    serializer = app.session_interface.get_signing_serializer(app)
+    value = serializer.dumps({'user_id': user_id})
+    return f"{app.config['SESSION_COOKIE_NAME']}={value}"
+
+
+def check_session(base_url, headers):
+    """Salir si la API no responde 200 con la cookie (clave distinta, sin base de datos...)"""
+    request = urllib.request.Request(base_url + API_PATHS[-1], headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=30):
+            return
+    except urllib.error.HTTPError as e:
+        sys.exit(f"❌ {API_PATHS[-1]} respondió {e.code} con la sesión del benchmark")
+
+
+def latency_proxy(host, port, delay):
+    """Proxy TCP local hacia MySQL que retrasa ``delay`` segundos cada respuesta"""
+    ready = threading.Event()
+    address = {}
+
+    async def pipe(reader, writer, pause):
+        try:
+            while data := await reader.read(65536):
+                if pause:
+                    await asyncio.sleep(pause)
+                writer.write(data)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def handle(client_reader, client_writer):
+        try:
+            server_reader, server_writer = await asyncio.open_connection(host, port)
+        except OSError:
+            client_writer.close()
+            return
+        await asyncio.gather(pipe(client_reader, server_writer, 0), pipe(server_reader, client_writer, delay))
+
+    async def serve():
+        server = await asyncio.start_server(handle, '127.0.0.1', 0)
+        address['port'] = server.sockets[0].getsockname()[1]
+        ready.set()
+        async with server:
+            await server.serve_forever()
+
+    threading.Thread(target=asyncio.run, args=(serve(),), daemon=True).start()
+    ready.wait()
+    return address['port']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--user-id', type=int, required=True, help="usuario con datos en la base de datos")
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[50, 200], help="clientes simultáneos (uno o varios niveles)")
+    parser.add_argument('--workers', type=int, default=2, help="workers de cada servidor")
+    parser.add_argument('--duration', type=float, default=15, help="segundos de carga por medida")
+    parser.add_argument('--db-latency-ms', type=float, default=0, help="retraso añadido a cada respuesta de MySQL")
+    args = parser.parse_args()
+
+    # Modo Railway (PORT) para que la app lea MYSQLHOST/MYSQLPORT del entorno
+    env = dict(os.environ, PORT=os.environ.get('PORT', '5000'), WEB_CONCURRENCY=str(args.workers),
+               PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get('PYTHONPATH')])))
+    if args.db_latency_ms:
+        port = latency_proxy(env.get('MYSQLHOST', 'localhost'), int(env.get('MYSQLPORT', 3306)), args.db_latency_ms / 1000)
+        env.update(MYSQLHOST='127.0.0.1', MYSQLPORT=str(port))
+    os.environ.update(env)   # la cookie se firma con la misma configuración
+    headers = {'Cookie': session_cookie(args.user_id)}
+
+    print(f"📈 {', '.join(API_PATHS)}: {args.workers} workers por servidor, {args.duration:.0f} s por medida"
+          + (f", MySQL +{args.db_latency_ms:.0f} ms" if args.db_latency_ms else ""))
+    results = {}
+    for name in SERVERS:
+        server_env = dict(env, WEB_ASGI='1' if name == 'async' else '0')
+        process, base_url = start_server(name, server_env, API_PATHS[-1], servers=SERVERS)
+        try:
+            check_session(base_url, headers)
+            # Primera vuelta sin medir: pools abiertos y catálogo cargado en todos los workers
+            run_load(base_url, API_PATHS, len(API_PATHS) * args.workers, 2, headers=headers)
+            for concurrency in args.concurrency:
+                results[concurrency, name] = run_load(base_url, API_PATHS, concurrency, args.duration, headers=headers)
+        finally:
+            process.terminate()
+            process.wait(timeout=60)
+
+    for concurrency in args.concurrency:
+        print(f"\n   {concurrency} clientes")
+        print(f"   {'servidor':<10} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'máx ms':>9} "
+              f"{'errores':>8} {'lentas':>7}")
+        for name in SERVERS:
+            print_result(name, results[concurrency, name])
+
+if __name__ == '__main__':
+    main()
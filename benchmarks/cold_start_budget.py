@@ -0,0 +1,48 @@
+"""Presupuesto de arranque en frío: falla si ``import app`` se vuelve lento.
+
+Mide varias veces, cada una en un intérprete nuevo, lo que tarda en importarse
+la app (import de módulos + ``create_app``) y compara la mediana con el
+presupuesto. Sale con código 1 si lo supera; la misma comprobación corre con
+las pruebas (``tests/test_cold_start.py``). Con ``benchmarks/startup_profile.py``
+se ve qué lo ha encarecido.
+
+Uso (desde la raíz del proyecto)::
+
+    python benchmarks/cold_start_budget.py [--runs 5] [--budget-ms 1000]
+
+El presupuesto también se puede fijar con ``COLD_START_BUDGET_MS``.
+"""
+import argparse
+import os
+import statistics
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils.startup import COLD_START_BUDGET_MS, measure_cold_start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help="arranques a medir")
+    parser.add_argument('--budget-ms', type=float, default=COLD_START_BUDGET_MS,
+                        help="mediana máxima permitida en milisegundos")
+    args = parser.parse_args()
+
+    try:
+        timings = measure_cold_start(args.runs)
+    except RuntimeError as e:
+        sys.exit(f"❌ {e}")
+    median = statistics.median(timings)
+    print(f"⏱️ Arranque en frío ({args.runs} ejecuciones): mediana {median:.1f} ms, "
+          f"mín {min(timings):.1f} ms, máx {max(timings):.1f} ms")
+    if median > args.budget_ms:
+        print(f"❌ Supera el presupuesto de {args.budget_ms:.0f} ms")
+        return 1
+    print(f"✅ Dentro del presupuesto de {args.budget_ms:.0f} ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
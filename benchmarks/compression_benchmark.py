@@ -0,0 +1,131 @@
+"""Coste de CPU frente a bytes ahorrados al comprimir las respuestas reales.
+
+Renderiza las plantillas grandes (dashboard, gastos, ingresos, ahorros) con
+datos de ejemplo y el JSON de ``/expenses/api``, y mide para cada nivel de
+gzip (y de brotli si está instalado) el tamaño resultante y el tiempo medio
+de compresión. No necesita base de datos.
+
+Uso (desde la raíz del proyecto)::
+
+    python benchmarks/compression_benchmark.py [--rows 50] [--repeat 50]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import render_template, session
+
+from app import app
+from config import Config
+from utils import compression
+
+
+def sample_rows(n):
+    """Movimientos de ejemplo con la forma que entregan los modelos"""
+    today = date.today()
+    return [{
+        'id': i,
+        'concepto': f"Movimiento de ejemplo {i}",
+        'descripcion': "Compra semanal en el supermercado del barrio" if i % 3 == 0 else None,
+        'monto': 15000 + i * 1375,
+        'fecha': today - timedelta(days=i % 28),
+        'categoria_id': i % 8 + 1,
+        'categoria_nombre': ["Comida", "Transporte", "Ocio", "Salud", "Hogar", "Ropa", "Deporte", "Otros"][i % 8],
+        'color': ["#ef4444", "#3b82f6", "#10b981", "#f59e0b", "#8b5cf6", "#ec4899", "#14b8a6", "#6b7280"][i % 8],
+        'icono': "🍔",
+        'esencial': i % 2 == 0,
+    } for i in range(1, n + 1)]
+
+
+def sample_goals(n):
+    today = date.today()
+    return [{
+        'id': i,
+        'concepto': f"Meta de ahorro {i}",
+        'descripcion': "Ahorro para vacaciones" if i % 2 else None,
+        'meta_total': 1000000 + i * 50000,
+        'ahorrado_actual': 250000 + i * 30000,
+        'porcentaje_completado': min(100, 25 + i * 7),
+        'fecha_inicio': today - timedelta(days=90),
+        'fecha_objetivo': today + timedelta(days=30 * i),
+        'dias_restantes': 30 * i,
+        'completado': i % 5 == 0,
+    } for i in range(1, n + 1)]
+
+
+def render_payloads(rows):
+    """Cuerpos reales de las páginas y de la API (bytes, mimetype)"""
+    Config.FRAGMENT_CACHE = False
+    movimientos = sample_rows(rows)
+    metas = sample_goals(max(3, rows // 10))
+    mes = datetime.now().strftime('%Y-%m')
+    categories = [{'id': r['categoria_id'], 'nombre': r['categoria_nombre'], 'color': r['color'], 'icono': r['icono']}
+                  for r in movimientos[:8]]
+    summary = {'total_metas': len(metas), 'total_meta': 5000000, 'total_ahorrado': 1800000,
+               'porcentaje_total': 36.0, 'metas_completadas': 1, 'metas_vencidas': 0}
+    payloads = {}
+    with app.test_request_context('/'):
+        session.update({'user_id': 1, 'user_name': 'Usuario Ejemplo', 'user_role': 0})
+        payloads['dashboard/index.html'] = render_template(
+            'dashboard/index.html', total_ingresos=4500000, total_gastos=3200000, saldo=1300000,
+            ingresos_mes=1500000, gastos_mes=900000, ultimos_ingresos=movimientos[:5],
+            ultimos_gastos=movimientos[5:10], total_ahorros=1800000, meta_ahorros=5000000,
+            metas_activas=metas[:3], now=datetime.now())
+        payloads['transactions/expenses.html'] = render_template(
+            'transactions/expenses.html', expenses=movimientos, categories=categories, total_mes=900000,
+            total_general=3200000, total_registros=len(movimientos), saldo_actual=1300000,
+            mes_seleccionado=mes, next_cursor='abc', is_first_page=True, limit=rows, now=datetime.now())
+        payloads['incomes/index.html'] = render_template(
+            'incomes/index.html', incomes=movimientos, categories=categories, total_ingresos=4500000,
+            ingresos_mes=1500000, total_registros=len(movimientos), saldo_actual=1300000,
+            active_page='income', mes_actual=mes, mes_seleccionado=mes, next_cursor='abc',
+            is_first_page=True, limit=rows)
+        payloads['savings/index.html'] = render_template(
+            'savings/index.html', savings=metas, summary=summary, now=datetime.now())
+
+    api_rows = [dict(r, fecha=r['fecha'].strftime('%Y-%m-%d')) for r in movimientos]
+    payloads['/expenses/api (JSON)'] = json.dumps(
+        {'gastos': api_rows, 'next': 'abc', 'limit': rows, 'total_mes': 900000, 'total_registros': rows})
+    return {name: body.encode('utf-8') for name, body in payloads.items()}
+
+
+def measure(data, encoding, level, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        compressed = compression.compress(data, encoding, level)
+    return len(compressed), (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=50, help="filas por listado (por defecto 50, el tamaño de página)")
+    parser.add_argument('--repeat', type=int, default=50, help="repeticiones por medida")
+    args = parser.parse_args()
+
+    settings = [('gzip', level) for level in (1, 4, 6, 9)]
+    if compression.brotli is not None:
+        settings += [('br', quality) for quality in (1, 4, 5, 8, 11)]
+    else:
+        print("ℹ️ brotli no está instalado: solo se mide gzip\n")
+
+    for name, data in render_payloads(args.rows).items():
+        print(f"📄 {name}: {len(data):,} bytes")
+        print(f"   {'codificación':<10} {'bytes':>9} {'ratio':>7} {'ahorro':>9} {'ms':>8} {'KB ahorrados/ms CPU':>20}")
+        for encoding, level in settings:
+            size, ms = measure(data, encoding, level, args.repeat)
+            saved = len(data) - size
+            print(f"   {encoding + '-' + str(level):<10} {size:>9,} {size / len(data):>7.1%} "
+                  f"{saved:>9,} {ms:>8.3f} {saved / 1024 / ms if ms else 0:>20.1f}")
+        print()
+
+    print(f"⚙️ Configuración actual: mínimo {Config.COMPRESSION_MIN_SIZE} bytes, gzip-{Config.GZIP_LEVEL}, "
+          f"br-{Config.BROTLI_QUALITY} ({'disponible' if compression.brotli else 'no instalado'})")
+
+
+if __name__ == '__main__':
+    main()
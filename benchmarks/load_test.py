@@ -0,0 +1,185 @@
+"""Prueba de carga: rendimiento de la configuración de gunicorn anterior frente a ``gunicorn.conf.py``.
+
+Con ``--url`` carga un servidor ya levantado. Con ``--compare`` levanta uno
+tras otro, en local:
+
+- ``anterior``: ``gunicorn app:app --timeout 120 --workers 1 --preload`` (un
+  worker síncrono, lo que usaba Railway)
+- ``gthread``: ``gunicorn app:app -c gunicorn.conf.py``
+
+y mide en cada uno peticiones por segundo y latencias de ``--path``. Con
+``--slow-clients`` algunos clientes piden a la vez ``--slow-path``, una página
+que consulta MySQL; ``--slow-mysql N`` hace que los servidores hablen con un
+MySQL falso que tarda N segundos en contestar (simula una consulta lenta sin
+necesitar base de datos).
+
+Uso (desde la raíz del proyecto)::
+
+    python benchmarks/load_test.py --compare [--concurrency 20] [--duration 15]
+    python benchmarks/load_test.py --compare --slow-mysql 3 --slow-clients 2
+    python benchmarks/load_test.py --url http://localhost:5000 --path /login
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SERVERS = {
+    'anterior': ['app:app', '--timeout', '120', '--workers', '1', '--preload'],
+    'gthread': ['app:app', '-c', 'gunicorn.conf.py'],
+}
+
+
+def fetch(url, timeout, headers=None):
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, headers=headers or {}), timeout=timeout) as response:
+            response.read()
+            ok = response.status < 500
+    except urllib.error.HTTPError as e:
+        ok = e.code < 500
+    except OSError:
+        ok = False
+    return ok, (time.perf_counter() - start) * 1000
+
+
+def run_load(base_url, path, concurrency, duration, slow_path=None, slow_clients=0, timeout=30, headers=None):
+    """Clientes concurrentes pidiendo ``path`` durante ``duration`` segundos
+    (con una lista de rutas, cada cliente pide una, en rueda)"""
+    paths = [path] if isinstance(path, str) else list(path)
+    latencies, errors = [], []
+    slow_done = []
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def client(url):
+        while time.monotonic() < deadline:
+            ok, ms = fetch(url, timeout, headers)
+            with lock:
+                (latencies if ok else errors).append(ms)
+
+    def slow_client():
+        # Solo ocupan al servidor: su resultado (lento o con error) no cuenta
+        while time.monotonic() < deadline:
+            fetch(base_url + slow_path, timeout, headers)
+            with lock:
+                slow_done.append(1)
+
+    threads = [threading.Thread(target=client, args=(base_url + paths[i % len(paths)],)) for i in range(concurrency)]
+    threads += [threading.Thread(target=slow_client) for _ in range(slow_clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    ordered = sorted(latencies)
+
+    def pct(p):
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p))] if ordered else 0.0
+
+    return {
+        'peticiones': len(latencies),
+        'errores': len(errors),
+        'rps': len(latencies) / duration,
+        'p50': statistics.median(ordered) if ordered else 0.0,
+        'p95': pct(0.95),
+        'p99': pct(0.99),
+        'max': ordered[-1] if ordered else 0.0,
+        'lentas': len(slow_done),
+    }
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def slow_mysql(delay):
+    """MySQL falso: acepta la conexión y no contesta hasta pasados ``delay`` segundos"""
+    server = socket.socket()
+    server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    server.bind(('127.0.0.1', 0))
+    server.listen(128)
+
+    def stall(connection):
+        time.sleep(delay)
+        connection.close()
+
+    def accept():
+        while True:
+            connection, _ = server.accept()
+            threading.Thread(target=stall, args=(connection,), daemon=True).start()
+
+    threading.Thread(target=accept, daemon=True).start()
+    return server.getsockname()[1]
+
+
+def start_server(name, env, path, servers=SERVERS):
+    port = free_port()
+    command = [sys.executable, '-m', 'gunicorn', *servers[name], '--bind', f'127.0.0.1:{port}']
+    process = subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f'http://127.0.0.1:{port}'
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            sys.exit(f"❌ El servidor '{name}' terminó al arrancar: {' '.join(command)}")
+        if fetch(base_url + path, 2)[0]:
+            return process, base_url
+        time.sleep(0.25)
+    process.terminate()
+    sys.exit(f"❌ El servidor '{name}' no respondió en 60 s")
+
+
+def print_result(name, result):
+    print(f"   {name:<10} {result['rps']:>8.1f} {result['p50']:>8.1f} {result['p95']:>8.1f} "
+          f"{result['p99']:>8.1f} {result['max']:>9.1f} {result['errores']:>8} {result['lentas']:>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--url', help="servidor ya levantado (p. ej. http://localhost:5000)")
+    target.add_argument('--compare', action='store_true', help="levantar y comparar la configuración anterior y la nueva")
+    parser.add_argument('--path', default='/login', help="página a cargar (por defecto /login, sin base de datos)")
+    parser.add_argument('--concurrency', type=int, default=20, help="clientes simultáneos")
+    parser.add_argument('--duration', type=float, default=15, help="segundos de carga por servidor")
+    parser.add_argument('--slow-path', default='/ver-estructura-tabla', help="página que consulta MySQL")
+    parser.add_argument('--slow-clients', type=int, default=0, help="clientes pidiendo --slow-path a la vez")
+    parser.add_argument('--slow-mysql', type=float, default=0, help="segundos que tarda el MySQL falso (solo --compare)")
+    args = parser.parse_args()
+
+    load = dict(path=args.path, concurrency=args.concurrency, duration=args.duration,
+                slow_path=args.slow_path, slow_clients=args.slow_clients)
+    print(f"📈 {args.concurrency} clientes en {args.path} durante {args.duration:.0f} s"
+          + (f", {args.slow_clients} en {args.slow_path}" if args.slow_clients else ""))
+    print(f"   {'servidor':<10} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'máx ms':>9} "
+          f"{'errores':>8} {'lentas':>7}")
+
+    if args.url:
+        print_result('servidor', run_load(args.url.rstrip('/'), **load))
+        return
+
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get('PYTHONPATH')])))
+    if args.slow_mysql:
+        # Modo Railway para que la app lea MYSQLHOST/MYSQLPORT
+        env.update(PORT='5000', MYSQLHOST='127.0.0.1', MYSQLPORT=str(slow_mysql(args.slow_mysql)))
+    for name in SERVERS:
+        process, base_url = start_server(name, env, args.path)
+        try:
+            print_result(name, run_load(base_url, **load))
+        finally:
+            process.terminate()
+            process.wait(timeout=60)
+
+
+if __name__ == '__main__':
+    main()
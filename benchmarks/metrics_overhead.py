@@ -0,0 +1,115 @@
+"""Coste de la instrumentación (utils.timing y utils.metrics) en los caminos calientes.
+
+Cada configuración se mide en un intérprete nuevo (la configuración se lee al
+importar la app):
+
+- ``sin medir``: ``REQUEST_TIMING=0 METRICS=0``
+- ``tiempos``: Server-Timing e histograma por ruta, sin Prometheus
+- ``métricas``: lo anterior más Prometheus en un solo proceso
+- ``multiproceso``: Prometheus con ``PROMETHEUS_MULTIPROC_DIR`` (como con gunicorn)
+
+Para cada una se mide, sin MySQL, una petición de ejemplo por el cliente de
+pruebas de Flask (``--queries`` consultas anotadas como las del cursor, tres
+consultas a cachés y una respuesta JSON) y, por separado, el coste de anotar
+una consulta (``record_query``) y una consulta a caché (``record_cache``). La
+línea de log ``⏱️`` va desactivada salvo con ``--log`` (se manda a /dev/null).
+
+Uso (desde la raíz del proyecto)::
+
+    python benchmarks/metrics_overhead.py [--requests 3000] [--queries 8] [--rounds 5] [--log]
+"""
+import argparse
+import contextlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CONFIGS = {
+    'sin medir': {'REQUEST_TIMING': '0', 'METRICS': '0'},
+    'tiempos': {'REQUEST_TIMING': '1', 'METRICS': '0'},
+    'métricas': {'REQUEST_TIMING': '1', 'METRICS': '1'},
+    'multiproceso': {'REQUEST_TIMING': '1', 'METRICS': '1', 'PROMETHEUS_MULTIPROC_DIR': None},
+}
+
+
+def per_call_us(func, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def child(args):
+    """Medir dentro del intérprete hijo y escribir el resultado en JSON"""
+    sys.path.insert(0, ROOT)
+    with contextlib.redirect_stdout(open(os.devnull, 'w')):
+        from flask import jsonify
+        from app import app
+        from utils.metrics import record_cache
+        from utils.timing import record_query
+
+        @app.route('/_benchmark')
+        def benchmark_view():
+            for _ in range(args.queries):
+                record_query(0.001)
+            for cache in ('memo_peticion', 'fragmentos', 'categorias'):
+                record_cache(cache, True)
+            return jsonify({'ok': True, 'filas': list(range(50))})
+
+        client = app.test_client()
+        for _ in range(200):   # calentar
+            client.get('/_benchmark')
+        # Los print de la línea ⏱️ también van a /dev/null
+        rounds = [per_call_us(lambda: client.get('/_benchmark'), args.requests) for _ in range(args.rounds)]
+        query_us = statistics.median(per_call_us(lambda: record_query(0.001), 100_000) for _ in range(args.rounds))
+        cache_us = statistics.median(per_call_us(lambda: record_cache('memo_peticion', True), 100_000)
+                                     for _ in range(args.rounds))
+    print(json.dumps({'request_us': statistics.median(rounds), 'query_us': query_us, 'cache_us': cache_us}))
+
+
+def measure(name, overrides, args):
+    env = dict(os.environ, REQUEST_TIMING_LOG='1' if args.log else '0', WEB_WARMUP='0')
+    with tempfile.TemporaryDirectory() as multiproc_dir:
+        for key, value in overrides.items():
+            env[key] = multiproc_dir if value is None else value
+        if 'PROMETHEUS_MULTIPROC_DIR' not in overrides:
+            env.pop('PROMETHEUS_MULTIPROC_DIR', None)
+        command = [sys.executable, __file__, '--child', '--requests', str(args.requests),
+                   '--queries', str(args.queries), '--rounds', str(args.rounds)]
+        result = subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        sys.exit(f"❌ Falló la medida '{name}':\n{result.stderr[-2000:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=3000, help="peticiones por ronda")
+    parser.add_argument('--queries', type=int, default=8, help="consultas anotadas por petición")
+    parser.add_argument('--rounds', type=int, default=5, help="rondas (se toma la mediana)")
+    parser.add_argument('--log', action='store_true', help="incluir la línea de log por petición")
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return child(args)
+
+    print(f"📈 Petición de ejemplo con {args.queries} consultas y 3 cachés, "
+          f"{args.requests} peticiones × {args.rounds} rondas" + (", con log" if args.log else ""))
+    results = {name: measure(name, overrides, args) for name, overrides in CONFIGS.items()}
+    base = results['sin medir']['request_us']
+    print(f"\n   {'configuración':<14} {'µs/petición':>12} {'extra µs':>9} {'extra %':>8} "
+          f"{'µs/consulta':>12} {'µs/caché':>9}")
+    for name, result in results.items():
+        extra = result['request_us'] - base
+        print(f"   {name:<14} {result['request_us']:>12.1f} {extra:>9.1f} {extra / base * 100:>7.1f}% "
+              f"{result['query_us']:>12.2f} {result['cache_us']:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
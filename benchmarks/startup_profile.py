@@ -0,0 +1,78 @@
+"""Perfil de arranque: qué cuesta importar la app y cada fase de ``create_app``.
+
+Lanza un intérprete nuevo con ``python -X importtime -c "import app"`` y
+resume su salida: los módulos más caros (tiempo acumulado, incluye sus
+dependencias) separados en propios y de terceros. Después importa la app en
+este proceso y muestra el desglose de ``create_app`` que guarda
+``utils.startup.StartupProfile``. No necesita base de datos.
+
+Uso (desde la raíz del proyecto)::
+
+    python benchmarks/startup_profile.py [--top 15]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Paquetes del proyecto (el resto se considera de terceros o de la stdlib)
+OWN_PACKAGES = ('app', 'config', 'controllers', 'models', 'utils')
+
+
+def importtime():
+    """[(módulo, propio_us, acumulado_us)] del import de la app en frío"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import app'],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        sys.exit(f"❌ No se pudo importar la app:\n{result.stderr[-2000:]}")
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        modules.append((name.strip(), int(own), int(cumulative)))
+    return modules
+
+
+def is_own(module):
+    return module.split('.')[0] in OWN_PACKAGES
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--top', type=int, default=15, help="módulos a mostrar por grupo")
+    args = parser.parse_args()
+
+    modules = importtime()
+    app_total = next((cumulative for name, _, cumulative in modules if name == 'app'), 0)
+    print(f"📦 import app: {app_total / 1000:.1f} ms ({len(modules)} módulos cargados)\n")
+
+    for title, group in (("Propios", [m for m in modules if is_own(m[0])]),
+                         ("Terceros / stdlib", [m for m in modules if not is_own(m[0])])):
+        # Tiempo propio: lo que cuesta el módulo en sí, sin sus dependencias
+        self_ms = sum(own for _, own, _ in group) / 1000
+        print(f"🔎 {title}: {self_ms:.1f} ms de tiempo propio")
+        print(f"   {'módulo':<48} {'propio ms':>10} {'acumulado ms':>13}")
+        for name, own, cumulative in sorted(group, key=lambda m: m[2], reverse=True)[:args.top]:
+            print(f"   {name:<48} {own / 1000:>10.2f} {cumulative / 1000:>13.2f}")
+        print()
+
+    start = time.perf_counter()
+    from app import app
+    elapsed = (time.perf_counter() - start) * 1000
+    profile = app.extensions.get('startup_profile')
+    print(f"⏱️ Import + create_app en este proceso: {elapsed:.1f} ms")
+    if profile is not None:
+        for name, ms in profile.steps:
+            print(f"   {name:<20} {ms:>8.1f} ms")
+        print(f"   {'total create_app':<20} {profile.total_ms:>8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,202 @@
+"""Build de los assets estáticos: librerías propias, minificado y hash de contenido.
+
+1. Descarga a ``static/vendor`` las librerías fijadas en ``utils.assets.VENDOR``
+   (Bootstrap, Font Awesome y sus fuentes, Chart.js) si aún no están.
+2. Minifica el CSS/JS propio (``static/css``, ``static/js``), pone el hash del
+   contenido en el nombre de cada fichero y lo copia a ``static/dist`` junto
+   con su versión comprimida (``.gz``, y ``.br`` si está brotli).
+3. Escribe ``static/dist/manifest.json``, que usa ``asset_url()`` en las
+   plantillas para servir las URL con hash y caché inmutable.
+
+Uso (desde la raíz del proyecto; Railway lo ejecuta en el build)::
+
+    python build_assets.py              # descargar lo que falte y generar dist/
+    python build_assets.py --refresh    # volver a descargar las librerías
+    python build_assets.py --offline    # no descargar nada
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import posixpath
+import re
+import shutil
+import sys
+import urllib.parse
+import urllib.request
+
+import rcssmin
+import rjsmin
+
+from utils.assets import DIST_DIR, MANIFEST, VENDOR
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+STATIC = os.path.join(ROOT, 'static')
+
+# Extensiones que merece la pena guardar también comprimidas
+COMPRESSIBLE = {'.css', '.js', '.svg', '.json', '.ttf', '.eot', '.otf'}
+
+CSS_URL = re.compile(r"""url\(\s*(['"]?)([^'")]+?)\1\s*\)""")
+SOURCE_MAP = re.compile(rb"\n?(/\*#\s*sourceMappingURL=[^*]*\*/|//#\s*sourceMappingURL=\S*)\s*$")
+
+
+def log(message):
+    print(message, flush=True)
+
+
+# ----------------------------------------------------------------------
+# Librerías de terceros
+# ----------------------------------------------------------------------
+def download(url, target):
+    request = urllib.request.Request(url, headers={'User-Agent': 'presupuesto-build-assets'})
+    with urllib.request.urlopen(request, timeout=30) as response:
+        data = response.read()
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with open(target, 'wb') as f:
+        f.write(data)
+    return data
+
+
+def css_references(css):
+    """URL relativas (fuentes, imágenes) que usa una hoja de estilo"""
+    for _, ref in CSS_URL.findall(css):
+        if not ref.startswith(('data:', 'http:', 'https:', '//', '#')):
+            yield ref.split('?')[0].split('#')[0]
+
+
+def vendor(refresh=False):
+    """Descargar las librerías de ``VENDOR`` (y lo que referencien sus CSS)"""
+    for path, url in VENDOR.items():
+        target = os.path.join(STATIC, path)
+        if os.path.exists(target) and not refresh:
+            continue
+        log(f"⬇️  {url}")
+        data = download(url, target)
+        if path.endswith('.css'):
+            for ref in sorted(set(css_references(data.decode('utf-8')))):
+                ref_path = posixpath.normpath(posixpath.join(posixpath.dirname(path), ref))
+                ref_url = urllib.parse.urljoin(url, ref)
+                log(f"⬇️  {ref_url}")
+                download(ref_url, os.path.join(STATIC, ref_path))
+
+
+# ----------------------------------------------------------------------
+# Minificado y hash de contenido
+# ----------------------------------------------------------------------
+def sources():
+    """Ficheros de static/ a publicar (rutas lógicas con '/'), CSS al final:
+    sus ``url()`` se reescriben con los nombres ya firmados"""
+    paths = []
+    for directory, dirnames, filenames in os.walk(STATIC):
+        rel_dir = os.path.relpath(directory, STATIC)
+        if rel_dir.split(os.sep)[0] == DIST_DIR:
+            dirnames[:] = []
+            continue
+        for filename in filenames:
+            paths.append(posixpath.normpath(posixpath.join(rel_dir.replace(os.sep, '/'), filename)))
+    return sorted(paths, key=lambda p: (p.endswith('.css'), p))
+
+
+def transform(path, data, manifest):
+    """Contenido final de un fichero: minificado y con las referencias firmadas"""
+    minified = '.min.' in posixpath.basename(path)
+    if path.endswith('.js'):
+        text = data.decode('utf-8')
+        data = (text if minified else rjsmin.jsmin(text)).encode('utf-8')
+    elif path.endswith('.css'):
+        text = data.decode('utf-8')
+        if not minified:
+            text = rcssmin.cssmin(text)
+
+        def sign(match):
+            quote, ref = match.groups()
+            clean = ref.split('?')[0].split('#')[0]
+            target = posixpath.normpath(posixpath.join(posixpath.dirname(path), clean))
+            if target not in manifest:
+                return match.group(0)
+            signed = posixpath.relpath(manifest[target], posixpath.dirname(path))
+            return f"url({quote}{signed}{ref[len(clean):]}{quote})"
+
+        data = CSS_URL.sub(sign, text).encode('utf-8')
+    else:
+        return data
+    # Los .map no se publican: el comentario solo provocaría un 404
+    return SOURCE_MAP.sub(b'', data)
+
+
+def write_compressed(target, data):
+    sizes = {}
+    if os.path.splitext(target)[1] not in COMPRESSIBLE:
+        return sizes
+    variants = [('.gz', gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append(('.br', brotli.compress(data, quality=11)))
+    for suffix, compressed in variants:
+        if len(compressed) < len(data):
+            with open(target + suffix, 'wb') as f:
+                f.write(compressed)
+            sizes[suffix] = len(compressed)
+    return sizes
+
+
+def build():
+    dist = os.path.join(STATIC, DIST_DIR)
+    shutil.rmtree(dist, ignore_errors=True)
+    manifest = {}
+    total_in = total_out = 0
+
+    for path in sources():
+        with open(os.path.join(STATIC, path), 'rb') as f:
+            original = f.read()
+        data = transform(path, original, manifest)
+        digest = hashlib.sha256(data).hexdigest()[:12]
+        stem, ext = posixpath.splitext(path)
+        signed = f"{stem}.{digest}{ext}"
+
+        target = os.path.join(dist, signed)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, 'wb') as f:
+            f.write(data)
+        compressed = write_compressed(target, data)
+        manifest[path] = signed
+
+        total_in += len(original)
+        total_out += len(data)
+        extra = ' '.join(f"{suffix[1:]} {size:,}" for suffix, size in compressed.items())
+        log(f"   {path:<52} {len(original):>9,} → {len(data):>9,}  {extra}")
+
+    with open(os.path.join(dist, MANIFEST), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    log(f"✅ {len(manifest)} assets en static/{DIST_DIR} ({total_in:,} → {total_out:,} bytes)")
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build de los assets estáticos")
+    parser.add_argument('--refresh', action='store_true', help="volver a descargar las librerías de terceros")
+    parser.add_argument('--offline', action='store_true', help="no descargar nada (usar lo que haya en static/vendor)")
+    args = parser.parse_args()
+
+    if not args.offline:
+        try:
+            vendor(refresh=args.refresh)
+        except OSError as e:
+            # Sin red en el build la app sigue funcionando con el CDN
+            log(f"❌ No se pudieron descargar las librerías: {e}")
+    missing = [path for path in VENDOR if not os.path.exists(os.path.join(STATIC, path))]
+    if missing:
+        log(f"⚠️ Sin descargar (se servirán desde el CDN): {', '.join(missing)}")
+
+    log("📦 Generando assets con hash...")
+    build()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 from datetime import timedelta
 
@@ -10,7 +11,6 @@ class Config:
     
     if IS_RAILWAY:
         # ✅ CONFIGURACIÓN PARA RAILWAY
-        print("🟢 Config: Modo Railway detectado")
         MYSQL_HOST = os.getenv('MYSQLHOST', 'localhost')
         MYSQL_USER = os.getenv('MYSQLUSER', 'root')
         MYSQL_PASSWORD = os.getenv('MYSQLPASSWORD', '')
@@ -18,7 +18,6 @@ class Config:
         MYSQL_PORT = int(os.getenv('MYSQLPORT', 3306))
     else:
         # ✅ CONFIGURACIÓN PARA LOCAL (XAMPP)
-        print("🔵 Config: Modo Local detectado")
         MYSQL_HOST = 'localhost'
         MYSQL_USER = 'root'
         MYSQL_PASSWORD = ''  # Vacío para XAMPP por defecto
@@ -26,7 +25,86 @@ class Config:
         MYSQL_PORT = 3306
     
     SECRET_KEY = os.getenv('SECRET_KEY', 'presupuesto_secret_key_2025')
-    
+
+    # ✅ POOL DE CONEXIONES (utils.database.ConnectionPool)
+    DB_POOL_MIN_SIZE = int(os.getenv('DB_POOL_MIN_SIZE', 1))
+    DB_POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', 10))
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 10))            # segundos esperando conexión libre
+    DB_POOL_MAX_IDLE = float(os.getenv('DB_POOL_MAX_IDLE', 300))         # segundos ociosa antes de cerrarla
+    DB_POOL_MAX_LIFETIME = float(os.getenv('DB_POOL_MAX_LIFETIME', 3600))  # vida máxima de una conexión
+    DB_POOL_PING_INTERVAL = float(os.getenv('DB_POOL_PING_INTERVAL', 30))  # ping al sacarla si lleva más ociosa
+
+    # Una conexión y una transacción por petición HTTP (utils.database.RequestSession)
+    DB_REQUEST_SESSION = os.getenv('DB_REQUEST_SESSION', '1') == '1'
+
+    # Lecturas independientes en paralelo (utils.query_executor)
+    QUERY_FANOUT = os.getenv('QUERY_FANOUT', '1') == '1'
+    QUERY_EXECUTOR_WORKERS = int(os.getenv('QUERY_EXECUTOR_WORKERS', 4))
+    QUERY_DEADLINE = float(os.getenv('QUERY_DEADLINE', 8))  # segundos por petición
+
+    # Memoización de lecturas dentro de la petición (utils.memo.request_memoized)
+    REQUEST_MEMO = os.getenv('REQUEST_MEMO', '1') == '1'
+    REQUEST_MEMO_DEBUG = os.getenv('REQUEST_MEMO_DEBUG', '0') == '1'  # aciertos/fallos por petición (siempre con app.debug)
+
+    # Caché compartido por las capas de caché (utils.cache): memory | sqlite | redis
+    CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'memory')
+    CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', 4096))
+    CACHE_SQLITE_PATH = os.getenv('CACHE_SQLITE_PATH', os.path.join(tempfile.gettempdir(), 'presupuesto-cache.sqlite3'))
+    CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL', os.getenv('REDIS_URL', 'redis://localhost:6379/0'))
+    CACHE_KEY_PREFIX = os.getenv('CACHE_KEY_PREFIX', 'presupuesto:')
+    CACHE_LOCK_TIMEOUT = float(os.getenv('CACHE_LOCK_TIMEOUT', 10))  # segundos esperando a otro cálculo
+
+    # Catálogo de categorías en memoria (models.category)
+    CATEGORY_CATALOG_TTL = float(os.getenv('CATEGORY_CATALOG_TTL', 600))  # segundos hasta recargarlo
+
+    # Resumen de cifras por usuario (models.user_summary)
+    USER_SUMMARY_TTL = float(os.getenv('USER_SUMMARY_TTL', 300))  # segundos; las escrituras lo invalidan antes
+
+    # Fragmentos de plantilla renderizados por usuario ({% cache %}, utils.fragment_cache)
+    FRAGMENT_CACHE = os.getenv('FRAGMENT_CACHE', '1') == '1'
+    FRAGMENT_CACHE_TTL = float(os.getenv('FRAGMENT_CACHE_TTL', 600))  # segundos; la versión de datos los invalida antes
+
+    # Compresión de respuestas HTML/JSON (utils.compression)
+    COMPRESSION = os.getenv('COMPRESSION', '1') == '1'
+    COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))  # bytes; por debajo no compensa
+    COMPRESSION_BROTLI = os.getenv('COMPRESSION_BROTLI', '1') == '1'     # si el paquete brotli está instalado
+    GZIP_LEVEL = int(os.getenv('GZIP_LEVEL', 6))           # 1-9
+    BROTLI_QUALITY = int(os.getenv('BROTLI_QUALITY', 4))   # 0-11; por encima de 5 el coste de CPU se dispara
+
+    # Paginación por cursor de los listados de gastos e ingresos (utils.pagination)
+    PAGE_SIZE_DEFAULT = int(os.getenv('PAGE_SIZE_DEFAULT', 50))
+    PAGE_SIZE_MAX = int(os.getenv('PAGE_SIZE_MAX', 200))
+
+    # Foto de estadísticas de administración (models.admin_stats)
+    ADMIN_STATS_REFRESH_INTERVAL = float(os.getenv('ADMIN_STATS_REFRESH_INTERVAL', 300))  # segundos
+    ADMIN_STATS_BACKGROUND = os.getenv('ADMIN_STATS_BACKGROUND', '1') == '1'  # hilo de refresco en cada proceso
+
+    # Servidor WSGI de producción (gunicorn.conf.py, utils.serving); 0 = calcularlo
+    WEB_WORKERS = int(os.getenv('WEB_CONCURRENCY', 0))   # procesos
+    WEB_THREADS = int(os.getenv('WEB_THREADS', 0))       # hilos por proceso (worker gthread)
+    WEB_MAX_WORKERS = int(os.getenv('WEB_MAX_WORKERS', 8))
+    DB_MAX_CONNECTIONS = int(os.getenv('DB_MAX_CONNECTIONS', 100))  # conexiones a MySQL entre todos los workers
+    WEB_TIMEOUT = int(os.getenv('WEB_TIMEOUT', 60))                 # segundos sin latido antes de matar un worker
+    WEB_GRACEFUL_TIMEOUT = int(os.getenv('WEB_GRACEFUL_TIMEOUT', 30))  # segundos para terminar peticiones al recargar
+    WEB_MAX_REQUESTS = int(os.getenv('WEB_MAX_REQUESTS', 5000))     # reciclar cada worker tras N peticiones (0 = nunca)
+    WEB_PRELOAD = os.getenv('WEB_PRELOAD', '1') == '1'              # cargar la app en el máster antes del fork
+    WEB_WARMUP = os.getenv('WEB_WARMUP', '1') == '1'                # pool, catálogo y plantillas antes de aceptar tráfico
+    WEB_ASGI = os.getenv('WEB_ASGI', '0') == '1'                    # workers uvicorn para asgi:app (APIs asíncronas)
+
+    # Pool asíncrono de MySQL de las APIs del servidor ASGI (utils.async_database)
+    ASYNC_DB_POOL_MAX_SIZE = int(os.getenv('ASYNC_DB_POOL_MAX_SIZE', 20))
+
+    # Medición de cada petición (utils.timing): Server-Timing, log e histograma por ruta
+    REQUEST_TIMING = os.getenv('REQUEST_TIMING', '1') == '1'
+    REQUEST_TIMING_HEADER = os.getenv('REQUEST_TIMING_HEADER', '1') == '1'  # cabecera Server-Timing (la ven los navegadores)
+    REQUEST_TIMING_LOG = os.getenv('REQUEST_TIMING_LOG', '1') == '1'        # una línea ⏱️ por petición
+    REQUEST_TIMING_WINDOW = float(os.getenv('REQUEST_TIMING_WINDOW', 300))  # segundos del histograma de latencias
+
+    # Métricas de Prometheus en /metrics (utils.metrics; las de peticiones necesitan REQUEST_TIMING)
+    METRICS = os.getenv('METRICS', '1') == '1'
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN')                               # si está, /metrics pide "Authorization: Bearer <token>"
+    METRICS_SAMPLE_INTERVAL = float(os.getenv('METRICS_SAMPLE_INTERVAL', 5))  # segundos entre lecturas del pool y la memoria
+
     # Configuración de sesión
     PERMANENT_SESSION_LIFETIME = timedelta(minutes=5)
     
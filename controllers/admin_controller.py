@@ -1,7 +1,8 @@
 from flask import Blueprint, render_template, request, session, redirect, url_for, flash, jsonify
 from models.user import UserModel
-import bcrypt
 from datetime import datetime, timedelta
+from utils.memo import request_memoized
+from utils.metrics import bcrypt_timer
 
 class AdminController:
     def __init__(self):
@@ -28,6 +29,12 @@ class AdminController:
         
         return True
 
+    def stats_snapshot(self):
+        """Foto de estadísticas; el módulo de analítica se carga en la primera
+        visita al panel y no en el arranque de cada worker"""
+        from models.admin_stats import get_admin_stats_snapshot
+        return get_admin_stats_snapshot()
+
     def index(self):
         """Página principal de administración"""
         # Verificar acceso de administrador
@@ -35,11 +42,12 @@ class AdminController:
             return redirect(url_for('auth.login'))
         
         try:
-            # Obtener estadísticas básicas
-            total_usuarios = self.get_total_usuarios()
+            # Obtener estadísticas básicas (de la foto de estadísticas, sin recorrer tablas)
+            stats, generado_en = self.stats_snapshot().get()
+            total_usuarios = stats['total_usuarios']
             usuarios = self.get_all_usuarios()
-            ingresos_totales = self.get_ingresos_totales()
-            gastos_totales = self.get_gastos_totales()
+            ingresos_totales = stats['ingresos_totales']
+            gastos_totales = stats['gastos_totales']
             
             # Debug prints
             print(f"DEBUG - Total usuarios: {total_usuarios}")
@@ -51,6 +59,7 @@ class AdminController:
                                  usuarios=usuarios,
                                  ingresos_totales=ingresos_totales,
                                  gastos_totales=gastos_totales,
+                                 estadisticas_generadas=generado_en,
                                  active_page='admin')
             
         except Exception as e:
@@ -77,26 +86,23 @@ class AdminController:
             return redirect(url_for('auth.login'))
         
         try:
-            # Estadísticas básicas
-            total_usuarios = self.get_total_usuarios()
-            ingresos_totales = self.get_ingresos_totales()
-            gastos_totales = self.get_gastos_totales()
-            
-            # Estadísticas avanzadas
-            usuarios_activos = self.get_usuarios_activos()
-            promedio_ingresos = self.get_promedio_ingresos()
-            promedio_gastos = self.get_promedio_gastos()
-            balance_total = ingresos_totales - gastos_totales
-            
-            # Estadísticas por categorías
-            top_categorias_ingresos = self.get_top_categorias_ingresos()
-            top_categorias_gastos = self.get_top_categorias_gastos()
-            
-            # Estadísticas temporales
-            ingresos_ultimo_mes = self.get_ingresos_ultimo_mes()
-            gastos_ultimo_mes = self.get_gastos_ultimo_mes()
-            variacion_ingresos = self.get_variacion_ingresos()
-            variacion_gastos = self.get_variacion_gastos()
+            # Foto de estadísticas calculada en pocas pasadas agrupadas y refrescada
+            # en segundo plano: la página no recorre las tablas de movimientos
+            stats, generado_en = self.stats_snapshot().get()
+            
+            total_usuarios = stats['total_usuarios']
+            ingresos_totales = stats['ingresos_totales']
+            gastos_totales = stats['gastos_totales']
+            usuarios_activos = stats['usuarios_activos']
+            promedio_ingresos = stats['promedio_ingresos']
+            promedio_gastos = stats['promedio_gastos']
+            balance_total = stats['balance_total']
+            top_categorias_ingresos = stats['top_categorias_ingresos']
+            top_categorias_gastos = stats['top_categorias_gastos']
+            ingresos_ultimo_mes = stats['ingresos_ultimo_mes']
+            gastos_ultimo_mes = stats['gastos_ultimo_mes']
+            variacion_ingresos = stats['variacion_ingresos']
+            variacion_gastos = stats['variacion_gastos']
             
             return render_template('admin/statistics.html',
                                  total_usuarios=total_usuarios,
@@ -112,6 +118,7 @@ class AdminController:
                                  gastos_ultimo_mes=gastos_ultimo_mes,
                                  variacion_ingresos=variacion_ingresos,
                                  variacion_gastos=variacion_gastos,
+                                 estadisticas_generadas=generado_en,
                                  active_page='estadisticas')
             
         except Exception as e:
@@ -137,7 +144,9 @@ class AdminController:
                 # Construir la consulta dinámicamente según si se proporcionó contraseña
                 if password:
                     # Usar bcrypt para el hash (igual que en UserModel.create)
-                    hashed_password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+                    import bcrypt
+                    with bcrypt_timer('hash'):
+                        hashed_password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
                     
                     query = """
                         UPDATE usuarios 
@@ -156,6 +165,8 @@ class AdminController:
                 
                 # Ejecutar la consulta
                 self.user_model.db.execute_query(query, params)
+                # El número de usuarios activos puede haber cambiado
+                self.stats_snapshot().invalidate()
                 
                 flash('Usuario actualizado correctamente', 'success')
                 return jsonify({'success': True}), 200
@@ -192,8 +203,14 @@ class AdminController:
                 flash('No puedes eliminar tu propio usuario', 'error')
                 return redirect(url_for('admin.index'))
             
-            query = "DELETE FROM usuarios WHERE id = %s"
-            self.user_model.db.execute_query(query, (user_id,))
+            # Las tablas derivadas (acumulados, saldo y feed) tienen clave foránea
+            # sin cascada: se borran con el usuario en la misma transacción
+            db = self.user_model.db
+            with db.transaction():
+                for table in ('resumen_mensual', 'saldos', 'movimientos'):
+                    db.execute_query(f"DELETE FROM {table} WHERE usuario_id = %s", (user_id,))
+                db.execute_query("DELETE FROM usuarios WHERE id = %s", (user_id,))
+            self.stats_snapshot().invalidate()
             
             flash('Usuario eliminado correctamente', 'success')
             
@@ -203,194 +220,7 @@ class AdminController:
         # CORREGIDO: Redirigir a admin.index en lugar de admin.admin_usuarios
         return redirect(url_for('admin.index'))
 
-    def get_total_usuarios(self):
-        """Obtener total de usuarios registrados"""
-        try:
-            query = "SELECT COUNT(*) as total FROM usuarios WHERE activo = 1"
-            result = self.user_model.db.execute_query(query, fetch_one=True)
-            return result['total'] if result else 0
-        except Exception as e:
-            print(f"Error al obtener total de usuarios: {e}")
-            return 0
-
-    def get_usuarios_activos(self):
-        """Obtener número de usuarios activos (con movimientos recientes)"""
-        try:
-            # Usuarios que han tenido actividad en los últimos 30 días
-            query = """
-                SELECT COUNT(DISTINCT usuario_id) as total 
-                FROM (
-                    SELECT usuario_id FROM ingresos WHERE fecha >= DATE_SUB(NOW(), INTERVAL 30 DAY)
-                    UNION 
-                    SELECT usuario_id FROM gastos WHERE fecha >= DATE_SUB(NOW(), INTERVAL 30 DAY)
-                ) as actividad
-            """
-            result = self.user_model.db.execute_query(query, fetch_one=True)
-            return result['total'] if result else 0
-        except Exception as e:
-            print(f"Error al obtener usuarios activos: {e}")
-            return self.get_total_usuarios()  # Fallback al total
-
-    def get_promedio_ingresos(self):
-        """Obtener promedio de ingresos por usuario"""
-        try:
-            total_usuarios = self.get_total_usuarios()
-            if total_usuarios == 0:
-                return 0
-            ingresos_totales = self.get_ingresos_totales()
-            return ingresos_totales / total_usuarios
-        except Exception as e:
-            print(f"Error al obtener promedio ingresos: {e}")
-            return 0
-
-    def get_promedio_gastos(self):
-        """Obtener promedio de gastos por usuario"""
-        try:
-            total_usuarios = self.get_total_usuarios()
-            if total_usuarios == 0:
-                return 0
-            gastos_totales = self.get_gastos_totales()
-            return gastos_totales / total_usuarios
-        except Exception as e:
-            print(f"Error al obtener promedio gastos: {e}")
-            return 0
-
-    def get_ingresos_totales(self):
-        """Obtener total de ingresos de todos los usuarios"""
-        try:
-            query = """
-                SELECT COALESCE(SUM(monto), 0) as total 
-                FROM ingresos
-            """
-            result = self.user_model.db.execute_query(query, fetch_one=True)
-            return float(result['total']) if result and result['total'] else 0.0
-        except Exception as e:
-            print(f"Error al obtener ingresos totales: {e}")
-            return 0.0
-
-    def get_gastos_totales(self):
-        """Obtener total de gastos de todos los usuarios"""
-        try:
-            query = """
-                SELECT COALESCE(SUM(monto), 0) as total 
-                FROM gastos
-            """
-            result = self.user_model.db.execute_query(query, fetch_one=True)
-            return float(result['total']) if result and result['total'] else 0.0
-        except Exception as e:
-            print(f"Error al obtener gastos totales: {e}")
-            return 0.0
-
-    def get_ingresos_ultimo_mes(self):
-        """Obtener ingresos del último mes"""
-        try:
-            query = """
-                SELECT COALESCE(SUM(monto), 0) as total 
-                FROM ingresos 
-                WHERE fecha >= DATE_SUB(NOW(), INTERVAL 30 DAY)
-            """
-            result = self.user_model.db.execute_query(query, fetch_one=True)
-            return float(result['total']) if result and result['total'] else 0.0
-        except Exception as e:
-            print(f"Error al obtener ingresos último mes: {e}")
-            return 0.0
-
-    def get_gastos_ultimo_mes(self):
-        """Obtener gastos del último mes"""
-        try:
-            query = """
-                SELECT COALESCE(SUM(monto), 0) as total 
-                FROM gastos 
-                WHERE fecha >= DATE_SUB(NOW(), INTERVAL 30 DAY)
-            """
-            result = self.user_model.db.execute_query(query, fetch_one=True)
-            return float(result['total']) if result and result['total'] else 0.0
-        except Exception as e:
-            print(f"Error al obtener gastos último mes: {e}")
-            return 0.0
-
-    def get_variacion_ingresos(self):
-        """Obtener variación de ingresos vs mes anterior"""
-        try:
-            # Ingresos mes actual
-            ingresos_mes_actual = self.get_ingresos_ultimo_mes()
-            
-            # Ingresos mes anterior
-            query = """
-                SELECT COALESCE(SUM(monto), 0) as total 
-                FROM ingresos 
-                WHERE fecha BETWEEN DATE_SUB(NOW(), INTERVAL 60 DAY) AND DATE_SUB(NOW(), INTERVAL 30 DAY)
-            """
-            result = self.user_model.db.execute_query(query, fetch_one=True)
-            ingresos_mes_anterior = float(result['total']) if result and result['total'] else 0.0
-            
-            if ingresos_mes_anterior == 0:
-                return 0
-                
-            variacion = ((ingresos_mes_actual - ingresos_mes_anterior) / ingresos_mes_anterior) * 100
-            return round(variacion, 1)
-        except Exception as e:
-            print(f"Error al obtener variación ingresos: {e}")
-            return 0
-
-    def get_variacion_gastos(self):
-        """Obtener variación de gastos vs mes anterior"""
-        try:
-            # Gastos mes actual
-            gastos_mes_actual = self.get_gastos_ultimo_mes()
-            
-            # Gastos mes anterior
-            query = """
-                SELECT COALESCE(SUM(monto), 0) as total 
-                FROM gastos 
-                WHERE fecha BETWEEN DATE_SUB(NOW(), INTERVAL 60 DAY) AND DATE_SUB(NOW(), INTERVAL 30 DAY)
-            """
-            result = self.user_model.db.execute_query(query, fetch_one=True)
-            gastos_mes_anterior = float(result['total']) if result and result['total'] else 0.0
-            
-            if gastos_mes_anterior == 0:
-                return 0
-                
-            variacion = ((gastos_mes_actual - gastos_mes_anterior) / gastos_mes_anterior) * 100
-            return round(variacion, 1)
-        except Exception as e:
-            print(f"Error al obtener variación gastos: {e}")
-            return 0
-
-    def get_top_categorias_ingresos(self):
-        """Obtener top categorías de ingresos"""
-        try:
-            query = """
-                SELECT c.nombre, COUNT(*) as cantidad, SUM(i.monto) as total
-                FROM ingresos i
-                JOIN categorias_ingresos c ON i.categoria_id = c.id
-                GROUP BY c.id, c.nombre
-                ORDER BY total DESC
-                LIMIT 5
-            """
-            result = self.user_model.db.execute_query(query, fetch=True)
-            return result if result else []
-        except Exception as e:
-            print(f"Error al obtener top categorías ingresos: {e}")
-            return []
-
-    def get_top_categorias_gastos(self):
-        """Obtener top categorías de gastos"""
-        try:
-            query = """
-                SELECT c.nombre, COUNT(*) as cantidad, SUM(g.monto) as total
-                FROM gastos g
-                JOIN categorias_gastos c ON g.categoria_id = c.id
-                GROUP BY c.id, c.nombre
-                ORDER BY total DESC
-                LIMIT 5
-            """
-            result = self.user_model.db.execute_query(query, fetch=True)
-            return result if result else []
-        except Exception as e:
-            print(f"Error al obtener top categorías gastos: {e}")
-            return []
-
+    @request_memoized
     def get_all_usuarios(self):
         """Obtener todos los usuarios registrados - Versión simple"""
         try:
@@ -410,6 +240,3 @@ class AdminController:
         except Exception as e:
             print(f"Error al obtener usuarios: {e}")
             return []
-
-# Crear instancia del controlador
-admin_controller = AdminController()
\ No newline at end of file
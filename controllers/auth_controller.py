@@ -77,6 +77,3 @@ class AuthController:
         session.clear()
         flash('Sesión cerrada exitosamente', 'success')
         return redirect(url_for('auth.login'))
-
-# Crear instancia del controlador
-auth_controller = AuthController()
\ No newline at end of file
@@ -1,14 +1,17 @@
 from flask import Blueprint, render_template, request, session, redirect, url_for, flash, jsonify
 from models.budget import BudgetModel
-from models.expense import ExpenseModel
+from models.budget_status import BudgetStatusEngine
+from models.category import get_category_catalog
 from utils.helpers import decimal_to_float
+from utils.http_cache import conditional_on_user_data
+from utils.async_database import get_async_database
 from datetime import datetime
 
 class BudgetController:
     def __init__(self):
         self.bp = Blueprint('budgets', __name__, url_prefix='/budgets')
         self.budget_model = BudgetModel()
-        self.expense_model = ExpenseModel()
+        self.status_engine = BudgetStatusEngine()
         self.register_routes()
 
     def register_routes(self):
@@ -16,8 +19,8 @@ class BudgetController:
         self.bp.route('/add', methods=['POST'])(self.add)
         self.bp.route('/update/<int:budget_id>', methods=['POST'])(self.update)
         self.bp.route('/delete/<int:budget_id>', methods=['POST'])(self.delete)
-        self.bp.route('/api')(self.api_budgets)
-        self.bp.route('/api/progress')(self.api_budget_progress)
+        self.bp.route('/api')(conditional_on_user_data(self.api_budgets))
+        self.bp.route('/api/progress')(conditional_on_user_data(self.api_budget_progress))
 
     def index(self):
         """Página de listado de presupuestos"""
@@ -28,19 +31,14 @@ class BudgetController:
         month = request.args.get('month', datetime.now().month, type=int)
         year = request.args.get('year', datetime.now().year, type=int)
         
-        budgets = self.budget_model.get_by_user(user_id, month, year)
-        
-        # Obtener TODAS las categorías de gastos
-        all_categories = self.expense_model.get_categories()
-        
-        # Obtener el resumen general
-        summary = self.budget_model.get_budget_summary(user_id, month, year)
+        # Presupuestos, resumen y TODAS las categorías de gastos en una sola pasada
+        status = self.status_engine.evaluate(user_id, month, year)
         
         return render_template('budgets/index.html',
-                             budgets=budgets,
-                             categories=all_categories,  # ← CAMBIO: Ahora pasamos TODAS las categorías
-                             expense_categories=all_categories,
-                             summary=summary,
+                             budgets=status.budgets,
+                             categories=status.categories,  # ← CAMBIO: Ahora pasamos TODAS las categorías
+                             expense_categories=status.categories,
+                             summary=status.summary,
                              current_month=month,
                              current_year=year,
                              now=datetime.now())
@@ -133,32 +131,56 @@ class BudgetController:
         if 'user_id' not in session:
             return jsonify({'error': 'No autorizado'}), 401
         
-        user_id = session['user_id']
+        month, year = self.api_month()
+        budgets = self.status_engine.evaluate(session['user_id'], month, year).budgets
+        return jsonify(self.budgets_payload(budgets))
+
+    def api_budget_progress(self):
+        """API para obtener progreso de presupuestos (AJAX)"""
+        if 'user_id' not in session:
+            return jsonify({'error': 'No autorizado'}), 401
+        
+        month, year = self.api_month()
+        budgets = self.status_engine.evaluate(session['user_id'], month, year).budgets
+        return jsonify(self.progress_payload(budgets))
+
+    async def api_budgets_async(self):
+        """``api_budgets`` sobre el pool asíncrono (servidor ASGI, asgi.py)"""
+        if 'user_id' not in session:
+            return jsonify({'error': 'No autorizado'}), 401
+        return jsonify(self.budgets_payload(await self.evaluate_async(session['user_id'])))
+
+    async def api_budget_progress_async(self):
+        """``api_budget_progress`` sobre el pool asíncrono (servidor ASGI, asgi.py)"""
+        if 'user_id' not in session:
+            return jsonify({'error': 'No autorizado'}), 401
+        return jsonify(self.progress_payload(await self.evaluate_async(session['user_id'])))
+
+    def api_month(self):
         month = request.args.get('month', datetime.now().month, type=int)
         year = request.args.get('year', datetime.now().year, type=int)
-        
-        budgets = self.budget_model.get_by_user(user_id, month, year)
-        
+        return month, year
+
+    async def evaluate_async(self, user_id):
+        """Presupuestos del mes con las mismas consultas que ``BudgetStatusEngine.evaluate``"""
+        month, year = self.api_month()
+        budgets, spend_rows = await get_async_database().execute_batch(
+            self.status_engine.queries(user_id, month, year))
+        await get_category_catalog().warm_async()
+        return self.status_engine.from_rows(budgets, spend_rows).budgets
+
+    @staticmethod
+    def budgets_payload(budgets):
         # Convertir decimales a float
         for budget in budgets:
             budget['monto_maximo'] = decimal_to_float(budget['monto_maximo'])
             budget['gasto_actual'] = decimal_to_float(budget['gasto_actual'])
             budget['saldo_restante'] = decimal_to_float(budget['saldo_restante'])
             budget['porcentaje_uso'] = decimal_to_float(budget['porcentaje_uso'])
-        
-        return jsonify(budgets)
+        return budgets
 
-    def api_budget_progress(self):
-        """API para obtener progreso de presupuestos (AJAX)"""
-        if 'user_id' not in session:
-            return jsonify({'error': 'No autorizado'}), 401
-        
-        user_id = session['user_id']
-        month = request.args.get('month', datetime.now().month, type=int)
-        year = request.args.get('year', datetime.now().year, type=int)
-        
-        budgets = self.budget_model.get_by_user(user_id, month, year)
-        
+    @staticmethod
+    def progress_payload(budgets):
         # Preparar datos para gráfico
         progress_data = []
         for budget in budgets:
@@ -169,8 +191,4 @@ class BudgetController:
                 'porcentaje': decimal_to_float(budget['porcentaje_uso']),
                 'color': budget['color']
             })
-        
-        return jsonify(progress_data)
-
-# Crear instancia del controlador
-budget_controller = BudgetController()
\ No newline at end of file
+        return progress_data
@@ -1,30 +1,21 @@
-from flask import Blueprint, render_template, session, redirect, url_for
-import mysql.connector
+from flask import Blueprint, render_template, request, session, redirect, url_for, jsonify
+from models.dashboard import DashboardModel
+from models.activity import ActivityFeedModel
+from utils.helpers import decimal_to_float
+from utils.pagination import decode_cursor, page_size, InvalidCursor
+from utils.fragment_cache import skip_fragment_cache
 from datetime import datetime
-from config import Config
 
 class DashboardController:
     def __init__(self):
         self.bp = Blueprint('dashboard', __name__)
+        self.dashboard_model = DashboardModel()
+        self.activity_model = ActivityFeedModel()
         self.register_routes()
     
-    def get_db_connection(self):
-        """Crear conexión a la base de datos"""
-        try:
-            conn = mysql.connector.connect(
-                host=Config.MYSQL_HOST,
-                user=Config.MYSQL_USER,
-                password=Config.MYSQL_PASSWORD,
-                database=Config.MYSQL_DB,
-                port=Config.MYSQL_PORT
-            )
-            return conn
-        except Exception as e:
-            print(f"Error conectando a la BD: {e}")
-            return None
-    
     def register_routes(self):
         self.bp.route('/')(self.index)
+        self.bp.route('/api/actividad')(self.api_activity)
     
     def index(self):
         if 'user_id' not in session:
@@ -34,131 +25,29 @@ class DashboardController:
         now = datetime.now()
         
         try:
-            conn = self.get_db_connection()
-            if not conn:
-                return render_template('dashboard/index.html',
-                                    total_ingresos=0, total_gastos=0, saldo=0,
-                                    ingresos_mes=0, gastos_mes=0,
-                                    ultimos_ingresos=[], ultimos_gastos=[],
-                                    total_ahorros=0, meta_ahorros=0, metas_activas=[],
-                                    now=now)
-            
-            cursor = conn.cursor(dictionary=True)
-            
-            # 1. INGRESOS TOTALES (TODOS los ingresos, sin filtro de año)
-            cursor.execute("""
-                SELECT SUM(monto) as total 
-                FROM ingresos 
-                WHERE usuario_id = %s
-            """, (user_id,))
-            total_ingresos_result = cursor.fetchone()
-            total_ingresos = total_ingresos_result['total'] if total_ingresos_result['total'] else 0
-            
-            # 2. GASTOS TOTALES (TODOS los gastos, sin filtro de año)
-            cursor.execute("""
-                SELECT SUM(monto) as total 
-                FROM gastos 
-                WHERE usuario_id = %s
-            """, (user_id,))
-            total_gastos_result = cursor.fetchone()
-            total_gastos = total_gastos_result['total'] if total_gastos_result['total'] else 0
-            
-            # 3. SALDO ACTUAL (ingresos totales - gastos totales)
-            saldo = total_ingresos - total_gastos
-            
-            # 4. INGRESOS DEL MES ACTUAL (para referencia)
-            current_month = now.strftime('%Y-%m')
-            cursor.execute("""
-                SELECT SUM(monto) as total 
-                FROM ingresos 
-                WHERE usuario_id = %s AND DATE_FORMAT(fecha, '%%Y-%%m') = %s
-            """, (user_id, current_month))
-            ingresos_mes_result = cursor.fetchone()
-            ingresos_mes = ingresos_mes_result['total'] if ingresos_mes_result['total'] else 0
-            
-            # 5. GASTOS DEL MES ACTUAL (para referencia)
-            cursor.execute("""
-                SELECT SUM(monto) as total 
-                FROM gastos 
-                WHERE usuario_id = %s AND DATE_FORMAT(fecha, '%%Y-%%m') = %s
-            """, (user_id, current_month))
-            gastos_mes_result = cursor.fetchone()
-            gastos_mes = gastos_mes_result['total'] if gastos_mes_result['total'] else 0
-            
-            # 6. DATOS DE AHORROS
-            cursor.execute("""
-                SELECT 
-                    COALESCE(SUM(ahorrado_actual), 0) as total_ahorrado,
-                    COALESCE(SUM(meta_total), 0) as meta_total,
-                    COUNT(*) as total_metas
-                FROM ahorros 
-                WHERE usuario_id = %s AND completado = 0
-            """, (user_id,))
-            ahorros_result = cursor.fetchone()
-            total_ahorros = float(ahorros_result['total_ahorrado']) if ahorros_result and ahorros_result['total_ahorrado'] else 0
-            meta_ahorros = float(ahorros_result['meta_total']) if ahorros_result and ahorros_result['meta_total'] else 0
-            
-            # 7. METAS ACTIVAS
-            cursor.execute("""
-                SELECT 
-                    id,
-                    concepto, 
-                    meta_total, 
-                    ahorrado_actual, 
-                    ROUND((ahorrado_actual / meta_total) * 100, 0) as porcentaje_completado,
-                    fecha_objetivo,
-                    descripcion
-                FROM ahorros 
-                WHERE usuario_id = %s AND completado = 0
-                ORDER BY fecha_objetivo ASC
-                LIMIT 3
-            """, (user_id,))
-            metas_activas = cursor.fetchall()
-            
-            # Convertir decimales a float
-            for meta in metas_activas:
-                meta['meta_total'] = float(meta['meta_total'])
-                meta['ahorrado_actual'] = float(meta['ahorrado_actual'])
-                meta['porcentaje_completado'] = float(meta['porcentaje_completado'])
-            
-            # 8. ÚLTIMOS 5 INGRESOS (más recientes, sin filtro de año)
-            cursor.execute("""
-                SELECT i.*, ci.nombre as categoria_nombre, ci.color, ci.icono
-                FROM ingresos i 
-                LEFT JOIN categorias_ingresos ci ON i.categoria_id = ci.id 
-                WHERE i.usuario_id = %s
-                ORDER BY i.fecha DESC, i.id DESC LIMIT 5
-            """, (user_id,))
-            ultimos_ingresos = cursor.fetchall()
-            
-            # 9. ÚLTIMOS 5 GASTOS (más recientes, sin filtro de año)
-            cursor.execute("""
-                SELECT g.*, cg.nombre as categoria_nombre, cg.color, cg.icono
-                FROM gastos g 
-                LEFT JOIN categorias_gastos cg ON g.categoria_id = cg.id 
-                WHERE g.usuario_id = %s
-                ORDER BY g.fecha DESC, g.id DESC LIMIT 5
-            """, (user_id,))
-            ultimos_gastos = cursor.fetchall()
-            
-            cursor.close()
-            conn.close()
+            # Todos los widgets (totales, mes actual, ahorros, metas activas y
+            # últimos 5 ingresos/gastos) se consultan a la vez
+            overview = self.dashboard_model.get_overview(user_id, now.month, now.year)
+            totales = overview['totales']
+            totales_mes = overview['totales_mes']
+            ahorros = overview['ahorros']
             
             return render_template('dashboard/index.html',
-                                total_ingresos=total_ingresos,
-                                total_gastos=total_gastos,
-                                saldo=saldo,
-                                ingresos_mes=ingresos_mes,
-                                gastos_mes=gastos_mes,
-                                ultimos_ingresos=ultimos_ingresos,
-                                ultimos_gastos=ultimos_gastos,
-                                total_ahorros=total_ahorros,
-                                meta_ahorros=meta_ahorros,
-                                metas_activas=metas_activas,
+                                total_ingresos=totales['total_ingresos'],
+                                total_gastos=totales['total_gastos'],
+                                saldo=totales['saldo'],
+                                ingresos_mes=totales_mes['ingresos_mes'],
+                                gastos_mes=totales_mes['gastos_mes'],
+                                ultimos_ingresos=overview['ultimos_ingresos'],
+                                ultimos_gastos=overview['ultimos_gastos'],
+                                total_ahorros=ahorros['total_ahorros'],
+                                meta_ahorros=ahorros['meta_ahorros'],
+                                metas_activas=overview['metas_activas'],
                                 now=now)
                                 
         except Exception as e:
             print(f"Error en dashboard: {e}")
+            skip_fragment_cache()
             import traceback
             traceback.print_exc()
             return render_template('dashboard/index.html',
@@ -168,4 +57,23 @@ class DashboardController:
                                 total_ahorros=0, meta_ahorros=0, metas_activas=[],
                                 now=datetime.now())
 
-dashboard_controller = DashboardController()
\ No newline at end of file
+    def api_activity(self):
+        """API de actividad reciente (ingresos y gastos) con cursor para "cargar más" """
+        if 'user_id' not in session:
+            return jsonify({'error': 'No autorizado'}), 401
+        
+        limit = page_size(request.args.get('limit'), default=10)
+        try:
+            cursor = decode_cursor(request.args.get('cursor'))
+        except InvalidCursor as e:
+            return jsonify({'error': str(e)}), 400
+        
+        movimientos, next_cursor = self.activity_model.get_page(session['user_id'], limit, cursor)
+        
+        for movimiento in movimientos:
+            movimiento['monto'] = decimal_to_float(movimiento['monto'])
+            movimiento['fecha'] = movimiento['fecha'].strftime('%Y-%m-%d') if movimiento['fecha'] else None
+            movimiento['fecha_registro'] = movimiento['fecha_registro'].isoformat() if movimiento['fecha_registro'] else None
+            del movimiento['movimiento_id']
+        
+        return jsonify({'movimientos': movimientos, 'next': next_cursor, 'limit': limit})
@@ -1,7 +1,14 @@
 from flask import Blueprint, render_template, request, session, redirect, url_for, flash, jsonify
 from models.expense import ExpenseModel
-from models.budget import BudgetModel  # ← NUEVO: Importar BudgetModel
+from models.budget_status import BudgetStatusEngine
+from models.dashboard import DashboardModel
+from models.balance import BalanceModel
+from models.category import CategoryModel, get_category_catalog
 from utils.helpers import decimal_to_float
+from utils.pagination import decode_cursor, page_size, split_page, InvalidCursor
+from utils.http_cache import conditional_on_user_data
+from utils.fragment_cache import skip_fragment_cache
+from utils.async_database import get_async_database
 from datetime import datetime
 import traceback
 
@@ -9,14 +16,16 @@ class ExpenseController:
     def __init__(self):
         self.bp = Blueprint('expenses', '__name__', url_prefix='/expenses')
         self.expense_model = ExpenseModel()
-        self.budget_model = BudgetModel()  # ← NUEVO: Instanciar BudgetModel
+        self.budget_status = BudgetStatusEngine()
+        self.dashboard_model = DashboardModel()
+        self.balance_model = BalanceModel()
         self.register_routes()
 
     def register_routes(self):
         self.bp.route('/')(self.index)
         self.bp.route('/add', methods=['POST'])(self.add)
         self.bp.route('/delete/<int:expense_id>', methods=['POST'])(self.delete)
-        self.bp.route('/api')(self.api_expenses)
+        self.bp.route('/api')(conditional_on_user_data(self.api_expenses))
         # ✅ NUEVA RUTA AGREGADA
         self.bp.route('/editar_gasto', methods=['POST'])(self.editar_gasto)
 
@@ -41,40 +50,41 @@ class ExpenseController:
             año = ahora.year
             mes = ahora.month
         
-        # Obtener datos del mes seleccionado
-        expenses = self.expense_model.get_by_user(user_id, mes, año)
-        categories = self.expense_model.get_categories()
-        total_mes = self.expense_model.get_total(user_id, mes, año)
-        
-        # Obtener total general de todos los gastos (sin filtro de mes)
-        total_general = self.expense_model.get_total(user_id)
-        total_registros = len(expenses)
+        # Página del listado: cursor opaco (fecha, id) de la última fila de la anterior
+        limit = page_size(request.args.get('limit'))
+        try:
+            cursor = decode_cursor(request.args.get('cursor'))
+        except InvalidCursor:
+            cursor = None
         
-        # ✅ CALCULAR SALDO ACTUAL (INGRESOS TOTALES - GASTOS TOTALES) - NUEVO
+        # Obtener la página del mes seleccionado y el total y número de gastos del mes
+        # en un solo viaje a la base de datos; total general y saldo actual (ingresos
+        # totales - gastos totales) salen del resumen por usuario en caché
         try:
-            # Obtener total de ingresos
-            ingresos_query = "SELECT COALESCE(SUM(monto), 0) as total_ingresos FROM ingresos WHERE usuario_id = %s"
-            ingresos_result = self.expense_model.db.execute_query(ingresos_query, (user_id,), fetch_one=True)
-            total_ingresos = float(ingresos_result['total_ingresos']) if ingresos_result and ingresos_result['total_ingresos'] else 0
-            
-            # Obtener total de gastos (usando el mismo método que en dashboard)
-            gastos_query = "SELECT COALESCE(SUM(monto), 0) as total_gastos FROM gastos WHERE usuario_id = %s"
-            gastos_result = self.expense_model.db.execute_query(gastos_query, (user_id,), fetch_one=True)
-            total_gastos = float(gastos_result['total_gastos']) if gastos_result and gastos_result['total_gastos'] else 0
-            
-            # Calcular saldo actual
-            saldo_actual = total_ingresos - total_gastos
-            
-            # Debug: imprimir valores para verificar
-            print(f"DEBUG - User ID: {user_id}")
-            print(f"DEBUG - Total Ingresos: {total_ingresos}")
-            print(f"DEBUG - Total Gastos: {total_gastos}")
-            print(f"DEBUG - Saldo Actual: {saldo_actual}")
-            print(f"DEBUG - Total General (método anterior): {total_general}")
-            
+            rows, total_mes_result = self.expense_model.db.execute_batch([
+                self.expense_model.page_query(user_id, mes, año, cursor=cursor, limit=limit),
+                self.expense_model.total_query(user_id, mes, año),
+            ])
+            # Categorías del catálogo en memoria (nombre, color e icono sin JOIN)
+            categories = self.expense_model.get_categories()
+            totales = self.dashboard_model.get_totals(user_id)
         except Exception as e:
-            print(f"Error calculando saldo actual: {e}")
-            saldo_actual = 0
+            print(f"Error cargando gastos: {e}")
+            skip_fragment_cache()
+            flash('Error al cargar los gastos', 'error')
+            rows, categories, total_mes_result = [], [], []
+            totales = self.dashboard_model.parse_totals(None)
+        
+        expenses, next_cursor = split_page(self.expense_model.attach_categories(rows), limit)
+        total_mes_row = total_mes_result[0] if total_mes_result else None
+        total_mes = self.expense_model.parse_total(total_mes_row)
+        
+        # Total general de todos los gastos (sin filtro de mes)
+        total_general = totales['total_gastos']
+        total_registros = self.expense_model.parse_count(total_mes_row)
+        
+        # ✅ SALDO ACTUAL (INGRESOS TOTALES - GASTOS TOTALES)
+        saldo_actual = float(totales['total_ingresos']) - float(totales['total_gastos'])
     
         return render_template('transactions/expenses.html',
                              expenses=expenses,
@@ -84,6 +94,9 @@ class ExpenseController:
                              total_registros=total_registros,
                              saldo_actual=saldo_actual,  # ← NUEVO
                              mes_seleccionado=mes_seleccionado,
+                             next_cursor=next_cursor,
+                             is_first_page=cursor is None,
+                             limit=limit,
                              now=datetime.now())
 
     def add(self):
@@ -144,54 +157,46 @@ class ExpenseController:
                     flash('El monto debe ser mayor a 0', 'error')
                     return redirect(url_for('expenses.index'))
                 
-                # ✅ VALIDACIÓN 2: Verificar que el gasto no supere el saldo disponible
-                # Obtener saldo actual (ingresos totales - gastos totales)
-                ingresos_query = "SELECT COALESCE(SUM(monto), 0) as total_ingresos FROM ingresos WHERE usuario_id = %s"
-                ingresos_result = self.expense_model.db.execute_query(ingresos_query, (user_id,), fetch_one=True)
-                total_ingresos = float(ingresos_result['total_ingresos']) if ingresos_result and ingresos_result['total_ingresos'] else 0
-                
-                gastos_query = "SELECT COALESCE(SUM(monto), 0) as total_gastos FROM gastos WHERE usuario_id = %s"
-                gastos_result = self.expense_model.db.execute_query(gastos_query, (user_id,), fetch_one=True)
-                total_gastos = float(gastos_result['total_gastos']) if gastos_result and gastos_result['total_gastos'] else 0
-                
-                saldo_actual = total_ingresos - total_gastos
-                
-                # Verificar si el nuevo gasto supera el saldo disponible
-                if monto_float > saldo_actual:
-                    flash(f'No puedes gastar más de tu saldo disponible. Saldo actual: ${saldo_actual:,.0f}', 'error')
-                    return redirect(url_for('expenses.index'))
-                
-                # ✅ VALIDACIÓN 3: NUEVA - Verificar que el gasto no supere el presupuesto de la categoría
-                # Obtener el presupuesto de la categoría seleccionada
-                budget = self.budget_model.get_budget_by_category(user_id, int(categoria_id))
-                
-                if budget:
-                    presupuesto_maximo = float(budget['monto_maximo'])
-                    gasto_actual = float(budget['gasto_actual'])
-                    saldo_presupuesto = presupuesto_maximo - gasto_actual
+                # Las validaciones de saldo y presupuesto y el alta van en una sola
+                # transacción: la fila de saldos queda bloqueada hasta confirmar, así
+                # dos gastos simultáneos no pueden dejar el saldo en negativo
+                with self.expense_model.db.transaction():
+                    # ✅ VALIDACIÓN 2: Verificar que el gasto no supere el saldo disponible
+                    # Saldo actual (ingresos totales - gastos totales) desde la tabla saldos
+                    saldo_actual = self.balance_model.lock(user_id)['saldo']
+                    
+                    # Verificar si el nuevo gasto supera el saldo disponible
+                    if monto_float > saldo_actual:
+                        flash(f'No puedes gastar más de tu saldo disponible. Saldo actual: ${saldo_actual:,.0f}', 'error')
+                        return redirect(url_for('expenses.index'))
+                    
+                    # ✅ VALIDACIÓN 3: NUEVA - Verificar que el gasto no supere el presupuesto de la categoría
+                    # Estado del presupuesto de la categoría seleccionada en el mes actual
+                    budget_status = self.budget_status.evaluate(user_id, categoria_id=int(categoria_id))
                     
                     # Verificar si el nuevo gasto supera el presupuesto disponible
-                    if monto_float > saldo_presupuesto:
+                    if not budget_status.admits(int(categoria_id), monto_float):
+                        saldo_presupuesto = budget_status.remaining_for(int(categoria_id))
                         categoria_nombre = self._get_category_name(int(categoria_id))
                         flash(f'No puedes gastar más del presupuesto asignado para {categoria_nombre}. '
                               f'Presupuesto disponible: ${saldo_presupuesto:,.0f}', 'error')
                         return redirect(url_for('expenses.index'))
-                
-                print("✅ PASÓ VALIDACIONES - CREANDO GASTO...")
-                print(f"📝 DATOS PARA CREAR:")
-                print(f"   user_id: {user_id}")
-                print(f"   concepto: {concepto}")
-                print(f"   monto: {monto_float}")
-                print(f"   categoria_id: {categoria_id}")
-                print(f"   fecha: {fecha}")
-                print(f"   esencial: {esencial}")
-                print(f"   descripcion: {descripcion}")
-                
-                # Crear el gasto
-                expense_id = self.expense_model.create(
-                    user_id, concepto, monto_float, 
-                    int(categoria_id), fecha, esencial, descripcion
-                )
+                    
+                    print("✅ PASÓ VALIDACIONES - CREANDO GASTO...")
+                    print(f"📝 DATOS PARA CREAR:")
+                    print(f"   user_id: {user_id}")
+                    print(f"   concepto: {concepto}")
+                    print(f"   monto: {monto_float}")
+                    print(f"   categoria_id: {categoria_id}")
+                    print(f"   fecha: {fecha}")
+                    print(f"   esencial: {esencial}")
+                    print(f"   descripcion: {descripcion}")
+                    
+                    # Crear el gasto
+                    expense_id = self.expense_model.create(
+                        user_id, concepto, monto_float, 
+                        int(categoria_id), fecha, esencial, descripcion
+                    )
                 
                 print(f"🎉 GASTO CREADO CON ID: {expense_id}")
                 
@@ -252,34 +257,18 @@ class ExpenseController:
                 print(f"🔍 DEBUG: user_id={user_id}, gasto_id={gasto_id}")
                 print(f"🔍 DEBUG: esencial={esencial}")
 
-                # Verificar que el gasto pertenece al usuario
-                expense = self.expense_model.db.execute_query(
-                    "SELECT * FROM gastos WHERE id = %s AND usuario_id = %s",
-                    (gasto_id, user_id),
-                    fetch_one=True
+                # Convertir monto a float
+                monto_float = float(monto)
+                
+                # Actualizar en la base de datos (solo si el gasto pertenece al usuario)
+                updated = self.expense_model.update(
+                    gasto_id, user_id, concepto, monto_float, categoria_id, fecha, esencial, descripcion
                 )
                 
-                if not expense:
+                if not updated:
                     print("❌ DEBUG: Gasto no encontrado o no pertenece al usuario")
                     flash('No tienes permiso para editar este gasto', 'error')
                     return redirect(url_for('expenses.index'))
-
-                print("✅ DEBUG: Gasto validado, procediendo a actualizar...")
-
-                # Convertir monto a float
-                monto_float = float(monto)
-                
-                # Actualizar en la base de datos
-                update_query = """
-                    UPDATE gastos 
-                    SET concepto = %s, monto = %s, categoria_id = %s, fecha = %s, 
-                        esencial = %s, descripcion = %s
-                    WHERE id = %s AND usuario_id = %s
-                """
-                self.expense_model.db.execute_query(
-                    update_query, 
-                    (concepto, monto_float, categoria_id, fecha, esencial, descripcion, gasto_id, user_id)
-                )
                 
                 print("🎉 DEBUG: Gasto actualizado exitosamente")
                 flash('¡Gasto actualizado exitosamente!', 'success')
@@ -295,11 +284,9 @@ class ExpenseController:
         return redirect(url_for('expenses.index'))
 
     def _get_category_name(self, categoria_id):
-        """Método auxiliar para obtener el nombre de una categoría"""
+        """Método auxiliar para obtener el nombre de una categoría (del catálogo en memoria)"""
         try:
-            query = "SELECT nombre FROM categorias_gastos WHERE id = %s"
-            result = self.expense_model.db.execute_query(query, (categoria_id,), fetch_one=True)
-            return result['nombre'] if result else 'Categoría'
+            return get_category_catalog().name(CategoryModel.GASTO, categoria_id, 'Categoría')
         except:
             return 'Categoría'
 
@@ -309,18 +296,10 @@ class ExpenseController:
             return jsonify({'success': False, 'error': 'No autorizado'}), 401
         
         try:
-            # Verificar que el gasto pertenezca al usuario
-            expense = self.expense_model.db.execute_query(
-                "SELECT * FROM gastos WHERE id = %s AND usuario_id = %s",
-                (expense_id, session['user_id']),
-                fetch_one=True
-            )
-            
-            if not expense:
+            # Solo borra si el gasto pertenece al usuario
+            if not self.expense_model.delete(expense_id, session['user_id']):
                 return jsonify({'success': False, 'error': 'Gasto no encontrado'}), 404
             
-            delete_query = "DELETE FROM gastos WHERE id = %s"
-            self.expense_model.db.execute_query(delete_query, (expense_id,))
             flash('Gasto eliminado exitosamente', 'success')
             return jsonify({'success': True})
         except Exception as e:
@@ -331,11 +310,44 @@ class ExpenseController:
         if 'user_id' not in session:
             return jsonify({'error': 'No autorizado'}), 401
         
-        user_id = session['user_id']
+        try:
+            queries, limit = self.api_queries(session['user_id'])
+        except InvalidCursor as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # Página y totales del mes en un solo viaje (los totales no dependen de la página)
+        rows, total_result = self.expense_model.db.execute_batch(queries)
+        return jsonify(self.api_payload(rows, total_result, limit))
+
+    async def api_expenses_async(self):
+        """La misma API sobre el pool asíncrono (servidor ASGI, asgi.py)"""
+        if 'user_id' not in session:
+            return jsonify({'error': 'No autorizado'}), 401
+        
+        try:
+            queries, limit = self.api_queries(session['user_id'])
+        except InvalidCursor as e:
+            return jsonify({'error': str(e)}), 400
+        
+        rows, total_result = await get_async_database().execute_batch(queries)
+        await get_category_catalog().warm_async()
+        return jsonify(self.api_payload(rows, total_result, limit))
+
+    def api_queries(self, user_id):
+        """Consultas de la API (página y totales del mes) y tamaño de página"""
         month = request.args.get('month', datetime.now().month, type=int)
         year = request.args.get('year', datetime.now().year, type=int)
-        
-        expenses = self.expense_model.get_by_user(user_id, month, year)
+        limit = page_size(request.args.get('limit'))
+        cursor = decode_cursor(request.args.get('cursor'))
+        return [
+            self.expense_model.page_query(user_id, month, year, cursor=cursor, limit=limit),
+            self.expense_model.total_query(user_id, month, year),
+        ], limit
+
+    def api_payload(self, rows, total_result, limit):
+        """Cuerpo JSON de la API a partir de las filas de ``api_queries``"""
+        expenses, next_cursor = split_page(self.expense_model.attach_categories(rows), limit)
+        total_row = total_result[0] if total_result else None
         
         # Convertir decimales a float
         for expense in expenses:
@@ -343,7 +355,10 @@ class ExpenseController:
             if expense['fecha']:
                 expense['fecha'] = expense['fecha'].strftime('%Y-%m-%d')
         
-        return jsonify(expenses)
-
-# Crear instancia del controlador
-expense_controller = ExpenseController()
\ No newline at end of file
+        return {
+            'gastos': expenses,
+            'next': next_cursor,
+            'limit': limit,
+            'total_mes': decimal_to_float(self.expense_model.parse_total(total_row)),
+            'total_registros': self.expense_model.parse_count(total_row)
+        }
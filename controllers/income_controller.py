@@ -1,31 +1,21 @@
 from flask import Blueprint, render_template, request, jsonify, session, flash, redirect, url_for
-import mysql.connector
+from models.income import IncomeModel
+from models.dashboard import DashboardModel
+from utils.pagination import decode_cursor, page_size, split_page, InvalidCursor
+from utils.fragment_cache import skip_fragment_cache
 from datetime import datetime
-from config import Config
 
 class IncomeController:
     def __init__(self):
         self.bp = Blueprint('income', __name__, url_prefix='/income')
+        self.income_model = IncomeModel()
+        self.dashboard_model = DashboardModel()
         self.register_routes()
     
-    def get_db_connection(self):
-        """Crear conexión a la base de datos"""
-        try:
-            conn = mysql.connector.connect(
-                host=Config.MYSQL_HOST,
-                user=Config.MYSQL_USER,
-                password=Config.MYSQL_PASSWORD,
-                database=Config.MYSQL_DB,
-                port=Config.MYSQL_PORT
-            )
-            return conn
-        except Exception as e:
-            print(f"Error conectando a la BD: {e}")
-            return None
-    
     def register_routes(self):
         self.bp.route('/')(self.index)
         self.bp.route('/add', methods=['POST'])(self.add_income)
+        self.bp.route('/update/<int:income_id>', methods=['POST'])(self.update_income)
         self.bp.route('/delete/<int:income_id>', methods=['POST'])(self.delete_income)
     
     def index(self):
@@ -36,70 +26,43 @@ class IncomeController:
         
         try:
             user_id = session['user_id']
-            conn = self.get_db_connection()
-            if not conn:
-                flash('Error de conexión a la base de datos', 'error')
-                return render_template('incomes/index.html', 
-                                     incomes=[], 
-                                     categories=[],
-                                     total_ingresos=0,
-                                     ingresos_mes=0,
-                                     total_registros=0,
-                                     saldo_actual=0,
-                                     active_page='income',
-                                     mes_actual=datetime.now().strftime('%Y-%m'),
-                                     mes_seleccionado=datetime.now().strftime('%Y-%m'))
-            
-            cursor = conn.cursor(dictionary=True)
             
             # Obtener el mes seleccionado (por defecto mes actual)
             mes_seleccionado = request.args.get('mes', datetime.now().strftime('%Y-%m'))
             año, mes = mes_seleccionado.split('-')
             
-            # Obtener ingresos del mes seleccionado - ORDENADO POR FECHA DESCENDENTE (más reciente primero)
-            cursor.execute("""
-                SELECT i.*, ci.nombre as categoria_nombre, ci.color, ci.icono
-                FROM ingresos i 
-                LEFT JOIN categorias_ingresos ci ON i.categoria_id = ci.id 
-                WHERE i.usuario_id = %s AND YEAR(i.fecha) = %s AND MONTH(i.fecha) = %s
-                ORDER BY i.fecha DESC, i.id DESC
-            """, (user_id, año, mes))
-            incomes = cursor.fetchall()
-            
-            # Obtener categorías
-            cursor.execute("SELECT * FROM categorias_ingresos ORDER BY nombre")
-            categories = cursor.fetchall()
-            
-            # CALCULAR LOS TOTALES DEL MES SELECCIONADO
-            total_ingresos_mes = 0
-            total_registros = len(incomes)
-            
-            for income in incomes:
-                total_ingresos_mes += float(income['monto'])
-            
-            # OBTENER TOTAL GENERAL DE TODOS LOS INGRESOS (para contexto)
-            cursor.execute("""
-                SELECT COALESCE(SUM(monto), 0) as total_general 
-                FROM ingresos 
-                WHERE usuario_id = %s
-            """, (user_id,))
-            total_general_result = cursor.fetchone()
-            total_ingresos_general = float(total_general_result['total_general']) if total_general_result else 0
-            
-            # CALCULAR SALDO ACTUAL (INGRESOS TOTALES - GASTOS TOTALES)
-            cursor.execute("""
-                SELECT COALESCE(SUM(monto), 0) as total_gastos 
-                FROM gastos 
-                WHERE usuario_id = %s
-            """, (user_id,))
-            total_gastos_result = cursor.fetchone()
-            total_gastos = float(total_gastos_result['total_gastos']) if total_gastos_result else 0
+            # Página del listado: cursor opaco (fecha, id) de la última fila de la anterior
+            limit = page_size(request.args.get('limit'))
+            try:
+                cursor = decode_cursor(request.args.get('cursor'))
+            except InvalidCursor:
+                cursor = None
+            
+            # Página de ingresos del mes seleccionado (ORDENADOS POR FECHA DESCENDENTE)
+            # y totales del mes en un solo viaje a la base de datos
+            rows, total_mes_result = self.income_model.db.execute_batch([
+                self.income_model.page_query(user_id, int(mes), int(año), cursor=cursor, limit=limit),
+                self.income_model.total_query(user_id, int(mes), int(año)),
+            ])
+            # Nombre, color e icono de la categoría desde el catálogo en memoria
+            incomes, next_cursor = split_page(self.income_model.attach_categories(rows), limit)
+            categories = self.income_model.get_categories()
+            # Totales generales del resumen por usuario en caché
+            totales = self.dashboard_model.get_totals(user_id)
+            
+            # TOTALES DEL MES SELECCIONADO (del agregado, no solo de la página)
+            total_mes_row = total_mes_result[0] if total_mes_result else None
+            total_ingresos_mes = float(self.income_model.parse_total(total_mes_row))
+            total_registros = self.income_model.parse_count(total_mes_row)
+            
+            # TOTAL GENERAL DE TODOS LOS INGRESOS (para contexto)
+            total_ingresos_general = float(totales['total_ingresos'])
+            
+            # SALDO ACTUAL (INGRESOS TOTALES - GASTOS TOTALES)
+            total_gastos = float(totales['total_gastos'])
             
             saldo_actual = total_ingresos_general - total_gastos
             
-            cursor.close()
-            conn.close()
-            
             # PASAR TODOS LOS DATOS AL TEMPLATE
             return render_template('incomes/index.html', 
                                  incomes=incomes, 
@@ -110,10 +73,14 @@ class IncomeController:
                                  saldo_actual=saldo_actual,              # Saldo actual
                                  active_page='income',
                                  mes_actual=datetime.now().strftime('%Y-%m'),
-                                 mes_seleccionado=mes_seleccionado)
+                                 mes_seleccionado=mes_seleccionado,
+                                 next_cursor=next_cursor,
+                                 is_first_page=cursor is None,
+                                 limit=limit)
             
         except Exception as e:
             print(f"Error en incomes: {e}")
+            skip_fragment_cache()
             flash('Error al cargar los ingresos', 'error')
             return render_template('incomes/index.html', 
                                  incomes=[], 
@@ -154,20 +121,7 @@ class IncomeController:
             if not fecha:
                 fecha = datetime.now().strftime('%Y-%m-%d')
             
-            conn = self.get_db_connection()
-            if not conn:
-                return jsonify({'success': False, 'error': 'Error de conexión'})
-            
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                INSERT INTO ingresos (usuario_id, concepto, monto, categoria_id, fecha, descripcion)
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """, (user_id, concepto, monto, categoria_id, fecha, descripcion))
-            
-            conn.commit()
-            cursor.close()
-            conn.close()
+            self.income_model.create(user_id, concepto, monto, categoria_id, fecha, descripcion)
             
             return jsonify({'success': True, 'message': 'Ingreso agregado correctamente'})
             
@@ -175,40 +129,53 @@ class IncomeController:
             print(f"Error al agregar ingreso: {e}")
             return jsonify({'success': False, 'error': 'Error al agregar el ingreso'})
     
-    def delete_income(self, income_id):
-        """Eliminar ingreso"""
+    def update_income(self, income_id):
+        """Actualizar ingreso existente"""
         if 'user_id' not in session:
             return jsonify({'success': False, 'error': 'No autorizado'})
         
         try:
             user_id = session['user_id']
-            conn = self.get_db_connection()
-            if not conn:
-                return jsonify({'success': False, 'error': 'Error de conexión'})
+            concepto = request.form.get('concepto')
+            monto = request.form.get('monto')
+            categoria_id = request.form.get('categoria_id')
+            fecha = request.form.get('fecha')
+            descripcion = request.form.get('descripcion', '')
             
-            cursor = conn.cursor()
+            # Validaciones
+            if not concepto or not monto or not categoria_id or not fecha:
+                return jsonify({'success': False, 'error': 'Todos los campos son requeridos'})
             
-            # Verificar que el ingreso pertenece al usuario
-            cursor.execute("SELECT id FROM ingresos WHERE id = %s AND usuario_id = %s", 
-                         (income_id, user_id))
+            try:
+                monto = float(monto)
+                if monto <= 0:
+                    return jsonify({'success': False, 'error': 'El monto debe ser mayor a 0'})
+            except ValueError:
+                return jsonify({'success': False, 'error': 'Monto inválido'})
             
-            if not cursor.fetchone():
-                cursor.close()
-                conn.close()
+            if not self.income_model.update(income_id, user_id, concepto, monto, categoria_id, fecha, descripcion):
                 return jsonify({'success': False, 'error': 'Ingreso no encontrado'})
             
-            cursor.execute("DELETE FROM ingresos WHERE id = %s AND usuario_id = %s", 
-                         (income_id, user_id))
+            return jsonify({'success': True, 'message': 'Ingreso actualizado correctamente'})
             
-            conn.commit()
-            cursor.close()
-            conn.close()
+        except Exception as e:
+            print(f"Error al actualizar ingreso: {e}")
+            return jsonify({'success': False, 'error': 'Error al actualizar el ingreso'})
+    
+    def delete_income(self, income_id):
+        """Eliminar ingreso"""
+        if 'user_id' not in session:
+            return jsonify({'success': False, 'error': 'No autorizado'})
+        
+        try:
+            user_id = session['user_id']
+            
+            # Solo borra si el ingreso pertenece al usuario
+            if not self.income_model.delete(income_id, user_id):
+                return jsonify({'success': False, 'error': 'Ingreso no encontrado'})
             
             return jsonify({'success': True, 'message': 'Ingreso eliminado correctamente'})
             
         except Exception as e:
             print(f"Error al eliminar ingreso: {e}")
             return jsonify({'success': False, 'error': 'Error al eliminar el ingreso'})
-
-# Crear instancia
-income_controller = IncomeController()
\ No newline at end of file
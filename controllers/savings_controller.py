@@ -1,6 +1,8 @@
 from flask import Blueprint, render_template, request, session, redirect, url_for, flash, jsonify
 from models.savings import SavingsModel
 from utils.helpers import decimal_to_float
+from utils.http_cache import conditional_on_user_data
+from utils.async_database import get_async_database
 from datetime import datetime
 
 class SavingsController:
@@ -15,7 +17,7 @@ class SavingsController:
         self.bp.route('/add-money/<int:savings_id>', methods=['POST'])(self.add_money)
         self.bp.route('/update/<int:savings_id>', methods=['POST'])(self.update)
         self.bp.route('/delete/<int:savings_id>', methods=['POST'])(self.delete)
-        self.bp.route('/api')(self.api_savings)  # ← CORREGIDO: cambiado de '/api/savings' a '/api'
+        self.bp.route('/api')(conditional_on_user_data(self.api_savings))  # ← CORREGIDO: cambiado de '/api/savings' a '/api'
 
     def index(self):
         """Página de listado de ahorros"""
@@ -176,9 +178,20 @@ class SavingsController:
         if 'user_id' not in session:
             return jsonify({'error': 'No autorizado'}), 401
         
-        user_id = session['user_id']
-        savings = self.savings_model.get_by_user(user_id)
+        savings = self.savings_model.get_by_user(session['user_id'])
+        return jsonify(self.savings_payload(savings))
+
+    async def api_savings_async(self):
+        """La misma API sobre el pool asíncrono (servidor ASGI, asgi.py)"""
+        if 'user_id' not in session:
+            return jsonify({'error': 'No autorizado'}), 401
         
+        query, params = self.savings_model.by_user_query(session['user_id'])
+        savings = await get_async_database().execute_query(query, params, fetch=True)
+        return jsonify(self.savings_payload(savings))
+
+    @staticmethod
+    def savings_payload(savings):
         # Convertir decimales a float
         for saving in savings:
             saving['meta_total'] = decimal_to_float(saving['meta_total'])
@@ -188,8 +201,4 @@ class SavingsController:
                 saving['fecha_inicio'] = saving['fecha_inicio'].strftime('%Y-%m-%d')
             if saving['fecha_objetivo']:
                 saving['fecha_objetivo'] = saving['fecha_objetivo'].strftime('%Y-%m-%d')
-        
-        return jsonify(savings)
-
-# Crear instancia del controlador
-savings_controller = SavingsController()
\ No newline at end of file
+        return savings
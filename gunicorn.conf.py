@@ -0,0 +1,90 @@
+"""Configuración de gunicorn para producción (Railway y cualquier servidor).
+
+    gunicorn app:app -c gunicorn.conf.py
+
+- Workers ``gthread``: cada proceso atiende varias peticiones en hilos, así una
+  consulta lenta a MySQL ya no bloquea a todos los usuarios.
+- Procesos e hilos se calculan con ``utils.serving.worker_plan`` a partir de
+  las CPU y del tamaño del pool (``WEB_CONCURRENCY`` / ``WEB_THREADS`` para fijarlos).
+- Cada worker rehace su pool y su caché tras el fork y se calienta (conexiones,
+  categorías, plantillas) antes de aceptar tráfico.
+- Con ``WEB_ASGI=1`` (y ``asgi:app``) los workers son de uvicorn: las APIs de
+  sondeo corren asíncronas y el resto de la app en un pool de ``threads`` hilos.
+- Recarga sin cortes: ``kill -HUP <máster>`` levanta workers nuevos y deja
+  ``WEB_GRACEFUL_TIMEOUT`` segundos a los viejos para terminar. Con
+  ``WEB_PRELOAD=1`` (por defecto) la app se carga una vez en el máster, así
+  que para cargar código nuevo hay que reiniciar el máster (o ``WEB_PRELOAD=0``).
+- ``/metrics`` suma las métricas de todos los workers: cada uno escribe las
+  suyas en ``PROMETHEUS_MULTIPROC_DIR`` (uno temporal si no viene en el entorno).
+"""
+import os
+
+from config import Config
+from utils import metrics, serving
+
+plan = serving.worker_plan()
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+worker_class = 'uvicorn_worker.UvicornWorker' if Config.WEB_ASGI else 'gthread'
+workers = plan['workers']
+threads = plan['threads']
+preload_app = Config.WEB_PRELOAD
+
+timeout = Config.WEB_TIMEOUT
+graceful_timeout = Config.WEB_GRACEFUL_TIMEOUT
+keepalive = 5
+# Reciclar workers poco a poco (con jitter para que no se reinicien todos a la vez)
+max_requests = Config.WEB_MAX_REQUESTS
+max_requests_jitter = max_requests // 10
+
+accesslog = '-'
+errorlog = '-'
+
+# El caché en memoria es de cada proceso: con varios workers las versiones de
+# datos no se verían entre ellos. Sin CACHE_BACKEND explícito se usa el SQLite
+# compartido por todos los workers de la máquina.
+if workers > 1 and Config.CACHE_BACKEND == 'memory':
+    if 'CACHE_BACKEND' in os.environ:
+        print(f"⚠️ CACHE_BACKEND=memory con {workers} workers: cada uno tendrá su propio caché")
+    else:
+        Config.CACHE_BACKEND = 'sqlite'
+
+# Antes de cargar la app: prometheus_client lee el directorio al importarse
+if Config.METRICS:
+    metrics.prepare_multiprocess_dir()
+
+
+def on_starting(server):
+    print(f"🚀 gunicorn: {workers} workers × {threads} hilos ({'uvicorn' if Config.WEB_ASGI else 'gthread'}, {plan['cpus']} CPU), "
+          f"hasta {plan['db_connections']} conexiones a MySQL, caché {Config.CACHE_BACKEND}")
+
+
+def when_ready(server):
+    # La app precargada creó gauges a nombre del máster, que no atiende peticiones
+    metrics.mark_process_dead(os.getpid())
+
+
+def on_reload(server):
+    print("🔄 Recarga: levantando workers nuevos y terminando los actuales")
+
+
+def post_fork(server, worker):
+    serving.reset_after_fork()
+
+
+def post_worker_init(worker):
+    if Config.WEB_WARMUP:
+        # Con ASGI la app cargada es asgi.AsyncApiApp, que envuelve la de Flask
+        serving.warm_up(getattr(worker.wsgi, 'flask_app', worker.wsgi))
+
+
+def worker_exit(server, worker):
+    serving.close_connections()
+
+
+def child_exit(server, worker):
+    metrics.mark_process_dead(worker.pid)
+
+
+def on_exit(server):
+    metrics.remove_multiprocess_dir()
@@ -2,32 +2,8 @@ import pymysql
 import os
 import sys
 
-def init_database():
-    print("=== 🗄️ INICIALIZANDO BASE DE DATOS COMPLETA ===")
-    
-    # Configuración desde Railway
-    db_config = {
-        'host': os.getenv('MYSQLHOST'),
-        'user': os.getenv('MYSQLUSER'),
-        'password': os.getenv('MYSQLPASSWORD'),
-        'database': os.getenv('MYSQLDATABASE'),
-        'port': int(os.getenv('MYSQLPORT', 3306)),
-        'charset': 'utf8mb4',
-        'connect_timeout': 30,
-        'autocommit': True
-    }
-    
-    print(f"Conectando a: {db_config['host']}:{db_config['port']}")
-    print(f"Base de datos: {db_config['database']}")
-    
-    try:
-        # Conectar a MySQL con configuración robusta
-        connection = pymysql.connect(**db_config)
-        cursor = connection.cursor()
-        print("✅ Conexión exitosa a MySQL")
-        
-        # SCRIPT SQL COMPLETO - EXACTO COMO EN LOCAL
-        sql_script = """
+# Esquema completo de la base de datos (también lo usan las pruebas de tests/)
+SCHEMA_SQL = """
 SET SQL_MODE = "NO_AUTO_VALUE_ON_ZERO";
 START TRANSACTION;
 SET time_zone = "+00:00";
@@ -154,6 +130,7 @@ CREATE TABLE IF NOT EXISTS `presupuestos` (
   `fecha_creacion` timestamp NOT NULL DEFAULT current_timestamp(),
   PRIMARY KEY (`id`),
   UNIQUE KEY `unique_presupuesto` (`usuario_id`,`categoria_gasto_id`,`mes_year`),
+  KEY `idx_presupuestos_usuario_mes` (`usuario_id`,`mes_year`),
   KEY `categoria_gasto_id` (`categoria_gasto_id`),
   CONSTRAINT `presupuestos_ibfk_1` FOREIGN KEY (`usuario_id`) REFERENCES `usuarios` (`id`),
   CONSTRAINT `presupuestos_ibfk_2` FOREIGN KEY (`categoria_gasto_id`) REFERENCES `categorias_gastos` (`id`)
@@ -176,18 +153,160 @@ CREATE TABLE IF NOT EXISTS `ahorros` (
   CONSTRAINT `ahorros_ibfk_1` FOREIGN KEY (`usuario_id`) REFERENCES `usuarios` (`id`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
+-- Tabla: resumen_mensual (acumulado por usuario, tipo, categoría y mes)
+-- Se mantiene en la misma transacción que gastos/ingresos; este script la llena
+-- desde los movimientos al crearla y se reconstruye con
+-- python maintenance.py rebuild-resumen
+CREATE TABLE IF NOT EXISTS `resumen_mensual` (
+  `usuario_id` int(11) NOT NULL,
+  `tipo` enum('ingreso','gasto') NOT NULL,
+  `categoria_id` int(11) NOT NULL DEFAULT 0,
+  `mes` date NOT NULL,
+  `total` decimal(14,2) NOT NULL DEFAULT 0.00,
+  `cantidad` int(11) NOT NULL DEFAULT 0,
+  `total_esencial` decimal(14,2) NOT NULL DEFAULT 0.00,
+  `total_no_esencial` decimal(14,2) NOT NULL DEFAULT 0.00,
+  PRIMARY KEY (`usuario_id`,`tipo`,`mes`,`categoria_id`),
+  KEY `idx_resumen_tipo_mes` (`tipo`,`mes`),
+  CONSTRAINT `resumen_mensual_ibfk_1` FOREIGN KEY (`usuario_id`) REFERENCES `usuarios` (`id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- Tabla: saldos (ingresos, gastos y saldo acumulado por usuario)
+-- Se mantiene en la misma transacción que gastos/ingresos; este script la llena
+-- desde los movimientos al crearla y se reconstruye con
+-- python maintenance.py rebuild-saldos
+CREATE TABLE IF NOT EXISTS `saldos` (
+  `usuario_id` int(11) NOT NULL,
+  `total_ingresos` decimal(14,2) NOT NULL DEFAULT 0.00,
+  `total_gastos` decimal(14,2) NOT NULL DEFAULT 0.00,
+  `saldo` decimal(14,2) NOT NULL DEFAULT 0.00,
+  `fecha_actualizacion` timestamp NOT NULL DEFAULT current_timestamp() ON UPDATE current_timestamp(),
+  PRIMARY KEY (`usuario_id`),
+  CONSTRAINT `saldos_ibfk_1` FOREIGN KEY (`usuario_id`) REFERENCES `usuarios` (`id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- Tabla: movimientos (feed unificado de ingresos y gastos para la actividad reciente)
+-- Se mantiene en la misma transacción que gastos/ingresos; este script la llena
+-- desde los movimientos al crearla y se reconstruye con
+-- python maintenance.py rebuild-movimientos
+CREATE TABLE IF NOT EXISTS `movimientos` (
+  `id` bigint(20) NOT NULL AUTO_INCREMENT,
+  `usuario_id` int(11) NOT NULL,
+  `tipo` enum('ingreso','gasto') NOT NULL,
+  `origen_id` int(11) NOT NULL,
+  `concepto` varchar(100) NOT NULL,
+  `monto` decimal(12,2) NOT NULL,
+  `categoria_id` int(11) DEFAULT NULL,
+  `fecha` date NOT NULL,
+  `fecha_registro` timestamp NOT NULL DEFAULT current_timestamp(),
+  PRIMARY KEY (`id`),
+  UNIQUE KEY `uniq_movimientos_origen` (`tipo`,`origen_id`),
+  KEY `idx_movimientos_usuario_registro` (`usuario_id`,`fecha_registro`,`id`),
+  KEY `idx_movimientos_fecha` (`fecha`,`usuario_id`,`tipo`),
+  CONSTRAINT `movimientos_ibfk_1` FOREIGN KEY (`usuario_id`) REFERENCES `usuarios` (`id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
 COMMIT;
 
 /*!40101 SET CHARACTER_SET_CLIENT=@OLD_CHARACTER_SET_CLIENT */;
 /*!40101 SET CHARACTER_SET_RESULTS=@OLD_CHARACTER_SET_RESULTS */;
 /*!40101 SET COLLATION_CONNECTION=@OLD_COLLATION_CONNECTION */;
 """
+
+
+# Índices añadidos después de crear las tablas: CREATE TABLE IF NOT EXISTS no
+# los añade a una base de datos que ya existía (tabla, índice, columnas)
+SCHEMA_INDEXES = [
+    ('presupuestos', 'idx_presupuestos_usuario_mes', '`usuario_id`,`mes_year`'),
+    ('movimientos', 'idx_movimientos_fecha', '`fecha`,`usuario_id`,`tipo`'),
+]
+
+
+def schema_statements():
+    """Sentencias del esquema, una a una"""
+    return [stmt.strip() for stmt in SCHEMA_SQL.split(';') if stmt.strip()]
+
+
+def ensure_indexes(cursor):
+    """Crear los índices de SCHEMA_INDEXES que falten; devuelve los creados"""
+    created = []
+    for table, name, columns in SCHEMA_INDEXES:
+        cursor.execute("""
+            SELECT 1 FROM information_schema.STATISTICS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s
+            LIMIT 1
+        """, (table, name))
+        if cursor.fetchone() is None:
+            cursor.execute(f"ALTER TABLE `{table}` ADD KEY `{name}` ({columns})")
+            created.append(name)
+    return created
+
+
+def derived_tables():
+    """Tablas que se calculan desde gastos/ingresos: tabla -> sentencias de relleno"""
+    from models.activity import ActivityFeedModel
+    from models.balance import BalanceModel
+    from models.rollup import MonthlyRollupModel
+    return {
+        'resumen_mensual': MonthlyRollupModel().backfill_statements(),
+        'saldos': BalanceModel().backfill_statements(),
+        'movimientos': ActivityFeedModel().backfill_statements(),
+    }
+
+
+def backfill_derived_tables(connection, cursor):
+    """Llenar las tablas derivadas que estén vacías (recién creadas) desde los
+    movimientos existentes; devuelve las tablas llenadas.
+
+    Una tabla vacía junto a gastos o ingresos con datos daría totales a cero:
+    la aplicación solo suma a ellas los cambios posteriores.
+    """
+    filled = []
+    for table, statements in derived_tables().items():
+        cursor.execute(f"SELECT 1 FROM `{table}` LIMIT 1")
+        if cursor.fetchone() is not None:
+            continue
+        connection.begin()
+        try:
+            for query, params in statements:
+                cursor.execute(query, params)
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        filled.append(table)
+    return filled
+
+
+def init_database():
+    print("=== 🗄️ INICIALIZANDO BASE DE DATOS COMPLETA ===")
+    
+    # Configuración desde Railway
+    db_config = {
+        'host': os.getenv('MYSQLHOST'),
+        'user': os.getenv('MYSQLUSER'),
+        'password': os.getenv('MYSQLPASSWORD'),
+        'database': os.getenv('MYSQLDATABASE'),
+        'port': int(os.getenv('MYSQLPORT', 3306)),
+        'charset': 'utf8mb4',
+        'connect_timeout': 30,
+        'autocommit': True
+    }
+    
+    print(f"Conectando a: {db_config['host']}:{db_config['port']}")
+    print(f"Base de datos: {db_config['database']}")
+    
+    try:
+        # Conectar a MySQL con configuración robusta
+        connection = pymysql.connect(**db_config)
+        cursor = connection.cursor()
+        print("✅ Conexión exitosa a MySQL")
         
         # Ejecutar el script COMPLETO
         print("📝 Ejecutando script SQL COMPLETO...")
         
         # Dividir y ejecutar cada sentencia
-        statements = [stmt.strip() for stmt in sql_script.split(';') if stmt.strip()]
+        statements = schema_statements()
         total_statements = len(statements)
         
         for i, statement in enumerate(statements, 1):
@@ -199,9 +318,15 @@ COMMIT;
                 print(f"⚠️  Error en statement {i}: {e}")
                 # Continuar con las siguientes sentencias
         
+        for name in ensure_indexes(cursor):
+            print(f"✅ Índice añadido: {name}")
+
+        for table in backfill_derived_tables(connection, cursor):
+            print(f"✅ {table} calculada desde los movimientos existentes")
+
         connection.commit()
         print("🎉 TODAS LAS TABLAS CREADAS EXITOSAMENTE")
-        print("📊 Tablas creadas: roles, usuarios, categorias_gastos, categorias_ingresos, gastos, ingresos, presupuestos, ahorros")
+        print("📊 Tablas creadas: roles, usuarios, categorias_gastos, categorias_ingresos, gastos, ingresos, presupuestos, ahorros, resumen_mensual, saldos, movimientos")
         
         # Verificar que las tablas se crearon
         print("🔍 Verificando creación de tablas...")
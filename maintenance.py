@@ -0,0 +1,116 @@
+import argparse
+import sys
+
+from models.rollup import MonthlyRollupModel
+from models.balance import BalanceModel
+from models.activity import ActivityFeedModel
+
+
+def rebuild_resumen(usuario_id=None):
+    """Recalcular resumen_mensual desde gastos e ingresos"""
+    alcance = f"usuario {usuario_id}" if usuario_id is not None else "todos los usuarios"
+    print(f"=== 🔄 RECONSTRUYENDO resumen_mensual ({alcance}) ===")
+    MonthlyRollupModel().rebuild(usuario_id)
+    print("✅ resumen_mensual reconstruido")
+    return 0
+
+
+def verify_resumen(usuario_id=None):
+    """Comparar resumen_mensual con gastos e ingresos"""
+    alcance = f"usuario {usuario_id}" if usuario_id is not None else "todos los usuarios"
+    print(f"=== 🔍 VERIFICANDO resumen_mensual ({alcance}) ===")
+    differences = MonthlyRollupModel().verify(usuario_id)
+
+    if not differences:
+        print("✅ resumen_mensual coincide con los movimientos")
+        return 0
+
+    print(f"❌ {len(differences)} diferencias (usuario, tipo, categoría, mes) -> (total, cantidad, esencial, no esencial):")
+    for diff in differences:
+        print(f"   {diff['clave']}: esperado={diff['esperado']} actual={diff['actual']}")
+    print("   Ejecuta 'python maintenance.py rebuild-resumen' para corregirlo")
+    return 1
+
+
+def rebuild_saldos(usuario_id=None):
+    """Recalcular saldos desde gastos e ingresos"""
+    alcance = f"usuario {usuario_id}" if usuario_id is not None else "todos los usuarios"
+    print(f"=== 🔄 RECONSTRUYENDO saldos ({alcance}) ===")
+    BalanceModel().rebuild(usuario_id)
+    print("✅ saldos reconstruidos")
+    return 0
+
+
+def verify_saldos(usuario_id=None):
+    """Comparar saldos con gastos e ingresos"""
+    alcance = f"usuario {usuario_id}" if usuario_id is not None else "todos los usuarios"
+    print(f"=== 🔍 VERIFICANDO saldos ({alcance}) ===")
+    differences = BalanceModel().verify(usuario_id)
+
+    if not differences:
+        print("✅ saldos coinciden con los movimientos")
+        return 0
+
+    print(f"❌ {len(differences)} diferencias usuario -> (ingresos, gastos, saldo):")
+    for diff in differences:
+        print(f"   {diff['clave']}: esperado={diff['esperado']} actual={diff['actual']}")
+    print("   Ejecuta 'python maintenance.py rebuild-saldos' para corregirlo")
+    return 1
+
+
+def rebuild_movimientos(usuario_id=None):
+    """Regenerar el feed movimientos desde gastos e ingresos"""
+    alcance = f"usuario {usuario_id}" if usuario_id is not None else "todos los usuarios"
+    print(f"=== 🔄 RECONSTRUYENDO movimientos ({alcance}) ===")
+    ActivityFeedModel().rebuild(usuario_id)
+    print("✅ movimientos reconstruidos")
+    return 0
+
+
+def verify_movimientos(usuario_id=None):
+    """Comparar el feed movimientos con gastos e ingresos"""
+    alcance = f"usuario {usuario_id}" if usuario_id is not None else "todos los usuarios"
+    print(f"=== 🔍 VERIFICANDO movimientos ({alcance}) ===")
+    differences = ActivityFeedModel().verify(usuario_id)
+
+    if not differences:
+        print("✅ movimientos coinciden con gastos e ingresos")
+        return 0
+
+    print(f"❌ {len(differences)} diferencias (tipo, id) -> (usuario, monto, categoría, fecha, concepto):")
+    for diff in differences:
+        print(f"   {diff['clave']}: esperado={diff['esperado']} actual={diff['actual']}")
+    print("   Ejecuta 'python maintenance.py rebuild-movimientos' para corregirlo")
+    return 1
+
+
+COMMANDS = {
+    'rebuild-resumen': (rebuild_resumen, 'Reconstruir resumen_mensual'),
+    'verify-resumen': (verify_resumen, 'Verificar resumen_mensual'),
+    'rebuild-saldos': (rebuild_saldos, 'Reconstruir saldos'),
+    'verify-saldos': (verify_saldos, 'Verificar saldos'),
+    'rebuild-movimientos': (rebuild_movimientos, 'Reconstruir movimientos'),
+    'verify-movimientos': (verify_movimientos, 'Verificar movimientos'),
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tareas de mantenimiento de la base de datos")
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    for nombre, (_, ayuda) in COMMANDS.items():
+        sub = subparsers.add_parser(nombre, help=ayuda)
+        sub.add_argument('--usuario', type=int, default=None, help='Limitar a un usuario')
+
+    args = parser.parse_args(argv)
+
+    try:
+        command, _ = COMMANDS[args.comando]
+        return command(args.usuario)
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
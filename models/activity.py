@@ -0,0 +1,155 @@
+from utils.database import Database
+from utils.pagination import keyset_predicate, split_page
+from utils.memo import request_memoized
+from models.category import CategoryModel, get_category_catalog
+
+class ActivityFeedModel:
+    """Feed unificado de ingresos y gastos (tabla movimientos).
+
+    Una fila por ingreso o gasto, copiada en la misma transacción que cada alta,
+    edición y baja. El índice (usuario_id, fecha_registro, id) permite leer la
+    actividad reciente y seguir paginando sin unir ni ordenar todo el historial.
+    """
+
+    INGRESO = 'ingreso'
+    GASTO = 'gasto'
+
+    SOURCE_TABLES = {INGRESO: 'ingresos', GASTO: 'gastos'}
+
+    def __init__(self):
+        self.db = Database()
+        self.table = "movimientos"
+
+    # ------------------------------------------------------------------
+    # Mantenimiento en cada escritura
+    # ------------------------------------------------------------------
+    def record(self, tipo, origen_id):
+        """Copiar al feed un ingreso o gasto recién creado (con su fecha_registro)"""
+        source = self.SOURCE_TABLES[tipo]
+        query = f"""
+        INSERT INTO {self.table} (usuario_id, tipo, origen_id, concepto, monto, categoria_id, fecha, fecha_registro)
+        SELECT usuario_id, %s, id, concepto, monto, categoria_id, fecha, fecha_registro
+        FROM {source} WHERE id = %s
+        """
+        return self.db.execute_query(query, (tipo, origen_id))
+
+    def update(self, tipo, origen_id, concepto, monto, categoria_id, fecha):
+        """Reflejar la edición de un ingreso o gasto"""
+        query = f"""
+        UPDATE {self.table}
+        SET concepto = %s, monto = %s, categoria_id = %s, fecha = %s
+        WHERE tipo = %s AND origen_id = %s
+        """
+        return self.db.execute_query(query, (concepto, monto, categoria_id, fecha, tipo, origen_id))
+
+    def remove(self, tipo, origen_id):
+        """Quitar del feed un ingreso o gasto eliminado"""
+        query = f"DELETE FROM {self.table} WHERE tipo = %s AND origen_id = %s"
+        return self.db.execute_query(query, (tipo, origen_id))
+
+    # ------------------------------------------------------------------
+    # Lecturas
+    # ------------------------------------------------------------------
+    def recent_query(self, usuario_id, limit=10, cursor=None):
+        """Consulta de los ``limit`` movimientos más recientes (tras ``cursor`` si se da)"""
+        query = f"""
+        SELECT
+            m.id as movimiento_id,
+            CASE m.tipo WHEN 'ingreso' THEN 'income' ELSE 'expense' END as tipo,
+            m.origen_id as id, m.concepto, m.monto, m.fecha, m.fecha_registro, m.categoria_id
+        FROM {self.table} m
+        WHERE m.usuario_id = %s
+        """
+        params = [usuario_id]
+        if cursor:
+            predicate, cursor_params = keyset_predicate("m.fecha_registro", "m.id", cursor)
+            query += f" AND {predicate}"
+            params.extend(cursor_params)
+        query += " ORDER BY m.fecha_registro DESC, m.id DESC LIMIT %s"
+        params.append(int(limit))
+        return query, tuple(params)
+
+    @staticmethod
+    def attach_categories(rows):
+        """Añadir categoria_nombre, color e icono a filas del feed (sin JOIN)"""
+        catalog = get_category_catalog()
+        tipo_of = lambda row: CategoryModel.INGRESO if row['tipo'] == 'income' else CategoryModel.GASTO
+        return catalog.enrich(list(rows or []), tipo_of)
+
+    @request_memoized
+    def get_recent(self, usuario_id, limit=10):
+        """Obtener los movimientos más recientes del usuario"""
+        rows = self.db.execute_query(*self.recent_query(usuario_id, limit), fetch=True)
+        return self.attach_categories(rows)
+
+    @request_memoized
+    def get_page(self, usuario_id, limit=10, cursor=None):
+        """Obtener una página del feed; devuelve ``(movimientos, cursor_siguiente)``"""
+        rows = self.db.execute_query(*self.recent_query(usuario_id, limit + 1, cursor), fetch=True)
+        return split_page(self.attach_categories(rows), limit, date_key='fecha_registro', id_key='movimiento_id')
+
+    # ------------------------------------------------------------------
+    # Reconstrucción y verificación
+    # ------------------------------------------------------------------
+    def _source_query(self, tipo, usuario_id=None):
+        source = self.SOURCE_TABLES[tipo]
+        query = f"""
+        SELECT usuario_id, '{tipo}' as tipo, id as origen_id, concepto, monto, categoria_id, fecha, fecha_registro
+        FROM {source}
+        """
+        params = ()
+        if usuario_id is not None:
+            query += " WHERE usuario_id = %s"
+            params = (usuario_id,)
+        return query, params
+
+    def backfill_statements(self, usuario_id=None):
+        """Sentencias ``(sql, params)`` que llenan el feed desde ingresos y gastos
+        (sobre la tabla vacía; también las usa init_database.py)"""
+        # Ingresos y gastos intercalados por fecha de registro para que los id
+        # del feed sigan el orden cronológico
+        parts = [self._source_query(tipo, usuario_id) for tipo in self.SOURCE_TABLES]
+        union = " UNION ALL ".join(f"({query})" for query, _ in parts)
+        params = tuple(param for _, part_params in parts for param in part_params)
+        return [(f"""
+        INSERT INTO {self.table} (usuario_id, tipo, origen_id, concepto, monto, categoria_id, fecha, fecha_registro)
+        SELECT * FROM ({union}) as origen ORDER BY fecha_registro, origen_id
+        """, params)]
+
+    def rebuild(self, usuario_id=None):
+        """Regenerar el feed desde ingresos y gastos (todos los usuarios o uno)"""
+        with self.db.transaction():
+            if usuario_id is None:
+                self.db.execute_query(f"DELETE FROM {self.table}")
+            else:
+                self.db.execute_query(f"DELETE FROM {self.table} WHERE usuario_id = %s", (usuario_id,))
+
+            for query, params in self.backfill_statements(usuario_id):
+                self.db.execute_query(query, params)
+
+    def verify(self, usuario_id=None):
+        """Comparar el feed con ingresos y gastos; devuelve la lista de diferencias"""
+        def values(row):
+            return (row['usuario_id'], round(float(row['monto']), 2), row['categoria_id'],
+                    str(row['fecha']), row['concepto'])
+
+        expected = {}
+        for tipo in self.SOURCE_TABLES:
+            for row in self.db.execute_query(*self._source_query(tipo, usuario_id), fetch=True):
+                expected[(tipo, row['origen_id'])] = values(row)
+
+        query = f"SELECT * FROM {self.table}"
+        params = ()
+        if usuario_id is not None:
+            query += " WHERE usuario_id = %s"
+            params = (usuario_id,)
+        actual = {
+            (row['tipo'], row['origen_id']): values(row)
+            for row in self.db.execute_query(query, params, fetch=True)
+        }
+
+        differences = []
+        for k in sorted(set(expected) | set(actual)):
+            if expected.get(k) != actual.get(k):
+                differences.append({'clave': k, 'esperado': expected.get(k), 'actual': actual.get(k)})
+        return differences
@@ -0,0 +1,223 @@
+import os
+import threading
+import time
+from datetime import datetime
+
+from config import Config
+from utils.database import Database
+from utils.periods import Period
+
+class AdminStatsModel:
+    """Estadísticas globales del panel de administración en pocas pasadas.
+
+    - Usuarios activos registrados: un COUNT sobre ``usuarios``.
+    - Totales históricos y top categorías: una pasada agrupada sobre
+      ``resumen_mensual`` (tipo, categoría).
+    - Últimos 30 días, 30 anteriores y usuarios activos: una pasada agrupada
+      sobre ``movimientos`` limitada a los últimos 60 días.
+    """
+
+    TOP_CATEGORIAS = 5
+
+    def __init__(self):
+        self.db = Database()
+
+    def users_query(self):
+        return "SELECT COUNT(*) as total FROM usuarios WHERE activo = 1", None
+
+    def categories_query(self):
+        """Totales históricos por tipo y categoría, con el nombre de la categoría"""
+        query = """
+        SELECT r.tipo, r.categoria_id, COALESCE(cg.nombre, ci.nombre) as nombre,
+               SUM(r.cantidad) as cantidad, SUM(r.total) as total
+        FROM resumen_mensual r
+        LEFT JOIN categorias_gastos cg ON r.tipo = 'gasto' AND cg.id = r.categoria_id
+        LEFT JOIN categorias_ingresos ci ON r.tipo = 'ingreso' AND ci.id = r.categoria_id
+        GROUP BY r.tipo, r.categoria_id, cg.nombre, ci.nombre
+        """
+        return query, None
+
+    def recent_query(self, current, previous):
+        """Importes por usuario y tipo en el periodo actual y el anterior.
+
+        El periodo actual no tiene límite superior: los movimientos con fecha
+        futura también cuentan en él, como en los totales de siempre.
+        """
+        query = """
+        SELECT usuario_id, tipo,
+               SUM(CASE WHEN fecha >= %s THEN monto ELSE 0 END) as actual,
+               SUM(CASE WHEN fecha < %s THEN monto ELSE 0 END) as anterior,
+               SUM(CASE WHEN fecha >= %s THEN 1 ELSE 0 END) as movimientos_actual
+        FROM movimientos
+        WHERE fecha >= %s
+        GROUP BY usuario_id, tipo
+        """
+        return query, (current.start, current.start, current.start, previous.start)
+
+    def compute(self, today=None):
+        """Calcular todas las estadísticas de la página"""
+        current = Period.last_days(30, today)
+        previous = current.previous()
+
+        users_result, category_rows, recent_rows = self.db.execute_batch([
+            self.users_query(),
+            self.categories_query(),
+            self.recent_query(current, previous),
+        ])
+
+        total_usuarios = int(users_result[0]['total']) if users_result else 0
+
+        totales = {'ingreso': 0.0, 'gasto': 0.0}
+        por_tipo = {'ingreso': [], 'gasto': []}
+        for row in category_rows:
+            total = float(row['total'] or 0)
+            totales[row['tipo']] += total
+            if row['nombre'] and int(row['cantidad'] or 0) > 0:
+                por_tipo[row['tipo']].append({
+                    'nombre': row['nombre'],
+                    'cantidad': int(row['cantidad']),
+                    'total': total
+                })
+
+        recientes = {'ingreso': 0.0, 'gasto': 0.0}
+        anteriores = {'ingreso': 0.0, 'gasto': 0.0}
+        activos = set()
+        for row in recent_rows:
+            recientes[row['tipo']] += float(row['actual'] or 0)
+            anteriores[row['tipo']] += float(row['anterior'] or 0)
+            if int(row['movimientos_actual'] or 0) > 0:
+                activos.add(row['usuario_id'])
+
+        def top(items):
+            return sorted(items, key=lambda item: item['total'], reverse=True)[:self.TOP_CATEGORIAS]
+
+        def variacion(actual, anterior):
+            if anterior == 0:
+                return 0
+            return round((actual - anterior) / anterior * 100, 1)
+
+        ingresos_totales = totales['ingreso']
+        gastos_totales = totales['gasto']
+        return {
+            'total_usuarios': total_usuarios,
+            'ingresos_totales': ingresos_totales,
+            'gastos_totales': gastos_totales,
+            'usuarios_activos': len(activos),
+            'promedio_ingresos': ingresos_totales / total_usuarios if total_usuarios else 0,
+            'promedio_gastos': gastos_totales / total_usuarios if total_usuarios else 0,
+            'balance_total': ingresos_totales - gastos_totales,
+            'top_categorias_ingresos': top(por_tipo['ingreso']),
+            'top_categorias_gastos': top(por_tipo['gasto']),
+            'ingresos_ultimo_mes': recientes['ingreso'],
+            'gastos_ultimo_mes': recientes['gasto'],
+            'variacion_ingresos': variacion(recientes['ingreso'], anteriores['ingreso']),
+            'variacion_gastos': variacion(recientes['gasto'], anteriores['gasto']),
+        }
+
+
+class StatsSnapshot:
+    """Última foto de las estadísticas con refresco en segundo plano.
+
+    - La primera lectura calcula la foto; las peticiones simultáneas esperan a
+      ese mismo cálculo en lugar de lanzar otro (single-flight).
+    - Un hilo de fondo la recalcula cada ``interval`` segundos; si una lectura
+      la encuentra caducada (p. ej. el hilo no está activo) dispara un único
+      refresco y mientras tanto devuelve la foto anterior.
+    """
+
+    def __init__(self, model=None, interval=None, background=None):
+        self.model = model or AdminStatsModel()
+        self.interval = interval if interval is not None else Config.ADMIN_STATS_REFRESH_INTERVAL
+        self.background = Config.ADMIN_STATS_BACKGROUND if background is None else background
+        self._data = None
+        self._generated_at = None
+        self._generated_monotonic = None
+        self._pid = None
+        self._init_process_state()
+        self.stats = {'refrescos': 0, 'errores': 0}
+
+    def _init_process_state(self):
+        # Locks e hilo son de cada proceso: tras un fork se crean de nuevo (un lock
+        # tomado por el hilo de fondo del padre quedaría bloqueado para siempre)
+        self._lock = threading.Lock()
+        self._refreshing = threading.Lock()
+        self._ready = threading.Event()
+        if self._data is not None:
+            self._ready.set()
+        self._thread = None
+
+    def get(self):
+        """Devolver ``(estadísticas, generado_en)``"""
+        self._check_process()
+
+        if self._data is None:
+            # Sin foto todavía: calcularla (o esperar a quien ya la está calculando)
+            if not self.refresh(wait=True):
+                self._ready.wait(timeout=Config.QUERY_DEADLINE)
+            if self._data is None:
+                raise RuntimeError("No hay estadísticas disponibles")
+        elif time.monotonic() - self._generated_monotonic > self.interval and not self._refreshing.locked():
+            threading.Thread(target=self.refresh, name='estadisticas-admin', daemon=True).start()
+
+        with self._lock:
+            return self._data, self._generated_at
+
+    def refresh(self, wait=False):
+        """Recalcular la foto; devuelve False si ya había otro cálculo en curso"""
+        if not self._refreshing.acquire(blocking=False):
+            return False
+        try:
+            started = time.monotonic()
+            data = self.model.compute()
+            with self._lock:
+                self._data = data
+                self._generated_at = datetime.now()
+                self._generated_monotonic = time.monotonic()
+            self.stats['refrescos'] += 1
+            print(f"📊 Estadísticas de administración recalculadas en {time.monotonic() - started:.2f}s")
+            return True
+        except Exception as e:
+            self.stats['errores'] += 1
+            print(f"❌ Error recalculando estadísticas de administración: {e}")
+            if wait:
+                raise
+            return True
+        finally:
+            self._refreshing.release()
+            self._ready.set()
+
+    def invalidate(self):
+        """Forzar el recálculo en la próxima lectura"""
+        with self._lock:
+            self._generated_monotonic = float('-inf') if self._data is not None else None
+
+    def _check_process(self):
+        if self._pid == os.getpid():
+            return
+        with _snapshot_lock:
+            if self._pid == os.getpid():
+                return
+            self._init_process_state()
+            if self.background:
+                self._thread = threading.Thread(target=self._run, name='estadisticas-admin-fondo', daemon=True)
+                self._thread.start()
+            self._pid = os.getpid()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.refresh()
+
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+
+def get_admin_stats_snapshot():
+    """Foto de estadísticas compartida por el proceso"""
+    global _snapshot
+    if _snapshot is None:
+        with _snapshot_lock:
+            if _snapshot is None:
+                _snapshot = StatsSnapshot()
+    return _snapshot
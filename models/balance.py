@@ -0,0 +1,164 @@
+from utils.database import Database
+from utils.memo import request_memoized
+
+class BalanceModel:
+    """Saldo acumulado por usuario (tabla saldos).
+
+    Guarda ingresos totales, gastos totales y saldo de cada usuario. Se actualiza
+    en la misma transacción que cada alta, edición y baja de ``gastos`` e
+    ``ingresos``, así que consultar el saldo es leer una fila por clave primaria.
+    """
+
+    def __init__(self):
+        self.db = Database()
+        self.table = "saldos"
+
+    def apply(self, usuario_id, ingresos=0, gastos=0):
+        """Sumar (o restar, con importes negativos) a los totales del usuario"""
+        ingresos = float(ingresos or 0)
+        gastos = float(gastos or 0)
+        if not ingresos and not gastos:
+            return None
+
+        # Usuario sin fila (tabla recién creada o anterior a ella): crearla desde
+        # los movimientos antes de sumar, o el saldo solo reflejaría este cambio
+        self._seed(usuario_id, ingresos, gastos)
+
+        query = f"""
+        INSERT INTO {self.table} (usuario_id, total_ingresos, total_gastos, saldo)
+        VALUES (%s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            total_ingresos = total_ingresos + VALUES(total_ingresos),
+            total_gastos = total_gastos + VALUES(total_gastos),
+            saldo = saldo + VALUES(saldo)
+        """
+        return self.db.execute_query(query, (usuario_id, ingresos, gastos, ingresos - gastos))
+
+    def create_empty(self, usuario_id):
+        """Crear la fila a cero de un usuario nuevo (al registrarlo)"""
+        return self.db.execute_query(f"""
+        INSERT INTO {self.table} (usuario_id) VALUES (%s)
+        ON DUPLICATE KEY UPDATE usuario_id = usuario_id
+        """, (usuario_id,))
+
+    def by_user_query(self, usuario_id, for_update=False):
+        """Consulta de la fila de saldo del usuario"""
+        query = f"SELECT total_ingresos, total_gastos, saldo FROM {self.table} WHERE usuario_id = %s"
+        if for_update:
+            query += " FOR UPDATE"
+        return query, (usuario_id,)
+
+    @request_memoized
+    def get(self, usuario_id):
+        """Obtener ingresos, gastos y saldo del usuario (sin bloquear)"""
+        result = self.db.execute_query(*self.by_user_query(usuario_id), fetch_one=True)
+        return self.parse(result)
+
+    def lock(self, usuario_id):
+        """Leer el saldo bloqueando la fila hasta el final de la transacción.
+
+        Debe llamarse dentro de ``Database.transaction()`` (o de una petición):
+        dos gastos simultáneos del mismo usuario se serializan aquí y el segundo
+        ve el saldo ya descontado por el primero.
+        """
+        # La fila debe existir antes del FOR UPDATE: sobre una clave ausente
+        # InnoDB bloquea el hueco, dos primeras escrituras simultáneas insertan
+        # las dos y una acaba en deadlock (1213)
+        self._seed(usuario_id)
+        result = self.db.execute_query(*self.by_user_query(usuario_id, for_update=True), fetch_one=True)
+        return self.parse(result)
+
+    @staticmethod
+    def parse(result):
+        total_ingresos = float(result['total_ingresos']) if result else 0.0
+        total_gastos = float(result['total_gastos']) if result else 0.0
+        return {
+            'total_ingresos': total_ingresos,
+            'total_gastos': total_gastos,
+            'saldo': total_ingresos - total_gastos
+        }
+
+    def _source_query(self, usuario_id=None):
+        """Totales equivalentes calculados desde gastos e ingresos"""
+        where = "WHERE usuario_id = %s" if usuario_id is not None else ""
+        query = f"""
+        SELECT usuario_id,
+               SUM(ingresos) as total_ingresos,
+               SUM(gastos) as total_gastos,
+               SUM(ingresos) - SUM(gastos) as saldo
+        FROM (
+            SELECT usuario_id, monto as ingresos, 0 as gastos FROM ingresos {where}
+            UNION ALL
+            SELECT usuario_id, 0 as ingresos, monto as gastos FROM gastos {where}
+        ) as movimientos
+        GROUP BY usuario_id
+        """
+        params = (usuario_id, usuario_id) if usuario_id is not None else ()
+        return query, params
+
+    def _seed(self, usuario_id, ingresos=0, gastos=0):
+        """Crear la fila del usuario desde los movimientos si todavía no existe.
+
+        ``ingresos`` y ``gastos`` son un cambio ya escrito en las tablas de
+        movimientos que ``apply`` va a sumar a continuación: se descuentan aquí
+        para no contarlo dos veces.
+        """
+        exists = self.db.execute_query(
+            f"SELECT 1 FROM {self.table} WHERE usuario_id = %s", (usuario_id,), fetch_one=True)
+        if exists:
+            return
+        query, params = self._source_query(usuario_id)
+        self.db.execute_query(f"""
+        INSERT INTO {self.table} (usuario_id, total_ingresos, total_gastos, saldo)
+        SELECT %s, COALESCE(MAX(total_ingresos), 0) - %s, COALESCE(MAX(total_gastos), 0) - %s,
+               COALESCE(MAX(saldo), 0) - %s
+        FROM ({query}) as totales
+        ON DUPLICATE KEY UPDATE usuario_id = usuario_id
+        """, (usuario_id, ingresos, gastos, ingresos - gastos, *params))
+
+    def backfill_statements(self, usuario_id=None):
+        """Sentencias ``(sql, params)`` que llenan los saldos desde los movimientos
+        (sobre la tabla vacía; también las usa init_database.py)"""
+        query, params = self._source_query(usuario_id)
+        return [(f"""
+        INSERT INTO {self.table} (usuario_id, total_ingresos, total_gastos, saldo)
+        {query}
+        """, params)]
+
+    def rebuild(self, usuario_id=None):
+        """Recalcular los saldos desde cero (todos los usuarios o uno)"""
+        with self.db.transaction():
+            if usuario_id is None:
+                self.db.execute_query(f"DELETE FROM {self.table}")
+            else:
+                self.db.execute_query(f"DELETE FROM {self.table} WHERE usuario_id = %s", (usuario_id,))
+
+            for query, params in self.backfill_statements(usuario_id):
+                self.db.execute_query(query, params)
+
+    def verify(self, usuario_id=None):
+        """Comparar los saldos con los movimientos; devuelve la lista de diferencias"""
+        def values(row):
+            return tuple(round(float(row[c] or 0), 2) for c in ('total_ingresos', 'total_gastos', 'saldo'))
+
+        expected = {
+            row['usuario_id']: values(row)
+            for row in self.db.execute_query(*self._source_query(usuario_id), fetch=True)
+        }
+
+        query = f"SELECT * FROM {self.table}"
+        params = ()
+        if usuario_id is not None:
+            query += " WHERE usuario_id = %s"
+            params = (usuario_id,)
+        actual = {}
+        for row in self.db.execute_query(query, params, fetch=True):
+            # Un usuario cuyos movimientos se borraron todos equivale a no tener fila
+            if any(values(row)):
+                actual[row['usuario_id']] = values(row)
+
+        differences = []
+        for k in sorted(set(expected) | set(actual)):
+            if expected.get(k) != actual.get(k):
+                differences.append({'clave': k, 'esperado': expected.get(k), 'actual': actual.get(k)})
+        return differences
@@ -0,0 +1,130 @@
+from utils.database import Database
+from utils.periods import Period
+from utils.memo import request_memoized
+from models.category import CategoryModel, get_category_catalog
+from datetime import datetime
+
+class BudgetStatus:
+    """Estado de los presupuestos de un usuario en un mes.
+
+    Se construye con tres resultados (presupuestos del mes, gasto del mes por
+    categoría y categorías de gastos) y de ahí salen todas las cifras: uso de
+    cada presupuesto, resumen, categorías sin presupuesto y admisión de gastos.
+    """
+
+    def __init__(self, budgets, spend_rows, categories):
+        self.spend_by_category = {
+            int(row['categoria_id']): float(row['total'] or 0) for row in spend_rows
+        }
+        self.categories = categories
+
+        self.budgets = []
+        for budget in budgets:
+            monto_maximo = float(budget['monto_maximo'] or 0)
+            gasto_actual = self.spend_by_category.get(int(budget['categoria_gasto_id']), 0.0)
+            budget['gasto_actual'] = gasto_actual
+            budget['saldo_restante'] = monto_maximo - gasto_actual
+            budget['porcentaje_uso'] = round(gasto_actual / monto_maximo * 100, 2) if monto_maximo > 0 else 0
+            self.budgets.append(budget)
+
+        self._by_category = {int(b['categoria_gasto_id']): b for b in self.budgets}
+
+    @property
+    def summary(self):
+        """Totales presupuestado / gastado / restante del mes"""
+        total_presupuestado = sum(float(b['monto_maximo'] or 0) for b in self.budgets)
+        total_gastado = sum(b['gasto_actual'] for b in self.budgets)
+        return {
+            'total_presupuestado': total_presupuestado,
+            'total_gastado': total_gastado,
+            'saldo_restante': total_presupuestado - total_gastado,
+            'total_categorias': len(self.budgets)
+        }
+
+    @property
+    def unbudgeted_categories(self):
+        """Categorías de gastos sin presupuesto en el mes"""
+        return [c for c in self.categories if int(c['id']) not in self._by_category]
+
+    def budget_for(self, categoria_id):
+        """Presupuesto de la categoría (con gasto_actual y saldo_restante) o None"""
+        return self._by_category.get(int(categoria_id))
+
+    def remaining_for(self, categoria_id):
+        """Presupuesto disponible en la categoría; None si no tiene presupuesto"""
+        budget = self.budget_for(categoria_id)
+        return budget['saldo_restante'] if budget else None
+
+    def admits(self, categoria_id, monto):
+        """True si un gasto de ``monto`` cabe en el presupuesto de la categoría"""
+        remaining = self.remaining_for(categoria_id)
+        return remaining is None or float(monto) <= remaining
+
+
+class BudgetStatusEngine:
+    """Calcula el estado de los presupuestos con una sola agregación del gasto.
+
+    El gasto del mes por categoría se lee una vez de ``resumen_mensual`` con un
+    rango semiabierto sobre ``mes``; presupuestos y gasto van en un solo viaje a
+    la base de datos y las categorías salen del catálogo en memoria.
+    """
+
+    def __init__(self):
+        self.db = Database()
+        self.categories = get_category_catalog()
+
+    def budgets_query(self, usuario_id, period, categoria_id=None):
+        """Consulta de los presupuestos del mes con los datos de su categoría"""
+        predicate, period_params = period.predicate("p.mes_year")
+        query = f"""
+        SELECT p.*
+        FROM presupuestos p
+        WHERE p.usuario_id = %s AND {predicate}
+        """
+        params = [usuario_id, *period_params]
+        if categoria_id is not None:
+            query += " AND p.categoria_gasto_id = %s"
+            params.append(categoria_id)
+        return query, tuple(params)
+
+    def spend_query(self, usuario_id, period, categoria_id=None):
+        """Consulta del gasto del mes agrupado por categoría"""
+        predicate, period_params = period.predicate("mes")
+        query = f"""
+        SELECT categoria_id, SUM(total) as total
+        FROM resumen_mensual
+        WHERE usuario_id = %s AND tipo = 'gasto' AND {predicate}
+        """
+        params = [usuario_id, *period_params]
+        if categoria_id is not None:
+            query += " AND categoria_id = %s"
+            params.append(categoria_id)
+        query += " GROUP BY categoria_id"
+        return query, tuple(params)
+
+    @request_memoized
+    def evaluate(self, usuario_id, month=None, year=None, categoria_id=None):
+        """Estado de los presupuestos del mes (de una sola categoría si se indica)"""
+        if not month or not year:
+            current_date = datetime.now()
+            month = current_date.month
+            year = current_date.year
+
+        budgets, spend_rows = self.db.execute_batch(self.queries(usuario_id, month, year, categoria_id))
+        return self.from_rows(budgets, spend_rows, categoria_id)
+
+    def queries(self, usuario_id, month, year, categoria_id=None):
+        """Presupuestos y gasto del mes, para enviarlos en un solo viaje"""
+        period = Period.for_month(year, month)
+        return [
+            self.budgets_query(usuario_id, period, categoria_id),
+            self.spend_query(usuario_id, period, categoria_id),
+        ]
+
+    def from_rows(self, budgets, spend_rows, categoria_id=None):
+        """Estado a partir de las filas de ``queries`` (también las del pool asíncrono)"""
+        # Nombre, color e icono de la categoría desde el catálogo en memoria
+        budgets = self.categories.enrich(budgets, CategoryModel.GASTO, id_key='categoria_gasto_id')
+        budgets.sort(key=lambda budget: budget['categoria_nombre'] or '')
+        categories = self.categories.list(CategoryModel.GASTO) if categoria_id is None else []
+        return BudgetStatus(budgets, spend_rows, categories)
@@ -0,0 +1,171 @@
+import asyncio
+import os
+import threading
+import time
+
+from config import Config
+from utils.cache import get_cache
+from utils.database import Database
+from utils.metrics import record_cache
+
+class CategoryModel:
+    """Categorías de gastos e ingresos (tablas pequeñas que casi nunca cambian)"""
+
+    GASTO = 'gasto'
+    INGRESO = 'ingreso'
+
+    TABLES = {GASTO: 'categorias_gastos', INGRESO: 'categorias_ingresos'}
+
+    def __init__(self):
+        self.db = Database()
+
+    def all_query(self, tipo):
+        """Consulta de todas las categorías de un tipo"""
+        return f"SELECT * FROM {self.TABLES[tipo]} ORDER BY nombre", ()
+
+    def load_all(self):
+        """Leer las dos tablas de categorías en un solo viaje: ``{tipo: [filas]}``"""
+        tipos = list(self.TABLES)
+        results = self.db.execute_batch([self.all_query(tipo) for tipo in tipos])
+        return dict(zip(tipos, results))
+
+
+class CategoryCatalog:
+    """Catálogo de categorías en memoria, uno por proceso.
+
+    - Se carga la primera vez que se usa (las dos tablas en un solo viaje) y se
+      recarga cuando pasan ``ttl`` segundos o tras ``invalidate()``.
+    - ``invalidate()`` sube un contador del caché de la aplicación
+      (``utils.cache``): con un backend compartido, los demás workers también
+      recargan en su siguiente uso.
+    - Cada carga sube ``version``: sirve para detectar que el catálogo cambió.
+    - ``enrich()`` añade nombre, color e icono a filas que solo traen
+      ``categoria_id``, así los listados no necesitan unir las tablas de categorías.
+    - Las filas que se entregan son copias: el catálogo no se puede modificar
+      desde fuera.
+    """
+
+    # Columnas de la categoría que se copian a cada fila enriquecida
+    FIELDS = (('nombre', 'categoria_nombre'), ('color', 'color'), ('icono', 'icono'))
+
+    SHARED_VERSION = 'categorias:version'
+
+    def __init__(self, model=None, ttl=None, cache=None):
+        self.model = model or CategoryModel()
+        self.cache = cache or get_cache()
+        self.ttl = Config.CATEGORY_CATALOG_TTL if ttl is None else ttl
+        self.version = 0
+        self._by_tipo = None        # tipo -> [filas] ordenadas por nombre
+        self._by_id = None          # (tipo, id) -> fila
+        self._loaded_at = None
+        self._shared_version = None  # contador compartido cuando se cargó
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self.stats = {'cargas': 0, 'errores': 0}
+
+    # ------------------------------------------------------------------
+    # Carga e invalidación
+    # ------------------------------------------------------------------
+    def _ensure_loaded(self):
+        if os.getpid() != self._pid:
+            # Tras un fork el lock podría haberse copiado tomado
+            self._lock = threading.Lock()
+            self._pid = os.getpid()
+        shared_version = self.cache.get_counter(self.SHARED_VERSION)
+        if self._is_fresh(shared_version):
+            record_cache('categorias', True)
+            return
+        with self._lock:
+            if self._is_fresh(shared_version):
+                record_cache('categorias', True)
+                return
+            record_cache('categorias', False)
+            try:
+                by_tipo = self.model.load_all()
+            except Exception as e:
+                self.stats['errores'] += 1
+                print(f"❌ Error cargando el catálogo de categorías: {e}")
+                if self._by_tipo is None:
+                    raise
+                # Mejor servir el catálogo anterior que fallar la página
+                self._loaded_at = time.monotonic()
+                self._shared_version = shared_version
+                return
+            self._by_id = {
+                (tipo, int(row['id'])): row for tipo, rows in by_tipo.items() for row in rows
+            }
+            self._by_tipo = by_tipo
+            self._loaded_at = time.monotonic()
+            self._shared_version = shared_version
+            self.version += 1
+            self.stats['cargas'] += 1
+
+    def _is_fresh(self, shared_version):
+        return (self._by_tipo is not None and shared_version == self._shared_version
+                and time.monotonic() - self._loaded_at < self.ttl)
+
+    def warm(self):
+        """Cargar el catálogo ahora (arranque de un worker) y no en la primera petición"""
+        self._ensure_loaded()
+
+    async def warm_async(self):
+        """``warm`` sin bloquear el bucle de eventos (APIs asíncronas): si toca
+        recargar, la consulta va a un hilo del executor"""
+        if not self._is_fresh(self.cache.get_counter(self.SHARED_VERSION)):
+            await asyncio.get_running_loop().run_in_executor(None, self.warm)
+
+    def invalidate(self):
+        """Forzar la recarga en el próximo uso, en todos los workers (tras
+        modificar categorías)"""
+        self.cache.incr(self.SHARED_VERSION)
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+    def list(self, tipo):
+        """Todas las categorías de un tipo, ordenadas por nombre"""
+        self._ensure_loaded()
+        return [dict(row) for row in self._by_tipo.get(tipo, [])]
+
+    def get(self, tipo, categoria_id):
+        """Categoría por id (copia) o None"""
+        if categoria_id is None:
+            return None
+        self._ensure_loaded()
+        row = self._by_id.get((tipo, int(categoria_id)))
+        return dict(row) if row else None
+
+    def name(self, tipo, categoria_id, default=None):
+        """Nombre de la categoría o ``default`` si no existe"""
+        category = self.get(tipo, categoria_id)
+        return category['nombre'] if category else default
+
+    def enrich(self, rows, tipo, id_key='categoria_id'):
+        """Añadir ``categoria_nombre``, ``color`` e ``icono`` a cada fila.
+
+        ``tipo`` puede ser un tipo fijo o una función ``fila -> tipo`` (feed con
+        ingresos y gastos mezclados). Sin categoría los campos quedan a None,
+        como hacía el LEFT JOIN.
+        """
+        self._ensure_loaded()
+        tipo_of = tipo if callable(tipo) else (lambda row: tipo)
+        for row in rows:
+            categoria_id = row.get(id_key)
+            category = self._by_id.get((tipo_of(row), int(categoria_id))) if categoria_id is not None else None
+            for source, target in self.FIELDS:
+                row[target] = category[source] if category else None
+        return rows
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def get_category_catalog():
+    """Catálogo de categorías compartido por el proceso"""
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = CategoryCatalog()
+    return _catalog
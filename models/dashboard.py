@@ -1,10 +1,23 @@
 from utils.database import Database
+from utils.query_executor import get_query_executor
+from utils.periods import Period
+from utils.memo import request_memoized
+from models.rollup import MonthlyRollupModel
+from models.activity import ActivityFeedModel
+from models.category import CategoryModel, get_category_catalog
+from models.user_summary import get_user_summary_cache
+from config import Config
 from datetime import datetime, timedelta
 
 class DashboardModel:
     def __init__(self):
         self.db = Database()
+        self.rollup = MonthlyRollupModel()
+        self.activity = ActivityFeedModel()
+        self.categories = get_category_catalog()
+        self.summaries = get_user_summary_cache()
 
+    @request_memoized
     def get_monthly_summary(self, usuario_id, month=None, year=None):
         """Obtener resumen mensual mejorado"""
         if not month or not year:
@@ -12,45 +25,24 @@ class DashboardModel:
             month = current_date.month
             year = current_date.year
 
-        # Obtener ingresos y gastos del mes
-        income_query = """
-        SELECT COALESCE(SUM(monto), 0) as total 
-        FROM ingresos 
-        WHERE usuario_id = %s AND MONTH(fecha) = %s AND YEAR(fecha) = %s
-        """
-        income_result = self.db.execute_query(income_query, (usuario_id, month, year), fetch_one=True)
-        
-        expense_query = """
-        SELECT COALESCE(SUM(monto), 0) as total 
-        FROM gastos 
-        WHERE usuario_id = %s AND MONTH(fecha) = %s AND YEAR(fecha) = %s
-        """
-        expense_result = self.db.execute_query(expense_query, (usuario_id, month, year), fetch_one=True)
+        # Ingresos, gastos y reparto esencial / no esencial del mes desde resumen_mensual
+        result = self.rollup.get_balance(usuario_id, Period.for_month(year, month))
 
-        total_income = income_result['total'] if income_result else 0
-        total_expense = expense_result['total'] if expense_result else 0
+        total_income = result['total_ingresos'] if result else 0
+        total_expense = result['total_gastos'] if result else 0
         balance = total_income - total_expense
         savings_rate = (balance / total_income * 100) if total_income > 0 else 0
 
-        # Gastos esenciales vs no esenciales
-        essential_query = """
-        SELECT 
-            COALESCE(SUM(CASE WHEN esencial = 1 THEN monto ELSE 0 END), 0) as esenciales,
-            COALESCE(SUM(CASE WHEN esencial = 0 THEN monto ELSE 0 END), 0) as no_esenciales
-        FROM gastos 
-        WHERE usuario_id = %s AND MONTH(fecha) = %s AND YEAR(fecha) = %s
-        """
-        essential_result = self.db.execute_query(essential_query, (usuario_id, month, year), fetch_one=True)
-
         return {
             'total_income': total_income,
             'total_expense': total_expense,
             'balance': balance,
             'savings_rate': round(savings_rate, 2),
-            'essential_expenses': essential_result['esenciales'] if essential_result else 0,
-            'non_essential_expenses': essential_result['no_esenciales'] if essential_result else 0
+            'essential_expenses': result['esenciales'] if result else 0,
+            'non_essential_expenses': result['no_esenciales'] if result else 0
         }
 
+    @request_memoized
     def get_expenses_by_category(self, usuario_id, month=None, year=None):
         """Obtener gastos agrupados por categoría"""
         if not month or not year:
@@ -58,51 +50,208 @@ class DashboardModel:
             month = current_date.month
             year = current_date.year
 
-        query = """
-        SELECT cg.nombre, cg.color, cg.icono, COALESCE(SUM(g.monto), 0) as total
-        FROM categorias_gastos cg
-        LEFT JOIN gastos g ON cg.id = g.categoria_id 
-            AND g.usuario_id = %s 
-            AND MONTH(g.fecha) = %s 
-            AND YEAR(g.fecha) = %s
-        GROUP BY cg.id, cg.nombre, cg.color, cg.icono
+        period_sql, period_params = Period.for_month(year, month).predicate("r.mes")
+
+        query = f"""
+        SELECT r.categoria_id, SUM(r.total) as total
+        FROM resumen_mensual r
+        WHERE r.usuario_id = %s AND r.tipo = 'gasto' AND {period_sql}
+        GROUP BY r.categoria_id
         HAVING total > 0
         ORDER BY total DESC
         """
         
-        return self.db.execute_query(query, (usuario_id, month, year), fetch=True)
+        rows = self.db.execute_query(query, (usuario_id, *period_params), fetch=True)
+        # Nombre, color e icono del catálogo; como con el JOIN, sin categoría no se muestra
+        rows = [row for row in self.categories.enrich(rows, CategoryModel.GASTO) if row['categoria_nombre']]
+        return [
+            {'nombre': row['categoria_nombre'], 'color': row['color'], 'icono': row['icono'], 'total': row['total']}
+            for row in rows
+        ]
 
-    def get_recent_transactions(self, usuario_id, limit=10):
-        """Obtener transacciones recientes combinadas"""
-        query = """
-        (SELECT 'income' as tipo, id, concepto, monto, fecha, fecha_registro, NULL as categoria_nombre
-         FROM ingresos WHERE usuario_id = %s)
-        UNION ALL
-        (SELECT 'expense' as tipo, id, concepto, monto, fecha, fecha_registro, 
-                (SELECT nombre FROM categorias_gastos WHERE id = gastos.categoria_id) as categoria_nombre
-         FROM gastos WHERE usuario_id = %s)
-        ORDER BY fecha_registro DESC
-        LIMIT %s
-        """
-        
-        return self.db.execute_query(query, (usuario_id, usuario_id, limit), fetch=True)
+    @request_memoized
+    def get_recent_transactions(self, usuario_id, limit=10, cursor=None):
+        """Obtener transacciones recientes combinadas (feed movimientos, más reciente primero)"""
+        rows = self.db.execute_query(*self.activity.recent_query(usuario_id, limit, cursor), fetch=True)
+        return self.activity.attach_categories(rows)
 
+    @request_memoized
     def get_monthly_comparison(self, usuario_id, months=6):
         """Obtener comparación de últimos meses"""
+        rows = self.rollup.get_monthly_series(usuario_id, Period.last_months(months))
+        # Los meses que quedaron a cero tras borrar movimientos no se muestran
+        return [row for row in rows if row['ingresos'] or row['gastos']]
+
+    # ------------------------------------------------------------------
+    # Widgets del dashboard: cada uno tiene su consulta (``*_query``) y su
+    # conversión de resultado, para poder pedirlos juntos en get_overview()
+    # ------------------------------------------------------------------
+    def month_totals_query(self, usuario_id, month, year):
+        """Consulta de ingresos y gastos del mes"""
+        period_sql, period_params = Period.for_month(year, month).predicate("mes")
+        query = f"""
+        SELECT
+            COALESCE(SUM(CASE WHEN tipo = 'ingreso' THEN total ELSE 0 END), 0) as ingresos_mes,
+            COALESCE(SUM(CASE WHEN tipo = 'gasto' THEN total ELSE 0 END), 0) as gastos_mes
+        FROM resumen_mensual
+        WHERE usuario_id = %s AND {period_sql}
+        """
+        return query, (usuario_id, *period_params)
+
+    def active_goals_query(self, usuario_id, limit=3):
+        """Consulta de metas de ahorro activas más próximas"""
         query = """
-        SELECT 
-            DATE_FORMAT(fecha, '%Y-%m') as mes,
-            SUM(CASE WHEN tipo = 'income' THEN monto ELSE 0 END) as ingresos,
-            SUM(CASE WHEN tipo = 'expense' THEN monto ELSE 0 END) as gastos
-        FROM (
-            SELECT fecha, monto, 'income' as tipo FROM ingresos WHERE usuario_id = %s
-            UNION ALL
-            SELECT fecha, monto, 'expense' as tipo FROM gastos WHERE usuario_id = %s
-        ) as transacciones
-        WHERE fecha >= DATE_SUB(NOW(), INTERVAL %s MONTH)
-        GROUP BY DATE_FORMAT(fecha, '%Y-%m')
-        ORDER BY mes DESC
+        SELECT
+            id,
+            concepto,
+            meta_total,
+            ahorrado_actual,
+            ROUND((ahorrado_actual / meta_total) * 100, 0) as porcentaje_completado,
+            fecha_objetivo,
+            descripcion
+        FROM ahorros
+        WHERE usuario_id = %s AND completado = 0
+        ORDER BY fecha_objetivo ASC
         LIMIT %s
         """
-        
-        return self.db.execute_query(query, (usuario_id, usuario_id, months, months), fetch=True)
\ No newline at end of file
+        return query, (usuario_id, limit)
+
+    def recent_incomes_query(self, usuario_id, limit=5):
+        """Consulta de últimos ingresos (más recientes, sin filtro de año)"""
+        query = """
+        SELECT i.*
+        FROM ingresos i
+        WHERE i.usuario_id = %s
+        ORDER BY i.fecha DESC, i.id DESC LIMIT %s
+        """
+        return query, (usuario_id, limit)
+
+    def recent_expenses_query(self, usuario_id, limit=5):
+        """Consulta de últimos gastos (más recientes, sin filtro de año)"""
+        query = """
+        SELECT g.*
+        FROM gastos g
+        WHERE g.usuario_id = %s
+        ORDER BY g.fecha DESC, g.id DESC LIMIT %s
+        """
+        return query, (usuario_id, limit)
+
+    @staticmethod
+    def parse_totals(result):
+        total_ingresos = result['total_ingresos'] if result else 0
+        total_gastos = result['total_gastos'] if result else 0
+        return {
+            'total_ingresos': total_ingresos,
+            'total_gastos': total_gastos,
+            'saldo': total_ingresos - total_gastos
+        }
+
+    @staticmethod
+    def _parse_month_totals(result):
+        return {
+            'ingresos_mes': result['ingresos_mes'] if result else 0,
+            'gastos_mes': result['gastos_mes'] if result else 0
+        }
+
+    @staticmethod
+    def _summary_totals(summary):
+        return {
+            'total_ingresos': summary['total_ingresos'],
+            'total_gastos': summary['total_gastos'],
+            'saldo': summary['saldo']
+        }
+
+    @staticmethod
+    def _summary_month_totals(summary):
+        return {'ingresos_mes': summary['ingresos_mes'], 'gastos_mes': summary['gastos_mes']}
+
+    @staticmethod
+    def _summary_savings(summary):
+        return {'total_ahorros': summary['total_ahorros'], 'meta_ahorros': summary['meta_ahorros']}
+
+    @staticmethod
+    def _parse_active_goals(metas):
+        # Convertir decimales a float
+        for meta in metas:
+            meta['meta_total'] = float(meta['meta_total'])
+            meta['ahorrado_actual'] = float(meta['ahorrado_actual'])
+            meta['porcentaje_completado'] = float(meta['porcentaje_completado'])
+        return metas
+
+    def get_totals(self, usuario_id):
+        """Obtener ingresos y gastos totales del usuario (todo el historial, del resumen en caché)"""
+        return self._summary_totals(self.summaries.get(usuario_id))
+
+    @request_memoized
+    def get_month_totals(self, usuario_id, month=None, year=None):
+        """Obtener ingresos y gastos del mes"""
+        if not month or not year:
+            current_date = datetime.now()
+            month = current_date.month
+            year = current_date.year
+
+        summary = self.summaries.get(usuario_id)
+        if summary['mes'] == (int(year), int(month)):
+            return self._summary_month_totals(summary)
+
+        result = self.db.execute_query(*self.month_totals_query(usuario_id, month, year), fetch_one=True)
+        return self._parse_month_totals(result)
+
+    def get_savings_overview(self, usuario_id):
+        """Obtener total ahorrado y meta de las metas activas (del resumen en caché)"""
+        return self._summary_savings(self.summaries.get(usuario_id))
+
+    @request_memoized
+    def get_active_goals(self, usuario_id, limit=3):
+        """Obtener metas de ahorro activas más próximas"""
+        metas = self.db.execute_query(*self.active_goals_query(usuario_id, limit), fetch=True)
+        return self._parse_active_goals(metas)
+
+    @request_memoized
+    def get_recent_incomes(self, usuario_id, limit=5):
+        """Obtener últimos ingresos (más recientes, sin filtro de año)"""
+        rows = self.db.execute_query(*self.recent_incomes_query(usuario_id, limit), fetch=True)
+        return self.categories.enrich(rows, CategoryModel.INGRESO)
+
+    @request_memoized
+    def get_recent_expenses(self, usuario_id, limit=5):
+        """Obtener últimos gastos (más recientes, sin filtro de año)"""
+        rows = self.db.execute_query(*self.recent_expenses_query(usuario_id, limit), fetch=True)
+        return self.categories.enrich(rows, CategoryModel.GASTO)
+
+    @request_memoized
+    def get_overview(self, usuario_id, month=None, year=None, goals_limit=3, recent_limit=5):
+        """Obtener todos los widgets del dashboard (en paralelo o en un solo viaje a la BD)"""
+        if not month or not year:
+            current_date = datetime.now()
+            month = current_date.month
+            year = current_date.year
+
+        # Totales, mes en curso y ahorros salen del resumen por usuario en caché:
+        # para un usuario que vuelve al dashboard no hay ninguna consulta agregada
+        summary = self.summaries.get(usuario_id)
+        queries = {
+            'metas': (*self.active_goals_query(usuario_id, goals_limit), 'all'),
+            'ingresos': (*self.recent_incomes_query(usuario_id, recent_limit), 'all'),
+            'gastos': (*self.recent_expenses_query(usuario_id, recent_limit), 'all'),
+        }
+
+        if Config.QUERY_FANOUT:
+            # Cada widget en paralelo con su propia conexión: latencia ~ la consulta más lenta
+            results = get_query_executor().run(queries)
+        else:
+            # Todas las consultas en un solo multi-statement
+            batch = self.db.execute_batch([(query, params) for query, params, _ in queries.values()])
+            results = {
+                name: (rows[0] if rows else None) if mode == 'one' else rows
+                for (name, (_, _, mode)), rows in zip(queries.items(), batch)
+            }
+
+        return {
+            'totales': self._summary_totals(summary),
+            'totales_mes': self.get_month_totals(usuario_id, month, year),
+            'ahorros': self._summary_savings(summary),
+            'metas_activas': self._parse_active_goals(results['metas']),
+            'ultimos_ingresos': self.categories.enrich(results['ingresos'], CategoryModel.INGRESO),
+            'ultimos_gastos': self.categories.enrich(results['gastos'], CategoryModel.GASTO)
+        }
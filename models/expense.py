@@ -1,9 +1,24 @@
 from utils.database import Database
+from utils.periods import Period
+from utils.pagination import keyset_predicate, split_page
+from utils.memo import request_memoized
+from utils.data_version import get_data_versions
+from models.rollup import MonthlyRollupModel
+from models.balance import BalanceModel
+from models.activity import ActivityFeedModel
+from models.category import CategoryModel, get_category_catalog
 
 class ExpenseModel:
+    # Columnas del listado (sin fecha_registro ni otras que no se muestran)
+    LIST_COLUMNS = "g.id, g.usuario_id, g.concepto, g.monto, g.categoria_id, g.fecha, g.esencial, g.descripcion"
+
     def __init__(self):
         self.db = Database()
         self.table = "gastos"
+        self.rollup = MonthlyRollupModel()
+        self.balance = BalanceModel()
+        self.activity = ActivityFeedModel()
+        self.data_versions = get_data_versions()
 
     def create(self, usuario_id, concepto, monto, categoria_id, fecha, esencial=False, descripcion=None):
         """Crear nuevo gasto"""
@@ -11,42 +26,143 @@ class ExpenseModel:
         INSERT INTO {self.table} (usuario_id, concepto, monto, categoria_id, fecha, esencial, descripcion)
         VALUES (%s, %s, %s, %s, %s, %s, %s)
         """
-        return self.db.execute_query(
-            query, 
-            (usuario_id, concepto, monto, categoria_id, fecha, 1 if esencial else 0, descripcion)
-        )
+        with self.db.transaction():
+            gasto_id = self.db.execute_query(
+                query, 
+                (usuario_id, concepto, monto, categoria_id, fecha, 1 if esencial else 0, descripcion)
+            )
+            self.rollup.apply(usuario_id, MonthlyRollupModel.GASTO, categoria_id, fecha, monto, esencial)
+            self.balance.apply(usuario_id, gastos=monto)
+            self.activity.record(ActivityFeedModel.GASTO, gasto_id)
+            self.data_versions.touch(usuario_id)
+        return gasto_id
 
-    def get_by_user(self, usuario_id, month=None, year=None):
-        """Obtener gastos del usuario - ORDENADO POR FECHA DESCENDENTE (más reciente primero)"""
+    def get_by_id(self, gasto_id, usuario_id, for_update=False):
+        """Obtener gasto por ID (bloqueando la fila si ``for_update``)"""
+        query = f"SELECT * FROM {self.table} WHERE id = %s AND usuario_id = %s"
+        if for_update:
+            query += " FOR UPDATE"
+        return self.db.execute_query(query, (gasto_id, usuario_id), fetch_one=True)
+
+    def update(self, gasto_id, usuario_id, concepto, monto, categoria_id, fecha, esencial=False, descripcion=None):
+        """Actualizar gasto; devuelve False si no existe o no es del usuario"""
+        with self.db.transaction():
+            old = self.get_by_id(gasto_id, usuario_id, for_update=True)
+            if not old:
+                return False
+
+            query = f"""
+            UPDATE {self.table}
+            SET concepto = %s, monto = %s, categoria_id = %s, fecha = %s,
+                esencial = %s, descripcion = %s
+            WHERE id = %s AND usuario_id = %s
+            """
+            self.db.execute_query(
+                query,
+                (concepto, monto, categoria_id, fecha, 1 if esencial else 0, descripcion, gasto_id, usuario_id)
+            )
+            self.rollup.replace_row(MonthlyRollupModel.GASTO, old, {
+                'usuario_id': usuario_id, 'categoria_id': categoria_id, 'fecha': fecha,
+                'monto': monto, 'esencial': esencial
+            })
+            self.balance.apply(usuario_id, gastos=float(monto) - float(old['monto']))
+            self.activity.update(ActivityFeedModel.GASTO, gasto_id, concepto, monto, categoria_id, fecha)
+            self.data_versions.touch(usuario_id)
+        return True
+
+    def delete(self, gasto_id, usuario_id):
+        """Eliminar gasto; devuelve False si no existe o no es del usuario"""
+        with self.db.transaction():
+            old = self.get_by_id(gasto_id, usuario_id, for_update=True)
+            if not old:
+                return False
+
+            query = f"DELETE FROM {self.table} WHERE id = %s AND usuario_id = %s"
+            self.db.execute_query(query, (gasto_id, usuario_id))
+            self.rollup.remove_row(MonthlyRollupModel.GASTO, old)
+            self.balance.apply(usuario_id, gastos=-float(old['monto']))
+            self.activity.remove(ActivityFeedModel.GASTO, gasto_id)
+            self.data_versions.touch(usuario_id)
+        return True
+
+    def by_user_query(self, usuario_id, month=None, year=None, period=None, cursor=None, limit=None):
+        """Consulta de gastos del usuario - ORDENADO POR FECHA DESCENDENTE (más reciente primero)"""
         query = f"""
-        SELECT g.*, cg.nombre as categoria_nombre, cg.color, cg.icono
-        FROM {self.table} g 
-        LEFT JOIN categorias_gastos cg ON g.categoria_id = cg.id 
+        SELECT {self.LIST_COLUMNS}
+        FROM {self.table} g
         WHERE g.usuario_id = %s
         """
         params = [usuario_id]
 
-        if month and year:
-            query += " AND MONTH(g.fecha) = %s AND YEAR(g.fecha) = %s"
-            params.extend([month, year])
+        period = period or Period.from_month_args(month, year)
+        if period:
+            predicate, period_params = period.predicate("g.fecha")
+            query += f" AND {predicate}"
+            params.extend(period_params)
 
         # ORDENAR POR FECHA DESCENDENTE Y ID DESCENDENTE (para consistencia)
+        # Keyset: continuar tras la última fila de la página anterior (coste constante)
+        if cursor:
+            predicate, cursor_params = keyset_predicate("g.fecha", "g.id", cursor)
+            query += f" AND {predicate}"
+            params.extend(cursor_params)
+
         query += " ORDER BY g.fecha DESC, g.id DESC"
-        return self.db.execute_query(query, tuple(params), fetch=True)
+        if limit:
+            query += " LIMIT %s"
+            params.append(int(limit))
+        return query, tuple(params)
 
-    def get_total(self, usuario_id, month=None, year=None):
-        """Obtener total de gastos"""
-        query = f"SELECT SUM(monto) as total FROM {self.table} WHERE usuario_id = %s"
+    def total_query(self, usuario_id, month=None, year=None, period=None):
+        """Consulta del total de gastos (desde resumen_mensual si el periodo va por meses)"""
+        period = period or Period.from_month_args(month, year)
+        if period is None or period.month_aligned:
+            return self.rollup.total_query(usuario_id, MonthlyRollupModel.GASTO, period)
+
+        query = f"SELECT SUM(monto) as total, COUNT(*) as cantidad FROM {self.table} WHERE usuario_id = %s"
         params = [usuario_id]
+        if period:
+            predicate, period_params = period.predicate("fecha")
+            query += f" AND {predicate}"
+            params.extend(period_params)
+
+        return query, tuple(params)
 
-        if month and year:
-            query += " AND MONTH(fecha) = %s AND YEAR(fecha) = %s"
-            params.extend([month, year])
+    @staticmethod
+    def attach_categories(rows):
+        """Añadir categoria_nombre, color e icono a filas del listado (sin JOIN)"""
+        return get_category_catalog().enrich(list(rows or []), CategoryModel.GASTO)
 
-        result = self.db.execute_query(query, tuple(params), fetch_one=True)
+    @staticmethod
+    def parse_total(result):
         return result['total'] if result and result['total'] else 0
 
+    @staticmethod
+    def parse_count(result):
+        return int(result['cantidad']) if result and result.get('cantidad') else 0
+
+    @request_memoized
+    def get_by_user(self, usuario_id, month=None, year=None, period=None):
+        """Obtener gastos del usuario - ORDENADO POR FECHA DESCENDENTE (más reciente primero)"""
+        rows = self.db.execute_query(*self.by_user_query(usuario_id, month, year, period), fetch=True)
+        return self.attach_categories(rows)
+
+    def page_query(self, usuario_id, month=None, year=None, period=None, cursor=None, limit=50):
+        """Consulta de una página del listado (pide ``limit + 1`` filas para saber si hay más)"""
+        return self.by_user_query(usuario_id, month, year, period, cursor=cursor, limit=limit + 1)
+
+    @request_memoized
+    def get_page(self, usuario_id, month=None, year=None, period=None, cursor=None, limit=50):
+        """Obtener una página de gastos; devuelve ``(filas, cursor_siguiente)``"""
+        rows = self.db.execute_query(*self.page_query(usuario_id, month, year, period, cursor, limit), fetch=True)
+        return split_page(self.attach_categories(rows), limit)
+
+    @request_memoized
+    def get_total(self, usuario_id, month=None, year=None, period=None):
+        """Obtener total de gastos"""
+        result = self.db.execute_query(*self.total_query(usuario_id, month, year, period), fetch_one=True)
+        return self.parse_total(result)
+
     def get_categories(self):
-        """Obtener todas las categorías de gastos"""
-        query = "SELECT * FROM categorias_gastos ORDER BY nombre"
-        return self.db.execute_query(query, fetch=True)
\ No newline at end of file
+        """Obtener todas las categorías de gastos (del catálogo en memoria)"""
+        return get_category_catalog().list(CategoryModel.GASTO)
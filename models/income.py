@@ -0,0 +1,165 @@
+from utils.database import Database
+from utils.periods import Period
+from utils.pagination import keyset_predicate, split_page
+from utils.memo import request_memoized
+from utils.data_version import get_data_versions
+from models.rollup import MonthlyRollupModel
+from models.balance import BalanceModel
+from models.activity import ActivityFeedModel
+from models.category import CategoryModel, get_category_catalog
+
+class IncomeModel:
+    # Columnas del listado (sin fecha_registro ni otras que no se muestran)
+    LIST_COLUMNS = "i.id, i.usuario_id, i.concepto, i.monto, i.categoria_id, i.fecha, i.descripcion"
+
+    def __init__(self):
+        self.db = Database()
+        self.table = "ingresos"
+        self.rollup = MonthlyRollupModel()
+        self.balance = BalanceModel()
+        self.activity = ActivityFeedModel()
+        self.data_versions = get_data_versions()
+
+    def create(self, usuario_id, concepto, monto, categoria_id, fecha, descripcion=None):
+        """Crear nuevo ingreso"""
+        query = f"""
+        INSERT INTO {self.table} (usuario_id, concepto, monto, categoria_id, fecha, descripcion)
+        VALUES (%s, %s, %s, %s, %s, %s)
+        """
+        with self.db.transaction():
+            ingreso_id = self.db.execute_query(
+                query,
+                (usuario_id, concepto, monto, categoria_id, fecha, descripcion)
+            )
+            self.rollup.apply(usuario_id, MonthlyRollupModel.INGRESO, categoria_id, fecha, monto)
+            self.balance.apply(usuario_id, ingresos=monto)
+            self.activity.record(ActivityFeedModel.INGRESO, ingreso_id)
+            self.data_versions.touch(usuario_id)
+        return ingreso_id
+
+    def update(self, ingreso_id, usuario_id, concepto, monto, categoria_id, fecha, descripcion=None):
+        """Actualizar ingreso; devuelve False si no existe o no es del usuario"""
+        with self.db.transaction():
+            old = self.get_by_id(ingreso_id, usuario_id, for_update=True)
+            if not old:
+                return False
+
+            query = f"""
+            UPDATE {self.table}
+            SET concepto = %s, monto = %s, categoria_id = %s, fecha = %s, descripcion = %s
+            WHERE id = %s AND usuario_id = %s
+            """
+            self.db.execute_query(
+                query,
+                (concepto, monto, categoria_id, fecha, descripcion, ingreso_id, usuario_id)
+            )
+            self.rollup.replace_row(MonthlyRollupModel.INGRESO, old, {
+                'usuario_id': usuario_id, 'categoria_id': categoria_id, 'fecha': fecha, 'monto': monto
+            })
+            self.balance.apply(usuario_id, ingresos=float(monto) - float(old['monto']))
+            self.activity.update(ActivityFeedModel.INGRESO, ingreso_id, concepto, monto, categoria_id, fecha)
+            self.data_versions.touch(usuario_id)
+        return True
+
+    def by_user_query(self, usuario_id, month=None, year=None, period=None, cursor=None, limit=None):
+        """Consulta de ingresos del usuario - ORDENADO POR FECHA DESCENDENTE (más reciente primero)"""
+        query = f"""
+        SELECT {self.LIST_COLUMNS}
+        FROM {self.table} i
+        WHERE i.usuario_id = %s
+        """
+        params = [usuario_id]
+
+        period = period or Period.from_month_args(month, year)
+        if period:
+            predicate, period_params = period.predicate("i.fecha")
+            query += f" AND {predicate}"
+            params.extend(period_params)
+
+        # Keyset: continuar tras la última fila de la página anterior (coste constante)
+        if cursor:
+            predicate, cursor_params = keyset_predicate("i.fecha", "i.id", cursor)
+            query += f" AND {predicate}"
+            params.extend(cursor_params)
+
+        query += " ORDER BY i.fecha DESC, i.id DESC"
+        if limit:
+            query += " LIMIT %s"
+            params.append(int(limit))
+        return query, tuple(params)
+
+    def total_query(self, usuario_id, month=None, year=None, period=None):
+        """Consulta del total de ingresos (desde resumen_mensual si el periodo va por meses)"""
+        period = period or Period.from_month_args(month, year)
+        if period is None or period.month_aligned:
+            return self.rollup.total_query(usuario_id, MonthlyRollupModel.INGRESO, period)
+
+        query = f"SELECT COALESCE(SUM(monto), 0) as total, COUNT(*) as cantidad FROM {self.table} WHERE usuario_id = %s"
+        params = [usuario_id]
+        if period:
+            predicate, period_params = period.predicate("fecha")
+            query += f" AND {predicate}"
+            params.extend(period_params)
+
+        return query, tuple(params)
+
+    @staticmethod
+    def attach_categories(rows):
+        """Añadir categoria_nombre, color e icono a filas del listado (sin JOIN)"""
+        return get_category_catalog().enrich(list(rows or []), CategoryModel.INGRESO)
+
+    @staticmethod
+    def parse_total(result):
+        return result['total'] if result and result['total'] else 0
+
+    @staticmethod
+    def parse_count(result):
+        return int(result['cantidad']) if result and result.get('cantidad') else 0
+
+    @request_memoized
+    def get_by_user(self, usuario_id, month=None, year=None, period=None):
+        """Obtener ingresos del usuario - ORDENADO POR FECHA DESCENDENTE (más reciente primero)"""
+        rows = self.db.execute_query(*self.by_user_query(usuario_id, month, year, period), fetch=True)
+        return self.attach_categories(rows)
+
+    def page_query(self, usuario_id, month=None, year=None, period=None, cursor=None, limit=50):
+        """Consulta de una página del listado (pide ``limit + 1`` filas para saber si hay más)"""
+        return self.by_user_query(usuario_id, month, year, period, cursor=cursor, limit=limit + 1)
+
+    @request_memoized
+    def get_page(self, usuario_id, month=None, year=None, period=None, cursor=None, limit=50):
+        """Obtener una página de ingresos; devuelve ``(filas, cursor_siguiente)``"""
+        rows = self.db.execute_query(*self.page_query(usuario_id, month, year, period, cursor, limit), fetch=True)
+        return split_page(self.attach_categories(rows), limit)
+
+    @request_memoized
+    def get_total(self, usuario_id, month=None, year=None, period=None):
+        """Obtener total de ingresos"""
+        result = self.db.execute_query(*self.total_query(usuario_id, month, year, period), fetch_one=True)
+        return self.parse_total(result)
+
+    def get_by_id(self, ingreso_id, usuario_id, for_update=False):
+        """Obtener ingreso por ID (bloqueando la fila si ``for_update``)"""
+        query = f"SELECT * FROM {self.table} WHERE id = %s AND usuario_id = %s"
+        if for_update:
+            query += " FOR UPDATE"
+        return self.db.execute_query(query, (ingreso_id, usuario_id), fetch_one=True)
+
+    def delete(self, ingreso_id, usuario_id):
+        """Eliminar ingreso; devuelve False si no existe o no es del usuario"""
+        with self.db.transaction():
+            old = self.get_by_id(ingreso_id, usuario_id, for_update=True)
+            if not old:
+                return False
+
+            query = f"DELETE FROM {self.table} WHERE id = %s AND usuario_id = %s"
+            self.db.execute_query(query, (ingreso_id, usuario_id))
+            self.rollup.remove_row(MonthlyRollupModel.INGRESO, old)
+            self.balance.apply(usuario_id, ingresos=-float(old['monto']))
+            self.activity.remove(ActivityFeedModel.INGRESO, ingreso_id)
+            self.data_versions.touch(usuario_id)
+        return True
+
+    def get_categories(self):
+        """Obtener todas las categorías de ingresos (del catálogo en memoria)"""
+        return get_category_catalog().list(CategoryModel.INGRESO)
@@ -0,0 +1,224 @@
+from utils.database import Database
+from utils.periods import month_start
+from utils.memo import request_memoized
+
+class MonthlyRollupModel:
+    """Acumulados mensuales de gastos e ingresos (tabla resumen_mensual).
+
+    Una fila por (usuario_id, tipo, mes, categoria_id) con la suma, el número de
+    movimientos y la parte esencial / no esencial. Se actualiza en la misma
+    transacción que cada alta, edición y baja de ``gastos`` e ``ingresos``, de
+    modo que los totales se leen sin recorrer los movimientos.
+    """
+
+    GASTO = 'gasto'
+    INGRESO = 'ingreso'
+
+    SOURCE_TABLES = {GASTO: 'gastos', INGRESO: 'ingresos'}
+
+    def __init__(self):
+        self.db = Database()
+        self.table = "resumen_mensual"
+
+    # ------------------------------------------------------------------
+    # Mantenimiento incremental
+    # ------------------------------------------------------------------
+    def apply(self, usuario_id, tipo, categoria_id, fecha, monto, esencial=False, signo=1):
+        """Sumar (signo=1) o restar (signo=-1) un movimiento al acumulado de su mes"""
+        monto = float(monto) * signo
+        cantidad = signo
+        esencial_monto = monto if esencial else 0
+        no_esencial_monto = 0 if esencial else monto
+        if tipo == self.INGRESO:
+            esencial_monto = no_esencial_monto = 0
+
+        query = f"""
+        INSERT INTO {self.table}
+            (usuario_id, tipo, categoria_id, mes, total, cantidad, total_esencial, total_no_esencial)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            total = total + VALUES(total),
+            cantidad = cantidad + VALUES(cantidad),
+            total_esencial = total_esencial + VALUES(total_esencial),
+            total_no_esencial = total_no_esencial + VALUES(total_no_esencial)
+        """
+        return self.db.execute_query(query, (
+            usuario_id, tipo, int(categoria_id or 0), month_start(fecha),
+            monto, cantidad, esencial_monto, no_esencial_monto
+        ))
+
+    def add_row(self, tipo, row):
+        """Sumar una fila de gastos/ingresos (dict con usuario_id, categoria_id, fecha, monto...)"""
+        return self.apply(row['usuario_id'], tipo, row.get('categoria_id'), row['fecha'],
+                          row['monto'], bool(row.get('esencial')), signo=1)
+
+    def remove_row(self, tipo, row):
+        """Restar una fila de gastos/ingresos"""
+        return self.apply(row['usuario_id'], tipo, row.get('categoria_id'), row['fecha'],
+                          row['monto'], bool(row.get('esencial')), signo=-1)
+
+    def replace_row(self, tipo, old_row, new_row):
+        """Edición: restar la versión anterior y sumar la nueva (puede cambiar de mes o categoría)"""
+        self.remove_row(tipo, old_row)
+        self.add_row(tipo, new_row)
+
+    # ------------------------------------------------------------------
+    # Lecturas
+    # ------------------------------------------------------------------
+    def total_query(self, usuario_id, tipo, period=None):
+        """Consulta del total y número de movimientos de un tipo (todo el historial o un periodo por meses)"""
+        query = f"""
+        SELECT COALESCE(SUM(total), 0) as total, COALESCE(SUM(cantidad), 0) as cantidad
+        FROM {self.table} WHERE usuario_id = %s AND tipo = %s
+        """
+        params = [usuario_id, tipo]
+        if period:
+            predicate, period_params = period.predicate("mes")
+            query += f" AND {predicate}"
+            params.extend(period_params)
+        return query, tuple(params)
+
+    def balance_query(self, usuario_id, period=None):
+        """Consulta de ingresos y gastos de un usuario en una sola fila"""
+        query = f"""
+        SELECT
+            COALESCE(SUM(CASE WHEN tipo = 'ingreso' THEN total ELSE 0 END), 0) as total_ingresos,
+            COALESCE(SUM(CASE WHEN tipo = 'gasto' THEN total ELSE 0 END), 0) as total_gastos,
+            COALESCE(SUM(total_esencial), 0) as esenciales,
+            COALESCE(SUM(total_no_esencial), 0) as no_esenciales
+        FROM {self.table}
+        WHERE usuario_id = %s
+        """
+        params = [usuario_id]
+        if period:
+            predicate, period_params = period.predicate("mes")
+            query += f" AND {predicate}"
+            params.extend(period_params)
+        return query, tuple(params)
+
+    @request_memoized
+    def get_balance(self, usuario_id, period=None):
+        """Ingresos, gastos y reparto esencial / no esencial"""
+        return self.db.execute_query(*self.balance_query(usuario_id, period), fetch_one=True)
+
+    @request_memoized
+    def get_monthly_series(self, usuario_id, period):
+        """Ingresos y gastos por mes dentro del periodo (más reciente primero)"""
+        predicate, period_params = period.predicate("mes")
+        query = f"""
+        SELECT
+            DATE_FORMAT(mes, '%%Y-%%m') as mes,
+            SUM(CASE WHEN tipo = 'ingreso' THEN total ELSE 0 END) as ingresos,
+            SUM(CASE WHEN tipo = 'gasto' THEN total ELSE 0 END) as gastos
+        FROM {self.table}
+        WHERE usuario_id = %s AND {predicate}
+        GROUP BY mes
+        ORDER BY mes DESC
+        """
+        return self.db.execute_query(query, (usuario_id, *period_params), fetch=True)
+
+    @request_memoized
+    def get_global_totals(self):
+        """Totales de ingresos y gastos de todos los usuarios"""
+        query = f"""
+        SELECT
+            COALESCE(SUM(CASE WHEN tipo = 'ingreso' THEN total ELSE 0 END), 0) as total_ingresos,
+            COALESCE(SUM(CASE WHEN tipo = 'gasto' THEN total ELSE 0 END), 0) as total_gastos
+        FROM {self.table}
+        """
+        return self.db.execute_query(query, fetch_one=True)
+
+    @request_memoized
+    def get_top_categories(self, tipo, limit=5):
+        """Categorías con más importe acumulado de todos los usuarios"""
+        categorias = 'categorias_gastos' if tipo == self.GASTO else 'categorias_ingresos'
+        query = f"""
+        SELECT c.nombre, SUM(r.cantidad) as cantidad, SUM(r.total) as total
+        FROM {self.table} r
+        JOIN {categorias} c ON r.categoria_id = c.id
+        WHERE r.tipo = %s
+        GROUP BY c.id, c.nombre
+        HAVING cantidad > 0
+        ORDER BY total DESC
+        LIMIT %s
+        """
+        return self.db.execute_query(query, (tipo, limit), fetch=True)
+
+    # ------------------------------------------------------------------
+    # Reconstrucción y verificación
+    # ------------------------------------------------------------------
+    def _source_query(self, tipo, usuario_id=None):
+        """Agregado equivalente calculado desde la tabla de movimientos"""
+        source = self.SOURCE_TABLES[tipo]
+        if tipo == self.GASTO:
+            esencial = "SUM(CASE WHEN esencial = 1 THEN monto ELSE 0 END)"
+            no_esencial = "SUM(CASE WHEN esencial = 1 THEN 0 ELSE monto END)"
+        else:
+            esencial = no_esencial = "0"
+        query = f"""
+        SELECT usuario_id, '{tipo}' as tipo, COALESCE(categoria_id, 0) as categoria_id,
+               DATE_FORMAT(fecha, '%%Y-%%m-01') as mes,
+               SUM(monto) as total, COUNT(*) as cantidad,
+               {esencial} as total_esencial, {no_esencial} as total_no_esencial
+        FROM {source}
+        """
+        params = []
+        if usuario_id is not None:
+            query += " WHERE usuario_id = %s"
+            params.append(usuario_id)
+        query += " GROUP BY usuario_id, COALESCE(categoria_id, 0), DATE_FORMAT(fecha, '%%Y-%%m-01')"
+        return query, tuple(params)
+
+    def backfill_statements(self, usuario_id=None):
+        """Sentencias ``(sql, params)`` que llenan el acumulado desde los movimientos
+        (sobre la tabla vacía; también las usa init_database.py)"""
+        statements = []
+        for tipo in self.SOURCE_TABLES:
+            query, params = self._source_query(tipo, usuario_id)
+            statements.append((f"""
+            INSERT INTO {self.table}
+                (usuario_id, tipo, categoria_id, mes, total, cantidad, total_esencial, total_no_esencial)
+            {query}
+            """, params))
+        return statements
+
+    def rebuild(self, usuario_id=None):
+        """Recalcular el acumulado desde cero (todos los usuarios o uno)"""
+        with self.db.transaction():
+            if usuario_id is None:
+                self.db.execute_query(f"DELETE FROM {self.table}")
+            else:
+                self.db.execute_query(f"DELETE FROM {self.table} WHERE usuario_id = %s", (usuario_id,))
+
+            for query, params in self.backfill_statements(usuario_id):
+                self.db.execute_query(query, params)
+
+    def verify(self, usuario_id=None):
+        """Comparar el acumulado con los movimientos; devuelve la lista de diferencias"""
+        def key(row):
+            return (row['usuario_id'], row['tipo'], int(row['categoria_id']), str(row['mes'])[:10])
+
+        def values(row):
+            return tuple(round(float(row[c] or 0), 2) for c in ('total', 'cantidad', 'total_esencial', 'total_no_esencial'))
+
+        expected = {}
+        for tipo in self.SOURCE_TABLES:
+            for row in self.db.execute_query(*self._source_query(tipo, usuario_id), fetch=True):
+                expected[key(row)] = values(row)
+
+        query = f"SELECT * FROM {self.table}"
+        params = ()
+        if usuario_id is not None:
+            query += " WHERE usuario_id = %s"
+            params = (usuario_id,)
+        actual = {}
+        for row in self.db.execute_query(query, params, fetch=True):
+            # Las filas que quedaron a cero tras borrar movimientos equivalen a no tener fila
+            if int(row['cantidad']) != 0 or float(row['total']) != 0:
+                actual[key(row)] = values(row)
+
+        differences = []
+        for k in sorted(set(expected) | set(actual), key=str):
+            if expected.get(k) != actual.get(k):
+                differences.append({'clave': k, 'esperado': expected.get(k), 'actual': actual.get(k)})
+        return differences
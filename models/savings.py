@@ -1,10 +1,15 @@
 from utils.database import Database
+from utils.memo import request_memoized
+from utils.data_version import get_data_versions
+from models.user_summary import get_user_summary_cache
 from datetime import datetime
 
 class SavingsModel:
     def __init__(self):
         self.db = Database()
         self.table = "ahorros"
+        self.summaries = get_user_summary_cache()
+        self.data_versions = get_data_versions()
 
     def create(self, usuario_id, concepto, meta_total, fecha_objetivo=None, descripcion=None):
         """Crear nueva meta de ahorro"""
@@ -12,13 +17,15 @@ class SavingsModel:
         INSERT INTO {self.table} (usuario_id, concepto, meta_total, ahorrado_actual, fecha_inicio, fecha_objetivo, descripcion)
         VALUES (%s, %s, %s, %s, %s, %s, %s)
         """
-        return self.db.execute_query(
+        result = self.db.execute_query(
             query, 
             (usuario_id, concepto, meta_total, 0.00, datetime.now().date(), fecha_objetivo, descripcion)
         )
+        self.data_versions.touch(usuario_id)
+        return result
 
-    def get_by_user(self, usuario_id):
-        """Obtener ahorros del usuario"""
+    def by_user_query(self, usuario_id):
+        """Consulta de los ahorros del usuario con su porcentaje y días restantes"""
         query = f"""
         SELECT *,
                CASE 
@@ -31,8 +38,15 @@ class SavingsModel:
         WHERE usuario_id = %s 
         ORDER BY completado ASC, fecha_objetivo ASC
         """
-        return self.db.execute_query(query, (usuario_id,), fetch=True)
+        return query, (usuario_id,)
+
+    @request_memoized
+    def get_by_user(self, usuario_id):
+        """Obtener ahorros del usuario"""
+        query, params = self.by_user_query(usuario_id)
+        return self.db.execute_query(query, params, fetch=True)
 
+    @request_memoized
     def get_by_id(self, ahorro_id, usuario_id):
         """Obtener ahorro por ID"""
         query = f"SELECT * FROM {self.table} WHERE id = %s AND usuario_id = %s"
@@ -59,7 +73,9 @@ class SavingsModel:
             completado = %s
         WHERE id = %s AND usuario_id = %s
         """
-        return self.db.execute_query(query, (nuevo_ahorrado, completado, ahorro_id, usuario_id))
+        result = self.db.execute_query(query, (nuevo_ahorrado, completado, ahorro_id, usuario_id))
+        self.data_versions.touch(usuario_id)
+        return result
 
     def update(self, ahorro_id, usuario_id, concepto, meta_total, fecha_objetivo, descripcion):
         """Actualizar meta de ahorro"""
@@ -79,47 +95,17 @@ class SavingsModel:
             completado = %s
         WHERE id = %s AND usuario_id = %s
         """
-        return self.db.execute_query(query, (concepto, meta_total, fecha_objetivo, descripcion, completado, ahorro_id, usuario_id))
+        result = self.db.execute_query(query, (concepto, meta_total, fecha_objetivo, descripcion, completado, ahorro_id, usuario_id))
+        self.data_versions.touch(usuario_id)
+        return result
 
     def delete(self, ahorro_id, usuario_id):
         """Eliminar meta de ahorro"""
         query = f"DELETE FROM {self.table} WHERE id = %s AND usuario_id = %s"
-        return self.db.execute_query(query, (ahorro_id, usuario_id))
+        result = self.db.execute_query(query, (ahorro_id, usuario_id))
+        self.data_versions.touch(usuario_id)
+        return result
 
     def get_savings_summary(self, usuario_id):
-        """Obtener resumen de ahorros"""
-        query = """
-        SELECT 
-            COUNT(*) as total_metas,
-            SUM(meta_total) as total_meta,
-            SUM(ahorrado_actual) as total_ahorrado,
-            SUM(CASE WHEN completado = 1 THEN 1 ELSE 0 END) as metas_completadas,
-            SUM(CASE WHEN completado = 0 AND fecha_objetivo < CURDATE() THEN 1 ELSE 0 END) as metas_vencidas
-        FROM ahorros 
-        WHERE usuario_id = %s
-        """
-        
-        result = self.db.execute_query(query, (usuario_id,), fetch_one=True)
-        
-        if result:
-            total_meta = result['total_meta'] or 0
-            total_ahorrado = result['total_ahorrado'] or 0
-            porcentaje_total = (total_ahorrado / total_meta * 100) if total_meta > 0 else 0
-            
-            return {
-                'total_metas': result['total_metas'] or 0,
-                'total_meta': total_meta,
-                'total_ahorrado': total_ahorrado,
-                'porcentaje_total': round(porcentaje_total, 2),
-                'metas_completadas': result['metas_completadas'] or 0,
-                'metas_vencidas': result['metas_vencidas'] or 0
-            }
-        
-        return {
-            'total_metas': 0,
-            'total_meta': 0,
-            'total_ahorrado': 0,
-            'porcentaje_total': 0,
-            'metas_completadas': 0,
-            'metas_vencidas': 0
-        }
\ No newline at end of file
+        """Obtener resumen de ahorros (del resumen por usuario en caché)"""
+        return self.summaries.get(usuario_id)['ahorros']
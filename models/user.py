@@ -1,5 +1,7 @@
-import bcrypt
 from utils.database import Database
+from models.balance import BalanceModel
+from utils.memo import request_memoized
+from utils.metrics import bcrypt_timer
 
 class UserModel:
     def __init__(self):
@@ -8,18 +10,25 @@ class UserModel:
 
     def create(self, nombre, email, clave, rol_id=2):
         """Crear nuevo usuario con contraseña hasheada"""
-        hashed_password = bcrypt.hashpw(clave.encode('utf-8'), bcrypt.gensalt())
+        import bcrypt  # solo al registrar o iniciar sesión, no en el arranque
+        with bcrypt_timer('hash'):
+            hashed_password = bcrypt.hashpw(clave.encode('utf-8'), bcrypt.gensalt())
         
         query = f"""
         INSERT INTO {self.table} (nombre, email, clave, rol_id, activo) 
         VALUES (%s, %s, %s, %s, %s)
         """
         
-        return self.db.execute_query(
-            query, 
-            (nombre, email, hashed_password.decode('utf-8'), rol_id, 1)
-        )
+        # Con su fila de saldos: el primer movimiento bloquea una fila que ya existe
+        with self.db.transaction():
+            usuario_id = self.db.execute_query(
+                query,
+                (nombre, email, hashed_password.decode('utf-8'), rol_id, 1)
+            )
+            BalanceModel().create_empty(usuario_id)
+        return usuario_id
 
+    @request_memoized
     def get_by_email(self, email):
         """Obtener usuario por email"""
         query = f"SELECT * FROM {self.table} WHERE email = %s AND activo = 1"
@@ -33,7 +42,9 @@ class UserModel:
             if hashed_password.startswith('$2y$'):
                 hashed_password = '$2b$' + hashed_password[4:]
             
-            result = bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+            import bcrypt
+            with bcrypt_timer('verify'):
+                result = bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
             return result
         except Exception as e:
             print(f"Error en verificación de contraseña: {e}")
@@ -46,12 +57,14 @@ class UserModel:
             return user
         return None
 
+    @request_memoized
     def email_exists(self, email):
         """Verificar si el email ya existe"""
         query = f"SELECT id FROM {self.table} WHERE email = %s"
         result = self.db.execute_query(query, (email,), fetch=True)
         return len(result) > 0
 
+    @request_memoized
     def get_by_id(self, user_id):
         """Obtener usuario por ID"""
         query = f"SELECT id, nombre, email, rol_id FROM {self.table} WHERE id = %s AND activo = 1"
@@ -0,0 +1,151 @@
+import threading
+from datetime import datetime
+
+from config import Config
+from utils.cache import get_cache
+from utils.database import Database
+from utils.periods import Period
+from utils.data_version import get_data_versions
+from utils.metrics import record_cache
+from models.balance import BalanceModel
+from models.rollup import MonthlyRollupModel
+
+class UserSummaryModel:
+    """Cifras agregadas de un usuario que comparten todas las páginas.
+
+    - Ingresos, gastos y saldo de todo el historial (fila de ``saldos``).
+    - Ingresos y gastos del mes en curso (``resumen_mensual``).
+    - Ahorros: totales de las metas activas y resumen de todas las metas.
+
+    Las tres lecturas van en un solo viaje a la base de datos.
+    """
+
+    def __init__(self):
+        self.db = Database()
+        self.balance = BalanceModel()
+        self.rollup = MonthlyRollupModel()
+
+    def savings_query(self, usuario_id):
+        """Consulta de totales de ahorro (todas las metas y solo las activas)"""
+        query = """
+        SELECT
+            COUNT(*) as total_metas,
+            COALESCE(SUM(meta_total), 0) as total_meta,
+            COALESCE(SUM(ahorrado_actual), 0) as total_ahorrado,
+            COALESCE(SUM(CASE WHEN completado = 1 THEN 1 ELSE 0 END), 0) as metas_completadas,
+            COALESCE(SUM(CASE WHEN completado = 0 AND fecha_objetivo < CURDATE() THEN 1 ELSE 0 END), 0) as metas_vencidas,
+            COALESCE(SUM(CASE WHEN completado = 0 THEN ahorrado_actual ELSE 0 END), 0) as ahorrado_activo,
+            COALESCE(SUM(CASE WHEN completado = 0 THEN meta_total ELSE 0 END), 0) as meta_activa
+        FROM ahorros
+        WHERE usuario_id = %s
+        """
+        return query, (usuario_id,)
+
+    @staticmethod
+    def parse_savings(result):
+        """Resumen de metas de ahorro (mismo formato que ``SavingsModel.get_savings_summary``)"""
+        total_meta = float(result['total_meta']) if result else 0
+        total_ahorrado = float(result['total_ahorrado']) if result else 0
+        porcentaje_total = (total_ahorrado / total_meta * 100) if total_meta > 0 else 0
+        return {
+            'total_metas': int(result['total_metas'] or 0) if result else 0,
+            'total_meta': total_meta,
+            'total_ahorrado': total_ahorrado,
+            'porcentaje_total': round(porcentaje_total, 2),
+            'metas_completadas': int(result['metas_completadas'] or 0) if result else 0,
+            'metas_vencidas': int(result['metas_vencidas'] or 0) if result else 0
+        }
+
+    def compute(self, usuario_id, today=None):
+        """Calcular el resumen del usuario para el mes de ``today``"""
+        today = today or datetime.now()
+        # Conexión propia: la vista de lectura de la petición puede ser anterior a
+        # la versión con la que se guardará el resumen
+        balance_result, month_result, savings_result = self.db.execute_batch([
+            self.balance.by_user_query(usuario_id),
+            self.rollup.balance_query(usuario_id, Period.for_month(today.year, today.month)),
+            self.savings_query(usuario_id),
+        ], fresh=True)
+        totales = BalanceModel.parse(balance_result[0] if balance_result else None)
+        month = month_result[0] if month_result else None
+        savings = savings_result[0] if savings_result else None
+        return {
+            'mes': (today.year, today.month),
+            'total_ingresos': totales['total_ingresos'],
+            'total_gastos': totales['total_gastos'],
+            'saldo': totales['saldo'],
+            'ingresos_mes': float(month['total_ingresos']) if month else 0.0,
+            'gastos_mes': float(month['total_gastos']) if month else 0.0,
+            'total_ahorros': float(savings['ahorrado_activo']) if savings else 0.0,
+            'meta_ahorros': float(savings['meta_activa']) if savings else 0.0,
+            'ahorros': self.parse_savings(savings),
+        }
+
+
+class UserSummaryCache:
+    """Resumen por usuario en el caché de la aplicación, ligado a la versión de
+    datos del usuario.
+
+    - Cada escritura de gastos, ingresos, presupuestos o ahorros sube la versión
+      del usuario (``utils.data_version``) al escribir y otra vez al confirmarse
+      la transacción. La clave de la entrada lleva la versión y el mes, así que
+      una lectura que se cuele entre la escritura y el commit queda guardada con
+      una versión ya vieja y no se vuelve a servir.
+    - El resumen se calcula con una conexión propia y la versión se lee antes:
+      cualquier commit posterior a esa lectura vuelve a subir la versión.
+    - ``ttl`` acota escrituras hechas fuera de la aplicación (p. ej.
+      ``maintenance.py``) y limpia las entradas de versiones viejas.
+    - Con un backend compartido (``CACHE_BACKEND``) los workers reutilizan el
+      resumen que calculó otro, y solo uno lo calcula a la vez (single-flight).
+    """
+
+    def __init__(self, model=None, ttl=None, versions=None, cache=None):
+        self.model = model or UserSummaryModel()
+        self.ttl = Config.USER_SUMMARY_TTL if ttl is None else ttl
+        self.versions = versions or get_data_versions()
+        self.cache = cache or get_cache()
+        self.stats = {'aciertos': 0, 'fallos': 0}
+
+    @staticmethod
+    def tag(usuario_id):
+        return f"resumen:usuario:{usuario_id}"
+
+    def get(self, usuario_id):
+        """Resumen del usuario (copia), calculándolo si no hay uno vigente"""
+        now = datetime.now()
+        version = self.versions.version(usuario_id)
+        key = f"resumen:{usuario_id}:{version}:{now.year}-{now.month:02d}"
+        computed = []
+
+        def compute():
+            computed.append(True)
+            return self.model.compute(usuario_id, now)
+
+        summary = self.cache.get_or_set(key, compute, ttl=self.ttl, tags=(self.tag(usuario_id),))
+        self.stats['fallos' if computed else 'aciertos'] += 1
+        record_cache('resumen_usuario', not computed)
+        return self._copy(summary)
+
+    def clear(self, usuario_id):
+        """Descartar los resúmenes guardados del usuario"""
+        self.cache.invalidate_tags(self.tag(usuario_id))
+
+    @staticmethod
+    def _copy(summary):
+        summary = dict(summary)
+        summary['ahorros'] = dict(summary['ahorros'])
+        return summary
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_user_summary_cache():
+    """Caché de resúmenes por usuario compartido por el proceso"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = UserSummaryCache()
+    return _cache
@@ -0,0 +1,131 @@
+// Código común a todas las páginas (lo carga base.html)
+
+// Barra lateral en móviles
+document.addEventListener('DOMContentLoaded', function() {
+    const sidebar = document.getElementById('sidebarMobile');
+    const menuToggle = document.getElementById('mobileMenuToggle');
+    const overlay = document.getElementById('sidebarOverlay');
+
+    if (menuToggle && sidebar) {
+        menuToggle.addEventListener('click', function(e) {
+            e.stopPropagation();
+            sidebar.classList.toggle('show');
+            if (overlay) {
+                overlay.classList.toggle('show');
+            }
+
+            // Ocultar el botón cuando el menú está abierto
+            if (sidebar.classList.contains('show')) {
+                menuToggle.style.display = 'none';
+            } else {
+                menuToggle.style.display = 'flex';
+            }
+        });
+
+        if (overlay) {
+            overlay.addEventListener('click', function() {
+                sidebar.classList.remove('show');
+                overlay.classList.remove('show');
+                menuToggle.style.display = 'flex';
+            });
+        }
+
+        sidebar.querySelectorAll('.nav-link').forEach(link => {
+            link.addEventListener('click', function() {
+                if (window.innerWidth < 768) {
+                    sidebar.classList.remove('show');
+                    if (overlay) {
+                        overlay.classList.remove('show');
+                    }
+                    menuToggle.style.display = 'flex';
+                }
+            });
+        });
+
+        window.addEventListener('resize', function() {
+            if (window.innerWidth >= 768) {
+                sidebar.classList.remove('show');
+                if (overlay) {
+                    overlay.classList.remove('show');
+                }
+                menuToggle.style.display = 'none';
+            } else {
+                menuToggle.style.display = 'flex';
+            }
+        });
+
+        sidebar.addEventListener('click', function(e) {
+            e.stopPropagation();
+        });
+    }
+});
+
+// Formato de montos con separador de miles
+function formatearNumero(input) {
+    let valor = input.value.replace(/[^\d.]/g, '');
+    let partes = valor.split('.');
+    let parteEntera = partes[0];
+    let parteDecimal = partes.length > 1 ? '.' + partes[1] : '';
+    parteEntera = parteEntera.replace(/\B(?=(\d{3})+(?!\d))/g, '.');
+    input.value = parteEntera + parteDecimal;
+}
+
+function limpiarFormatoNumero(input) {
+    input.value = input.value.replace(/\./g, '');
+}
+
+// Activar el formato en los campos .formato-monto (base.html lo hace en las
+// páginas que no definen su propio bloque de scripts)
+function activarFormatoMontos() {
+    document.querySelectorAll('input.formato-monto').forEach(input => {
+        input.addEventListener('input', function() {
+            formatearNumero(this);
+        });
+        input.addEventListener('blur', function() {
+            limpiarFormatoNumero(this);
+        });
+    });
+}
+
+// Función para limpiar formatos antes de enviar el formulario
+function limpiarFormatosAntesDeEnviar() {
+    document.querySelectorAll('input.formato-monto').forEach(input => {
+        input.value = input.value.replace(/\./g, '');
+    });
+}
+
+// Función para cambiar el mes seleccionado (listados de gastos e ingresos)
+function cambiarMes(mes) {
+    if (mes) {
+        window.location.href = window.location.pathname + '?mes=' + mes;
+    }
+}
+
+// Función para mostrar alerta bonita
+function mostrarAlerta(mensaje, tipo = 'danger') {
+    // Crear elemento de alerta
+    const alertDiv = document.createElement('div');
+    alertDiv.className = `alert alert-${tipo} alert-dismissible fade show`;
+    alertDiv.style.cssText = 'position: fixed; top: 20px; right: 20px; z-index: 1050; min-width: 300px;';
+    
+    // Icono según el tipo de alerta
+    let icono = 'exclamation-circle';
+    if (tipo === 'success') icono = 'check-circle';
+    if (tipo === 'warning') icono = 'exclamation-triangle';
+    
+    alertDiv.innerHTML = `
+        <i class="fas fa-${icono} me-2"></i>
+        ${mensaje}
+        <button type="button" class="btn-close" data-bs-dismiss="alert"></button>
+    `;
+    
+    // Agregar al body
+    document.body.appendChild(alertDiv);
+    
+    // Auto-eliminar después de 5 segundos
+    setTimeout(() => {
+        if (alertDiv.parentNode) {
+            alertDiv.remove();
+        }
+    }, 5000);
+}
@@ -0,0 +1,71 @@
+document.addEventListener('DOMContentLoaded', function() {
+    // Editar presupuesto - ACTUALIZADO
+    document.querySelectorAll('.edit-budget').forEach(button => {
+        button.addEventListener('click', function() {
+            const budgetId = this.getAttribute('data-budget-id');
+            const currentAmount = this.getAttribute('data-budget-amount');
+            const categoriaId = this.getAttribute('data-budget-categoria-id');
+            const mesYear = this.getAttribute('data-budget-mes-year');
+            
+            // Llenar el modal con todos los datos
+            document.getElementById('edit_budget_id').value = budgetId;
+            document.getElementById('edit_monto_maximo').value = currentAmount;
+            document.getElementById('edit_categoria_id').value = categoriaId;
+            document.getElementById('edit_mes_year').value = mesYear;
+            
+            const modal = new bootstrap.Modal(document.getElementById('editBudgetModal'));
+            modal.show();
+        });
+    });
+    
+    // Guardar cambios del presupuesto - ACTUALIZADO
+    document.getElementById('editBudgetForm').addEventListener('submit', function(e) {
+        e.preventDefault();
+        
+        const budgetId = document.getElementById('edit_budget_id').value;
+        const formData = new FormData(this);
+        
+        fetch(`/budgets/update/${budgetId}`, {
+            method: 'POST',
+            body: formData
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                location.reload();
+            } else {
+                alert('Error al actualizar el presupuesto: ' + data.error);
+            }
+        })
+        .catch(error => {
+            alert('Error al actualizar el presupuesto: ' + error);
+        });
+    });
+    
+    // Eliminar presupuesto
+    document.querySelectorAll('.delete-budget').forEach(button => {
+        button.addEventListener('click', function() {
+            const budgetId = this.getAttribute('data-budget-id');
+            
+            if (confirm('¿Estás seguro de que quieres eliminar este presupuesto?')) {
+                fetch(`/budgets/delete/${budgetId}`, {
+                    method: 'POST',
+                    headers: {
+                        'Content-Type': 'application/json',
+                    }
+                })
+                .then(response => response.json())
+                .then(data => {
+                    if (data.success) {
+                        location.reload();
+                    } else {
+                        alert('Error al eliminar el presupuesto: ' + data.error);
+                    }
+                })
+                .catch(error => {
+                    alert('Error al eliminar el presupuesto: ' + error);
+                });
+            }
+        });
+    });
+});
@@ -0,0 +1,38 @@
+// Animación para elementos al cargar la página
+document.addEventListener('DOMContentLoaded', function() {
+    // Aplicar animación fade-in a todos los elementos con la clase
+    const animatedElements = document.querySelectorAll('.fade-in');
+    animatedElements.forEach((element, index) => {
+        element.style.animationDelay = `${index * 0.1}s`;
+    });
+});
+
+// Función para animar eliminación de transacciones
+function animateRemoveTransaction(element) {
+    element.classList.add('slide-out');
+    setTimeout(() => {
+        element.remove();
+    }, 300);
+}
+
+// Ejemplo de uso para futuras implementaciones con AJAX
+function addNewTransaction(transactionData, container) {
+    const newElement = document.createElement('div');
+    newElement.className = 'list-group-item d-flex justify-content-between align-items-center fade-in';
+    newElement.innerHTML = `
+        <div>
+            <h6 class="mb-1">${transactionData.concepto}</h6>
+            <small class="text-muted">
+                ${transactionData.fecha} • 
+                <span class="badge" style="background-color: ${transactionData.color}; color: white;">
+                    ${transactionData.icono} ${transactionData.categoria}
+                </span>
+            </small>
+        </div>
+        <span class="badge ${transactionData.tipo === 'ingreso' ? 'bg-success' : 'bg-danger'} rounded-pill">
+            $${transactionData.monto}
+        </span>
+    `;
+    
+    container.prepend(newElement);
+}
@@ -0,0 +1,87 @@
+// Función para editar gasto
+function editarGasto(id, concepto, monto, fecha, categoriaId, esencial, descripcion) {
+    // Llenar el modal con los datos actuales
+    document.getElementById('editar_gasto_id').value = id;
+    document.getElementById('editar_concepto').value = concepto;
+    document.getElementById('editar_monto').value = monto;
+    document.getElementById('editar_fecha').value = fecha;
+    document.getElementById('editar_categoria_id').value = categoriaId;
+    document.getElementById('editar_esencial').checked = (esencial === 'true' || esencial === true);
+    document.getElementById('editar_descripcion').value = descripcion;
+    
+    // Mostrar el modal
+    const modal = new bootstrap.Modal(document.getElementById('editarGastoModal'));
+    modal.show();
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    let expenseToDelete = null;
+    
+    // Eliminar gastos - Versión mejorada con modal
+    document.querySelectorAll('.delete-expense').forEach(button => {
+        button.addEventListener('click', function() {
+            const expenseId = this.getAttribute('data-expense-id');
+            const row = this.closest('tr');
+            const concepto = row.querySelector('td:nth-child(1) strong').textContent;
+            const monto = row.querySelector('td:nth-child(3)').textContent;
+            const fecha = row.querySelector('td:nth-child(4)').textContent;
+            const esencial = row.querySelector('td:nth-child(5) span').textContent;
+            
+            expenseToDelete = expenseId;
+            
+            // Mostrar detalles en el modal
+            document.getElementById('deleteExpenseDetails').innerHTML = `
+                <strong>"${concepto}"</strong><br>
+                <span class="text-danger">${monto}</span> • ${fecha}<br>
+                <small>Esencial: ${esencial}</small>
+            `;
+            
+            // Mostrar modal
+            const modal = new bootstrap.Modal(document.getElementById('deleteConfirmModal'));
+            modal.show();
+        });
+    });
+    
+    // Confirmar eliminación
+    document.getElementById('confirmDeleteBtn').addEventListener('click', function() {
+        if (!expenseToDelete) return;
+        
+        fetch(`/expenses/delete/${expenseToDelete}`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            }
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                // Cerrar modal
+                const modal = bootstrap.Modal.getInstance(document.getElementById('deleteConfirmModal'));
+                modal.hide();
+                
+                // Recargar página
+                location.reload();
+            } else {
+                alert('Error al eliminar el gasto: ' + data.error);
+            }
+        })
+        .catch(error => {
+            alert('Error al eliminar el gasto: ' + error);
+        });
+    });
+    
+    // Validación del campo esencial
+    const esencialCheckbox = document.getElementById('esencial');
+    if (esencialCheckbox) {
+        esencialCheckbox.addEventListener('change', function() {
+            console.log('Campo esencial:', this.checked ? 'Sí' : 'No');
+        });
+    }
+    
+    const editarEsencialCheckbox = document.getElementById('editar_esencial');
+    if (editarEsencialCheckbox) {
+        editarEsencialCheckbox.addEventListener('change', function() {
+            console.log('Campo esencial (editar):', this.checked ? 'Sí' : 'No');
+        });
+    }
+});
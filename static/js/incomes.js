@@ -0,0 +1,157 @@
+document.addEventListener('DOMContentLoaded', function() {
+    let currentIncomeId = null;
+    let incomeToDelete = null;
+    
+    // Establecer fecha actual por defecto
+    const today = new Date().toISOString().split('T')[0];
+    document.getElementById('fecha').value = today;
+    document.getElementById('edit_fecha').value = today;
+    
+    // Agregar nuevo ingreso
+    document.getElementById('addIncomeForm').addEventListener('submit', function(e) {
+        e.preventDefault();
+        
+        const formData = new FormData(this);
+        
+        fetch('/income/add', {
+            method: 'POST',
+            body: formData,
+            headers: {
+                'X-Requested-With': 'XMLHttpRequest'
+            }
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                location.reload();
+            } else {
+                alert('Error al agregar ingreso: ' + (data.error || 'Error desconocido'));
+            }
+        })
+        .catch(error => {
+            console.error('Error:', error);
+            alert('Error al agregar ingreso: ' + error.message);
+        });
+    });
+    
+    // Editar ingreso
+    document.querySelectorAll('.edit-income').forEach(button => {
+        button.addEventListener('click', function() {
+            currentIncomeId = this.getAttribute('data-income-id');
+            const concepto = this.getAttribute('data-concepto');
+            const monto = this.getAttribute('data-monto');
+            const fecha = this.getAttribute('data-fecha');
+            const categoriaId = this.getAttribute('data-categoria-id');
+            const descripcion = this.getAttribute('data-descripcion');
+            
+            document.getElementById('edit_income_id').value = currentIncomeId;
+            document.getElementById('edit_concepto').value = concepto || '';
+            document.getElementById('edit_monto').value = monto || '';
+            document.getElementById('edit_fecha').value = fecha || today;
+            document.getElementById('edit_categoria_id').value = categoriaId || '';
+            document.getElementById('edit_descripcion').value = descripcion || '';
+            
+            const modal = new bootstrap.Modal(document.getElementById('editIncomeModal'));
+            modal.show();
+        });
+    });
+    
+    // Guardar cambios de ingreso
+    document.getElementById('saveIncomeChanges').addEventListener('click', function() {
+        const incomeId = document.getElementById('edit_income_id').value;
+        const concepto = document.getElementById('edit_concepto').value.trim();
+        const monto = document.getElementById('edit_monto').value;
+        const fecha = document.getElementById('edit_fecha').value;
+        const categoriaId = document.getElementById('edit_categoria_id').value;
+        const descripcion = document.getElementById('edit_descripcion').value.trim();
+        
+        if (!concepto || !monto || !fecha || !categoriaId) {
+            alert('Por favor completa los campos obligatorios');
+            return;
+        }
+        
+        if (parseFloat(monto) <= 0) {
+            alert('El monto debe ser mayor a 0');
+            return;
+        }
+        
+        const formData = new FormData();
+        formData.append('concepto', concepto);
+        formData.append('monto', monto);
+        formData.append('fecha', fecha);
+        formData.append('categoria_id', categoriaId);
+        formData.append('descripcion', descripcion);
+        
+        fetch(`/income/update/${incomeId}`, {
+            method: 'POST',
+            body: formData,
+            headers: {
+                'X-Requested-With': 'XMLHttpRequest'
+            }
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                location.reload();
+            } else {
+                alert('Error al actualizar el ingreso: ' + (data.error || 'Error desconocido'));
+            }
+        })
+        .catch(error => {
+            console.error('Error:', error);
+            alert('Error al actualizar el ingreso: ' + error.message);
+        });
+    });
+    
+    // Eliminar ingreso - Versión mejorada con modal
+    document.querySelectorAll('.delete-income').forEach(button => {
+        button.addEventListener('click', function() {
+            const incomeId = this.getAttribute('data-income-id');
+            const row = this.closest('tr');
+            const concepto = row.querySelector('td:nth-child(2) strong').textContent;
+            const monto = row.querySelector('td:nth-child(4) span').textContent;
+            const fecha = row.querySelector('td:nth-child(1)').textContent;
+            
+            incomeToDelete = incomeId;
+            
+            // Mostrar detalles en el modal
+            document.getElementById('deleteIncomeDetails').innerHTML = `
+                <strong>"${concepto}"</strong><br>
+                <span class="text-success">${monto}</span> • ${fecha}
+            `;
+            
+            // Mostrar modal
+            const modal = new bootstrap.Modal(document.getElementById('deleteConfirmModal'));
+            modal.show();
+        });
+    });
+    
+    // Confirmar eliminación
+    document.getElementById('confirmDeleteBtn').addEventListener('click', function() {
+        if (!incomeToDelete) return;
+        
+        fetch(`/income/delete/${incomeToDelete}`, {
+            method: 'POST',
+            headers: {
+                'X-Requested-With': 'XMLHttpRequest'
+            }
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                // Cerrar modal
+                const modal = bootstrap.Modal.getInstance(document.getElementById('deleteConfirmModal'));
+                modal.hide();
+                
+                // Recargar página
+                location.reload();
+            } else {
+                alert('Error al eliminar el ingreso: ' + (data.error || 'Error desconocido'));
+            }
+        })
+        .catch(error => {
+            console.error('Error:', error);
+            alert('Error al eliminar el ingreso: ' + error.message);
+        });
+    });
+});
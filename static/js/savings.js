@@ -0,0 +1,208 @@
+// Función para mejorar mensajes de error del servidor
+function mejorarMensajeError(error) {
+    if (!error) return 'Error desconocido';
+    
+    // Si el error contiene información sobre superar la meta
+    if (error.includes('No puedes ahorrar más de tu meta') || 
+        error.includes('supera la meta') ||
+        error.includes('más de tu meta') ||
+        error.includes('supere la meta') ||
+        error.includes('completar los')) {
+        return 'No puedes ingresar más dinero del necesario para completar tu meta. Revisa el monto que intentas agregar.';
+    }
+    
+    // Si el error contiene información sobre saldo
+    if (error.includes('saldo') || error.includes('disponible')) {
+        return 'No tienes suficiente saldo disponible para realizar esta operación.';
+    }
+    
+    // Si el error contiene información sobre presupuesto
+    if (error.includes('presupuesto')) {
+        return 'Has superado el presupuesto asignado para esta categoría.';
+    }
+    
+    // Si el error contiene información sobre monto menor
+    if (error.includes('menor') || error.includes('ahorrado actual')) {
+        return 'No puedes establecer una meta menor a lo que ya has ahorrado.';
+    }
+    
+    const mensajesMejorados = {
+        'No puedes ahorrar más de tu meta': 'No puedes ingresar más dinero del necesario para completar tu meta actual.',
+        'No puedes gastar más de tu saldo disponible': 'No tienes suficiente saldo disponible para esta operación',
+        'No puedes gastar más del presupuesto asignado': 'Has superado el presupuesto asignado para esta categoría',
+        'La nueva meta no puede ser menor a lo ya ahorrado': 'No puedes reducir la meta por debajo de lo que ya has ahorrado',
+        'Monto inválido': 'Por favor ingresa un monto válido',
+        'Meta total inválida': 'Por favor ingresa una meta total válida',
+        'Campos obligatorios faltantes': 'Por favor completa todos los campos obligatorios',
+        'El monto debe ser mayor a 0': 'El monto debe ser mayor a cero',
+        'La meta total debe ser mayor a 0': 'La meta total debe ser mayor a cero'
+    };
+    
+    return mensajesMejorados[error] || error;
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    let currentSavingId = null;
+    
+    // Agregar dinero a meta de ahorro
+    document.querySelectorAll('.add-money-form').forEach(form => {
+        form.addEventListener('submit', function(e) {
+            e.preventDefault();
+            const savingId = this.getAttribute('data-saving-id');
+            const montoInput = this.querySelector('input[type="text"]');
+            const monto = parseFloat(montoInput.value.replace(/\./g, ''));
+            
+            if (!monto || monto <= 0) {
+                mostrarAlerta('Por favor ingresa un monto válido', 'warning');
+                return;
+            }
+            
+            const formData = new FormData();
+            formData.append('monto', monto);
+            
+            fetch(`/savings/add-money/${savingId}`, {
+                method: 'POST',
+                body: formData,
+                headers: {
+                    'X-Requested-With': 'XMLHttpRequest'
+                }
+            })
+            .then(response => {
+                if (!response.ok) {
+                    return response.json().then(errorData => {
+                        throw new Error(errorData.error || 'Error en el servidor');
+                    });
+                }
+                return response.json();
+            })
+            .then(data => {
+                if (data.success) {
+                    mostrarAlerta('¡Dinero agregado exitosamente!', 'success');
+                    setTimeout(() => location.reload(), 1000);
+                } else {
+                    const mensajeMejorado = mejorarMensajeError(data.error);
+                    mostrarAlerta(mensajeMejorado, 'danger');
+                }
+            })
+            .catch(error => {
+                console.error('Error:', error);
+                const mensajeMejorado = mejorarMensajeError(error.message);
+                mostrarAlerta(mensajeMejorado, 'danger');
+            });
+        });
+    });
+    
+    // Editar meta de ahorro
+    document.querySelectorAll('.edit-saving').forEach(button => {
+        button.addEventListener('click', function() {
+            currentSavingId = this.getAttribute('data-saving-id');
+            const concepto = this.getAttribute('data-concepto');
+            const metaTotal = this.getAttribute('data-meta-total');
+            const fechaObjetivo = this.getAttribute('data-fecha-objetivo');
+            const descripcion = this.getAttribute('data-descripcion');
+            
+            document.getElementById('edit_concepto').value = concepto || '';
+            document.getElementById('edit_meta_total').value = metaTotal || '';
+            document.getElementById('edit_fecha_objetivo').value = fechaObjetivo || '';
+            document.getElementById('edit_descripcion').value = descripcion || '';
+            document.getElementById('edit_saving_id').value = currentSavingId;
+            
+            const modal = new bootstrap.Modal(document.getElementById('editSavingModal'));
+            modal.show();
+        });
+    });
+    
+    // Guardar cambios de meta de ahorro
+    document.getElementById('saveSavingChanges').addEventListener('click', function() {
+        const savingId = document.getElementById('edit_saving_id').value;
+        const concepto = document.getElementById('edit_concepto').value.trim();
+        const metaTotal = document.getElementById('edit_meta_total').value;
+        const fechaObjetivo = document.getElementById('edit_fecha_objetivo').value;
+        const descripcion = document.getElementById('edit_descripcion').value.trim();
+        
+        if (!concepto || !metaTotal) {
+            mostrarAlerta('Por favor completa los campos obligatorios', 'warning');
+            return;
+        }
+        
+        if (parseFloat(metaTotal.replace(/\./g, '')) <= 0) {
+            mostrarAlerta('La meta total debe ser mayor a 0', 'warning');
+            return;
+        }
+        
+        const formData = new FormData();
+        formData.append('concepto', concepto);
+        formData.append('meta_total', metaTotal.replace(/\./g, ''));
+        formData.append('fecha_objetivo', fechaObjetivo);
+        formData.append('descripcion', descripcion);
+        
+        fetch(`/savings/update/${savingId}`, {
+            method: 'POST',
+            body: formData,
+            headers: {
+                'X-Requested-With': 'XMLHttpRequest'
+            }
+        })
+        .then(response => {
+            if (!response.ok) {
+                return response.json().then(errorData => {
+                    throw new Error(errorData.error || 'Error en el servidor');
+                });
+            }
+            return response.json();
+        })
+        .then(data => {
+            if (data.success) {
+                mostrarAlerta('¡Meta actualizada exitosamente!', 'success');
+                setTimeout(() => location.reload(), 1000);
+            } else {
+                const mensajeMejorado = mejorarMensajeError(data.error);
+                mostrarAlerta(mensajeMejorado, 'danger');
+            }
+        })
+        .catch(error => {
+            console.error('Error:', error);
+            const mensajeMejorado = mejorarMensajeError(error.message);
+            mostrarAlerta(mensajeMejorado, 'danger');
+        });
+    });
+    
+    // Eliminar meta de ahorro
+    document.querySelectorAll('.delete-saving').forEach(button => {
+        button.addEventListener('click', function() {
+            const savingId = this.getAttribute('data-saving-id');
+            
+            if (confirm('¿Estás seguro de que quieres eliminar esta meta de ahorro? Esta acción no se puede deshacer.')) {
+                fetch(`/savings/delete/${savingId}`, {
+                    method: 'POST',
+                    headers: {
+                        'Content-Type': 'application/json',
+                        'X-Requested-With': 'XMLHttpRequest'
+                    }
+                })
+                .then(response => {
+                    if (!response.ok) {
+                        return response.json().then(errorData => {
+                            throw new Error(errorData.error || 'Error en el servidor');
+                        });
+                    }
+                    return response.json();
+                })
+                .then(data => {
+                    if (data.success) {
+                        mostrarAlerta('¡Meta eliminada exitosamente!', 'success');
+                        setTimeout(() => location.reload(), 1000);
+                    } else {
+                        const mensajeMejorado = mejorarMensajeError(data.error);
+                        mostrarAlerta(mensajeMejorado, 'danger');
+                    }
+                })
+                .catch(error => {
+                    console.error('Error:', error);
+                    const mensajeMejorado = mejorarMensajeError(error.message);
+                    mostrarAlerta(mensajeMejorado, 'danger');
+                });
+            }
+        });
+    });
+});
@@ -0,0 +1,103 @@
+"""Backends de ``utils.cache``: el adaptador de Redis contra un sustituto local
+(fakeredis, se salta si no está instalado) y las etiquetas de SQLite."""
+import time
+
+import pytest
+
+from utils.cache import RedisCache, SQLiteCache
+
+
+@pytest.fixture
+def redis_cache():
+    fakeredis = pytest.importorskip('fakeredis')
+    return RedisCache(client=fakeredis.FakeRedis(), prefix='pruebas:')
+
+
+@pytest.fixture
+def sqlite_cache(tmp_path):
+    return SQLiteCache(path=str(tmp_path / 'cache.sqlite3'))
+
+
+def test_redis_roundtrip_and_ttl(redis_cache):
+    redis_cache.set('a', {'total': 1.5}, ttl=30)
+    redis_cache.set('b', [1, 2])
+
+    assert redis_cache.get('a') == {'total': 1.5}
+    assert redis_cache.get('b') == [1, 2]
+    assert redis_cache.get('c', 'defecto') == 'defecto'
+    assert 0 < redis_cache.client.pttl('pruebas:a') <= 30_000
+    assert redis_cache.client.pttl('pruebas:b') == -1
+
+    redis_cache.delete('a')
+    assert redis_cache.get('a') is None
+
+
+def test_redis_counters(redis_cache):
+    assert redis_cache.get_counter('version') == 0
+    assert redis_cache.incr('version') == 1
+    assert redis_cache.incr('version', 5) == 6
+    redis_cache.set_counter('version', 42)
+    assert redis_cache.get_counter('version') == 42
+
+
+def test_redis_invalidate_tags(redis_cache):
+    redis_cache.set('u1:resumen', 1, ttl=60, tags=['usuario:1'])
+    redis_cache.set('u1:gastos', 2, ttl=60, tags=['usuario:1', 'gastos'])
+    redis_cache.set('u2:gastos', 3, ttl=60, tags=['usuario:2', 'gastos'])
+
+    redis_cache.invalidate_tags('usuario:1')
+
+    assert redis_cache.get('u1:resumen') is None
+    assert redis_cache.get('u1:gastos') is None
+    assert redis_cache.get('u2:gastos') == 3
+    assert not redis_cache.client.exists('pruebas:tag:usuario:1')
+
+
+def test_redis_tag_sets_expire_with_their_longest_entry(redis_cache):
+    client = redis_cache.client
+    redis_cache.set('a', 1, ttl=60, tags=['t'])
+    assert 0 < client.pttl('pruebas:tag:t') <= 60_000
+
+    # Una entrada más duradera alarga la etiqueta; una más corta no la acorta
+    redis_cache.set('b', 2, ttl=600, tags=['t'])
+    assert client.pttl('pruebas:tag:t') > 60_000
+    redis_cache.set('c', 3, ttl=5, tags=['t'])
+    assert client.pttl('pruebas:tag:t') > 60_000
+
+    # Una entrada sin caducidad deja la etiqueta sin caducidad
+    redis_cache.set('d', 4, tags=['t'])
+    assert client.pttl('pruebas:tag:t') == -1
+    redis_cache.set('e', 5, ttl=5, tags=['t'])
+    assert client.pttl('pruebas:tag:t') == -1
+
+
+def test_redis_get_or_set_and_lock(redis_cache):
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return 'valor'
+
+    assert redis_cache.get_or_set('clave', factory, ttl=30, tags=['t']) == 'valor'
+    assert redis_cache.get_or_set('clave', factory, ttl=30, tags=['t']) == 'valor'
+    assert len(calls) == 1
+
+    token = redis_cache._acquire('recurso', 5)
+    assert token is not None
+    assert redis_cache._acquire('recurso', 5) is None
+    redis_cache._release('recurso', token)
+    assert redis_cache._acquire('recurso', 5) is not None
+
+
+def test_sqlite_tags_drop_expired_entries(sqlite_cache):
+    sqlite_cache.set('viejo', 1, ttl=0.01, tags=['t'])
+    sqlite_cache.set('borrado', 2, tags=['t'])
+    sqlite_cache.delete('borrado')
+    time.sleep(0.02)
+
+    sqlite_cache.set('nuevo', 3, ttl=60, tags=['t'])
+
+    keys = [row[0] for row in sqlite_cache._connection().execute("SELECT key FROM cache_tags WHERE tag = 't'")]
+    assert keys == ['nuevo']
+    sqlite_cache.invalidate_tags('t')
+    assert sqlite_cache.get('nuevo') is None
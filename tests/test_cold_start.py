@@ -0,0 +1,16 @@
+"""Presupuesto de arranque en frío: ``import app`` en un intérprete nuevo no
+debe pasar de ``COLD_START_BUDGET_MS`` (mediana de varios arranques)."""
+import statistics
+
+from utils.startup import COLD_START_BUDGET_MS, measure_cold_start
+
+RUNS = 3
+
+
+def test_cold_start_within_budget():
+    timings = measure_cold_start(RUNS)
+    median = statistics.median(timings)
+    assert median <= COLD_START_BUDGET_MS, (
+        f"Arranque en frío {median:.1f} ms (ejecuciones: {', '.join(f'{t:.1f}' for t in timings)}) "
+        f"supera el presupuesto de {COLD_START_BUDGET_MS:.0f} ms; "
+        f"ver python benchmarks/startup_profile.py")
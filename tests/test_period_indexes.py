@@ -0,0 +1,142 @@
+"""Las consultas filtradas con ``Period.predicate()`` usan los índices compuestos.
+
+Crea una base de datos temporal con el esquema de ``init_database.py``, la
+llena con datos de ejemplo y comprueba con EXPLAIN qué índice elige MySQL
+para las consultas de gastos, ingresos, presupuestos, dashboard y
+administración. Se salta si no hay un MySQL accesible con la configuración de
+``config.py`` (variables MYSQLHOST, MYSQLUSER, ...) o si el usuario no puede
+crear bases de datos.
+"""
+import random
+from datetime import date, timedelta
+
+import pymysql
+import pytest
+
+from config import Config
+from init_database import ensure_indexes, schema_statements
+from models.activity import ActivityFeedModel
+from models.admin_stats import AdminStatsModel
+from models.budget_status import BudgetStatusEngine
+from models.dashboard import DashboardModel
+from models.expense import ExpenseModel
+from models.income import IncomeModel
+from models.rollup import MonthlyRollupModel
+from utils.periods import Period
+
+TEST_DB = f"{Config.MYSQL_DB}_pruebas_explain"
+
+USERS = range(2, 22)
+FIRST_DAY = date(2024, 1, 1)
+DAYS = 730
+EXPENSES_PER_USER = 300
+INCOMES_PER_USER = 60
+
+USER_ID = 7
+MONTH = Period.for_month(2025, 3)
+RANGE = Period.between('2025-02-10', '2025-03-20')
+LAST_30_DAYS = Period.last_days(30, FIRST_DAY + timedelta(days=DAYS - 1))
+
+
+def _connect(**extra):
+    return pymysql.connect(host=Config.MYSQL_HOST, user=Config.MYSQL_USER, password=Config.MYSQL_PASSWORD,
+                           port=Config.MYSQL_PORT, charset='utf8mb4', autocommit=True,
+                           connect_timeout=3, **extra)
+
+
+def _seed(cursor):
+    rng = random.Random(2025)
+    cursor.executemany(
+        "INSERT INTO usuarios (id, nombre, email, clave) VALUES (%s, %s, %s, 'x')",
+        [(u, f"Usuario {u}", f"usuario{u}@example.com") for u in USERS])
+
+    def day():
+        return FIRST_DAY + timedelta(days=rng.randrange(DAYS))
+
+    cursor.executemany(
+        "INSERT INTO gastos (usuario_id, concepto, monto, categoria_id, fecha, esencial) "
+        "VALUES (%s, 'Gasto', %s, %s, %s, %s)",
+        [(u, rng.randint(1, 500), rng.randint(1, 9), day(), rng.randint(0, 1))
+         for u in USERS for _ in range(EXPENSES_PER_USER)])
+    cursor.executemany(
+        "INSERT INTO ingresos (usuario_id, concepto, monto, categoria_id, fecha) "
+        "VALUES (%s, 'Ingreso', %s, %s, %s)",
+        [(u, rng.randint(100, 3000), rng.randint(1, 4), day()) for u in USERS for _ in range(INCOMES_PER_USER)])
+
+    months = [date(year, month, 1) for year in (2024, 2025) for month in range(1, 13)]
+    cursor.executemany(
+        "INSERT INTO presupuestos (usuario_id, categoria_gasto_id, monto_maximo, mes_year) VALUES (%s, %s, 800, %s)",
+        [(u, categoria, mes) for u in USERS for categoria in range(1, 10) for mes in months])
+
+    for model in (MonthlyRollupModel(), ActivityFeedModel()):
+        for query, params in model.backfill_statements():
+            cursor.execute(query, params)
+
+    cursor.execute("ANALYZE TABLE gastos, ingresos, presupuestos, resumen_mensual, movimientos")
+    cursor.fetchall()
+
+
+@pytest.fixture(scope='module')
+def cursor():
+    try:
+        connection = _connect()
+    except pymysql.err.OperationalError as e:
+        pytest.skip(f"MySQL no disponible: {e}")
+
+    with connection.cursor() as admin:
+        try:
+            admin.execute(f"DROP DATABASE IF EXISTS `{TEST_DB}`")
+            admin.execute(f"CREATE DATABASE `{TEST_DB}` CHARACTER SET utf8mb4")
+        except pymysql.err.MySQLError as e:
+            connection.close()
+            pytest.skip(f"No se puede crear la base de datos de pruebas: {e}")
+
+    try:
+        connection.select_db(TEST_DB)
+        with connection.cursor() as setup:
+            for statement in schema_statements():
+                setup.execute(statement)
+            ensure_indexes(setup)
+            _seed(setup)
+        with connection.cursor(pymysql.cursors.DictCursor) as explain_cursor:
+            yield explain_cursor
+    finally:
+        with connection.cursor() as admin:
+            admin.execute(f"DROP DATABASE IF EXISTS `{TEST_DB}`")
+        connection.close()
+
+
+CASES = {
+    'gastos del mes': (lambda: ExpenseModel().by_user_query(USER_ID, period=MONTH),
+                       'idx_gastos_usuario_fecha'),
+    'gastos de un rango': (lambda: ExpenseModel().by_user_query(USER_ID, period=RANGE),
+                           'idx_gastos_usuario_fecha'),
+    'total de gastos de un rango': (lambda: ExpenseModel().total_query(USER_ID, period=RANGE),
+                                    'idx_gastos_usuario_fecha'),
+    'ingresos del mes': (lambda: IncomeModel().by_user_query(USER_ID, period=MONTH),
+                         'idx_ingresos_usuario_fecha'),
+    'ingresos de un rango': (lambda: IncomeModel().by_user_query(USER_ID, period=RANGE),
+                             'idx_ingresos_usuario_fecha'),
+    'total de ingresos de un rango': (lambda: IncomeModel().total_query(USER_ID, period=RANGE),
+                                      'idx_ingresos_usuario_fecha'),
+    'presupuestos del mes': (lambda: BudgetStatusEngine().budgets_query(USER_ID, MONTH),
+                             'idx_presupuestos_usuario_mes'),
+    'gasto del mes por categoría': (lambda: BudgetStatusEngine().spend_query(USER_ID, MONTH),
+                                    'PRIMARY'),
+    'totales del mes (dashboard)': (lambda: DashboardModel().month_totals_query(USER_ID, 3, 2025),
+                                    'PRIMARY'),
+    'importes recientes (admin)': (lambda: AdminStatsModel().recent_query(LAST_30_DAYS, LAST_30_DAYS.previous()),
+                                   'idx_movimientos_fecha'),
+}
+
+
+@pytest.mark.parametrize('name', list(CASES))
+def test_period_query_uses_composite_index(cursor, name):
+    build, expected_key = CASES[name]
+    query, params = build()
+    cursor.execute(f"EXPLAIN {query}", params)
+    plan = cursor.fetchall()
+
+    assert len(plan) == 1, plan
+    assert plan[0]['type'] != 'ALL', plan
+    assert plan[0]['key'] == expected_key, plan
@@ -0,0 +1,102 @@
+import json
+import mimetypes
+import os
+import threading
+
+from flask import abort, request, send_file, url_for
+
+# Librerías de terceros que se sirven desde static/vendor (build_assets.py las
+# descarga en el despliegue): ruta bajo static/ -> URL original, versión fijada.
+# Las fuentes que referencian las hojas de estilo se descargan junto a ellas.
+VENDOR = {
+    'vendor/bootstrap/css/bootstrap.min.css': 'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css',
+    'vendor/bootstrap/js/bootstrap.bundle.min.js': 'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js',
+    'vendor/fontawesome/css/all.min.css': 'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css',
+    'vendor/chartjs/chart.umd.min.js': 'https://cdn.jsdelivr.net/npm/chart.js@4.4.1/dist/chart.umd.js',
+}
+
+DIST_DIR = 'dist'                 # bajo static/: ficheros con hash de contenido
+MANIFEST = 'manifest.json'        # ruta lógica -> ruta con hash (dentro de dist/)
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+
+class AssetManifest:
+    """Manifiesto que genera ``build_assets.py``.
+
+    Sin manifiesto (desarrollo, o el build no se ejecutó) ``url()`` devuelve
+    el fichero sin hash de static/ o, si una librería aún no se descargó, su
+    URL original del CDN: la página funciona igual, solo sin caché inmutable.
+    """
+
+    def __init__(self, static_folder, reload=False):
+        self.dist_folder = os.path.join(static_folder, DIST_DIR)
+        self.static_folder = static_folder
+        self.reload = reload
+        self._entries = None
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    @property
+    def entries(self):
+        path = os.path.join(self.dist_folder, MANIFEST)
+        if self._entries is None or self.reload:
+            try:
+                mtime = os.path.getmtime(path)
+            except OSError:
+                mtime = None
+            if self._entries is None or mtime != self._mtime:
+                with self._lock:
+                    self._entries = self._load(path) if mtime is not None else {}
+                    self._mtime = mtime
+        return self._entries
+
+    @staticmethod
+    def _load(path):
+        try:
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ No se pudo leer el manifiesto de assets: {e}")
+            return {}
+
+    def url(self, path):
+        """URL de un asset por su ruta bajo static/ (p. ej. ``js/app.js``)"""
+        hashed = self.entries.get(path)
+        if hashed:
+            return url_for('assets', filename=hashed)
+        if path in VENDOR and not os.path.exists(os.path.join(self.static_folder, path)):
+            return VENDOR[path]
+        return url_for('static', filename=path)
+
+
+def serve_asset(dist_folder, filename):
+    """Fichero con hash: caché inmutable de un año y versión precomprimida si
+    el cliente la acepta (``build_assets.py`` deja ``.br`` / ``.gz`` al lado)"""
+    path = os.path.realpath(os.path.join(dist_folder, filename))
+    if not path.startswith(os.path.realpath(dist_folder) + os.sep) or not os.path.isfile(path):
+        abort(404)
+
+    mimetype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    encoding = None
+    for candidate, suffix in (('br', '.br'), ('gzip', '.gz')):
+        if request.accept_encodings[candidate] > 0 and os.path.isfile(path + suffix):
+            path, encoding = path + suffix, candidate
+            break
+
+    response = send_file(path, mimetype=mimetype, max_age=IMMUTABLE_MAX_AGE, conditional=True)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+
+def init_app(app):
+    """Registrar ``/assets/<fichero con hash>`` y ``asset_url()`` en las plantillas"""
+    manifest = AssetManifest(app.static_folder, reload=app.debug)
+    dist_folder = manifest.dist_folder
+
+    app.add_url_rule('/assets/<path:filename>', 'assets', lambda filename: serve_asset(dist_folder, filename))
+    app.jinja_env.globals['asset_url'] = manifest.url
+    app.extensions['asset_manifest'] = manifest
@@ -0,0 +1,152 @@
+import asyncio
+import threading
+import time
+
+from pymysql.constants import CLIENT
+
+from config import Config
+from utils.timing import record_pool_wait, record_query
+
+
+class AsyncDatabase:
+    """Pool de conexiones asíncronas (aiomysql) para las APIs del servidor ASGI.
+
+    Misma configuración de conexión que ``Database.get_connection`` y la misma
+    forma de uso: ``execute_query`` y ``execute_batch`` reciben las consultas que
+    construyen los modelos (``*_query``) y devuelven las filas como diccionarios.
+    Mientras una consulta espera a MySQL el bucle atiende otras peticiones.
+
+    El pool pertenece al bucle de eventos que lo crea: lo abre ``start()`` en el
+    arranque del servidor (lifespan) o la primera consulta, y lo cierra ``close()``.
+    El paquete ``aiomysql`` solo se importa al abrirlo (la app WSGI no lo necesita).
+    """
+
+    def __init__(self, min_size=None, max_size=None, timeout=None):
+        self.min_size = Config.DB_POOL_MIN_SIZE if min_size is None else min_size
+        self.max_size = max_size or Config.ASYNC_DB_POOL_MAX_SIZE
+        self.timeout = Config.DB_POOL_TIMEOUT if timeout is None else timeout
+        self._pool = None
+        self._lock = None
+
+    async def start(self):
+        """Abrir el pool (idempotente)"""
+        if self._pool is not None:
+            return self._pool
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._pool is None:
+                try:
+                    import aiomysql
+                except ImportError as e:
+                    raise RuntimeError("El servidor ASGI necesita el paquete 'aiomysql' (pip install aiomysql)") from e
+                self._pool = await aiomysql.create_pool(
+                    host=Config.MYSQL_HOST,
+                    user=Config.MYSQL_USER,
+                    password=Config.MYSQL_PASSWORD,
+                    db=Config.MYSQL_DB,
+                    port=Config.MYSQL_PORT,
+                    charset='utf8mb4',
+                    cursorclass=aiomysql.DictCursor,
+                    connect_timeout=10,
+                    autocommit=True,
+                    client_flag=CLIENT.MULTI_STATEMENTS,
+                    minsize=self.min_size,
+                    maxsize=self.max_size,
+                    pool_recycle=int(Config.DB_POOL_MAX_LIFETIME),
+                )
+                print(f"🔌 Pool asíncrono de MySQL listo ({self.min_size}-{self.max_size} conexiones)")
+        return self._pool
+
+    async def close(self):
+        """Cerrar todas las conexiones del pool"""
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.close()
+            await pool.wait_closed()
+
+    async def _acquire(self):
+        pool = await self.start()
+        start = time.perf_counter()
+        try:
+            connection = await asyncio.wait_for(pool.acquire(), self.timeout)
+            record_pool_wait(time.perf_counter() - start)
+            return pool, connection
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Sin conexión libre en el pool asíncrono tras {self.timeout:.1f}s") from None
+
+    async def execute_query(self, query, params=None, fetch=False, fetch_one=False):
+        """Ejecutar una consulta; como ``Database.execute_query`` fuera de una petición"""
+        pool, connection = await self._acquire()
+        try:
+            async with connection.cursor() as cursor:
+                start = time.perf_counter()
+                try:
+                    await cursor.execute(query, params or ())
+                finally:
+                    record_query(time.perf_counter() - start)
+                if fetch:
+                    return await cursor.fetchall()
+                if fetch_one:
+                    return await cursor.fetchone()
+                return cursor.lastrowid
+        except Exception as e:
+            print(f"❌ Error en consulta (async): {e}")
+            raise
+        finally:
+            pool.release(connection)
+
+    async def execute_batch(self, queries):
+        """Varias lecturas en un solo viaje (multi-statement), como
+        ``Database.execute_batch``: una lista de filas por consulta, en orden"""
+        if not queries:
+            return []
+        pool, connection = await self._acquire()
+        try:
+            async with connection.cursor() as cursor:
+                statements = []
+                for item in queries:
+                    query, params = (item, None) if isinstance(item, str) else item
+                    statements.append(cursor.mogrify(query.strip().rstrip(';'), params))
+
+                start = time.perf_counter()
+                try:
+                    await cursor.execute(";\n".join(statements))
+                    results = [list(await cursor.fetchall())]
+                    while await cursor.nextset():
+                        results.append(list(await cursor.fetchall()))
+                finally:
+                    record_query(time.perf_counter() - start, count=len(statements))
+                return results
+        except Exception as e:
+            print(f"❌ Error en lote de consultas (async): {e}")
+            # Un multi-statement a medias deja resultados pendientes: no reutilizar
+            connection.close()
+            raise
+        finally:
+            pool.release(connection)
+
+    def stats(self):
+        """Estadísticas del pool"""
+        if self._pool is None:
+            return {'size': 0, 'idle': 0, 'min_size': self.min_size, 'max_size': self.max_size}
+        return {
+            'size': self._pool.size,
+            'idle': self._pool.freesize,
+            'min_size': self.min_size,
+            'max_size': self.max_size,
+        }
+
+
+_async_db = None
+_async_db_lock = threading.Lock()
+
+
+def get_async_database():
+    """Pool asíncrono del proceso (lo usa el servidor ASGI, un bucle por worker)"""
+    global _async_db
+    if _async_db is None:
+        with _async_db_lock:
+            if _async_db is None:
+                _async_db = AsyncDatabase()
+    return _async_db
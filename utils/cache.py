@@ -0,0 +1,486 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from config import Config
+
+
+_MISSING = object()
+
+
+class CacheBackend:
+    """Interfaz común de los cachés de la aplicación.
+
+    - ``get`` / ``set`` / ``delete`` con TTL opcional (segundos) por entrada.
+    - Etiquetas: ``set(..., tags=[...])`` y ``invalidate_tags(...)`` borra
+      todas las entradas que lleven alguna de ellas.
+    - Contadores atómicos (``incr`` / ``get_counter``) para versiones; no
+      caducan y viven aparte de las entradas.
+    - ``get_or_set`` con single-flight: si varios hilos o procesos piden a la
+      vez una clave ausente, solo uno ejecuta ``factory`` y el resto espera.
+
+    Los valores se serializan con pickle en los backends compartidos: solo
+    deben apuntar a almacenes de confianza (fichero local o Redis privado).
+    """
+
+    name = 'base'
+
+    def get(self, key, default=None):
+        raise NotImplementedError
+
+    def set(self, key, value, ttl=None, tags=()):
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def incr(self, key, delta=1):
+        """Sumar ``delta`` al contador y devolver el nuevo valor (atómico)"""
+        raise NotImplementedError
+
+    def get_counter(self, key):
+        """Valor actual del contador (0 si no existe)"""
+        raise NotImplementedError
+
+    def set_counter(self, key, value):
+        """Fijar el contador (p. ej. una marca de tiempo); tampoco caduca"""
+        raise NotImplementedError
+
+    def invalidate_tags(self, *tags):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def _acquire(self, key, ttl):
+        """Intentar tomar el candado de cálculo de ``key``; devuelve un token o None"""
+        raise NotImplementedError
+
+    def _release(self, key, token):
+        raise NotImplementedError
+
+    def get_or_set(self, key, factory, ttl=None, tags=(), wait=None):
+        """Valor de ``key`` o, si falta, el de ``factory()`` guardado (single-flight).
+
+        Quien no consigue el candado espera a que el valor aparezca; si pasan
+        ``wait`` segundos (``Config.CACHE_LOCK_TIMEOUT``) calcula por su cuenta
+        sin guardar, para no quedar bloqueado por un proceso caído.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        wait = Config.CACHE_LOCK_TIMEOUT if wait is None else wait
+        deadline = time.monotonic() + wait
+        delay = 0.005
+        while True:
+            token = self._acquire(key, wait)
+            if token is not None:
+                try:
+                    # Otro pudo guardarlo mientras esperábamos el candado
+                    value = self.get(key, _MISSING)
+                    if value is _MISSING:
+                        value = factory()
+                        self.set(key, value, ttl=ttl, tags=tags)
+                    return value
+                finally:
+                    self._release(key, token)
+
+            time.sleep(delay)
+            delay = min(delay * 2, 0.1)
+            value = self.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+            if time.monotonic() >= deadline:
+                return factory()
+
+
+class MemoryCache(CacheBackend):
+    """LRU en memoria del proceso (por defecto; con un solo worker basta)"""
+
+    name = 'memory'
+
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries or Config.CACHE_MAX_ENTRIES
+        self._init_state()
+
+    def _init_state(self):
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # clave -> (valor, caduca, etiquetas)
+        self._tags = {}                 # etiqueta -> {claves}
+        self._counters = {}
+        self._flights = {}              # clave -> token del candado de cálculo
+
+    def _check_fork(self):
+        if self._pid != os.getpid():
+            # Un lock copiado tomado en el padre no se liberaría nunca
+            self._lock = threading.Lock()
+            self._flights = {}
+            self._pid = os.getpid()
+
+    def get(self, key, default=None):
+        self._check_fork()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            value, expires, _ = entry
+            if expires is not None and expires <= time.monotonic():
+                self._remove_locked(key)
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None, tags=()):
+        self._check_fork()
+        expires = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._remove_locked(key)
+            self._entries[key] = (value, expires, tuple(tags))
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove_locked(oldest)
+
+    def delete(self, key):
+        self._check_fork()
+        with self._lock:
+            self._remove_locked(key)
+
+    def incr(self, key, delta=1):
+        self._check_fork()
+        with self._lock:
+            value = self._counters.get(key, 0) + delta
+            self._counters[key] = value
+            return value
+
+    def get_counter(self, key):
+        return self._counters.get(key, 0)
+
+    def set_counter(self, key, value):
+        with self._lock:
+            self._counters[key] = int(value)
+
+    def invalidate_tags(self, *tags):
+        self._check_fork()
+        with self._lock:
+            for tag in tags:
+                for key in list(self._tags.pop(tag, ())):
+                    self._remove_locked(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def _remove_locked(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def _acquire(self, key, ttl):
+        self._check_fork()
+        with self._lock:
+            if key in self._flights:
+                return None
+            token = object()
+            self._flights[key] = token
+            return token
+
+    def _release(self, key, token):
+        with self._lock:
+            if self._flights.get(key) is token:
+                del self._flights[key]
+
+
+class SQLiteCache(CacheBackend):
+    """Caché compartido entre los workers de la máquina en un fichero SQLite.
+
+    No necesita ningún servicio externo: todos los procesos abren el mismo
+    fichero (modo WAL) y las operaciones compuestas van en transacciones
+    ``BEGIN IMMEDIATE``, así que contadores, etiquetas y candados son atómicos
+    entre procesos. Cada hilo usa su propia conexión.
+    """
+
+    name = 'sqlite'
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL)",
+        "CREATE TABLE IF NOT EXISTS cache_tags (tag TEXT NOT NULL, key TEXT NOT NULL, PRIMARY KEY (tag, key))",
+        "CREATE INDEX IF NOT EXISTS cache_tags_key ON cache_tags (key)",
+        "CREATE TABLE IF NOT EXISTS counters (key TEXT PRIMARY KEY, value INTEGER NOT NULL)",
+        "CREATE TABLE IF NOT EXISTS locks (key TEXT PRIMARY KEY, token TEXT NOT NULL, expires REAL NOT NULL)",
+    )
+
+    # Cada cuántas escrituras se purgan las entradas caducadas
+    PURGE_EVERY = 256
+
+    def __init__(self, path=None, max_entries=None):
+        self.path = path or Config.CACHE_SQLITE_PATH
+        self.max_entries = max_entries or Config.CACHE_MAX_ENTRIES
+        self._local = threading.local()
+        self._writes = 0
+        with self._transaction() as db:
+            for statement in self.SCHEMA:
+                db.execute(statement)
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            # isolation_level=None: las transacciones se abren a mano
+            connection = sqlite3.connect(self.path, timeout=Config.CACHE_LOCK_TIMEOUT, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def _transaction(self):
+        backend = self
+
+        class _Transaction:
+            def __enter__(self):
+                self.db = backend._connection()
+                self.db.execute("BEGIN IMMEDIATE")
+                return self.db
+
+            def __exit__(self, exc_type, exc, tb):
+                self.db.execute("ROLLBACK" if exc_type else "COMMIT")
+                return False
+
+        return _Transaction()
+
+    def get(self, key, default=None):
+        row = self._connection().execute(
+            "SELECT value, expires FROM cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or (row[1] is not None and row[1] <= time.time()):
+            return default
+        return pickle.loads(row[0])
+
+    def set(self, key, value, ttl=None, tags=()):
+        payload = sqlite3.Binary(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        expires = time.time() + ttl if ttl else None
+        with self._transaction() as db:
+            db.execute("INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)", (key, payload, expires))
+            db.execute("DELETE FROM cache_tags WHERE key = ?", (key,))
+            # Las etiquetas que se escriben sueltan las entradas ya caducadas o
+            # borradas: no crecen sin límite entre purgas
+            db.executemany("""
+                DELETE FROM cache_tags WHERE tag = ? AND NOT EXISTS (
+                    SELECT 1 FROM cache c WHERE c.key = cache_tags.key AND (c.expires IS NULL OR c.expires > ?)
+                )""", [(tag, time.time()) for tag in tags])
+            db.executemany("INSERT OR IGNORE INTO cache_tags (tag, key) VALUES (?, ?)", [(tag, key) for tag in tags])
+        self._writes += 1
+        if self._writes % self.PURGE_EVERY == 0:
+            self.purge()
+
+    def delete(self, key):
+        with self._transaction() as db:
+            db.execute("DELETE FROM cache WHERE key = ?", (key,))
+            db.execute("DELETE FROM cache_tags WHERE key = ?", (key,))
+
+    def incr(self, key, delta=1):
+        with self._transaction() as db:
+            db.execute("INSERT OR IGNORE INTO counters (key, value) VALUES (?, 0)", (key,))
+            db.execute("UPDATE counters SET value = value + ? WHERE key = ?", (delta, key))
+            return db.execute("SELECT value FROM counters WHERE key = ?", (key,)).fetchone()[0]
+
+    def get_counter(self, key):
+        row = self._connection().execute("SELECT value FROM counters WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else 0
+
+    def set_counter(self, key, value):
+        with self._transaction() as db:
+            db.execute("INSERT OR REPLACE INTO counters (key, value) VALUES (?, ?)", (key, int(value)))
+
+    def invalidate_tags(self, *tags):
+        if not tags:
+            return
+        marks = ", ".join("?" for _ in tags)
+        with self._transaction() as db:
+            db.execute(f"DELETE FROM cache WHERE key IN (SELECT key FROM cache_tags WHERE tag IN ({marks}))", tags)
+            db.execute(f"DELETE FROM cache_tags WHERE key NOT IN (SELECT key FROM cache)")
+
+    def clear(self):
+        with self._transaction() as db:
+            db.execute("DELETE FROM cache")
+            db.execute("DELETE FROM cache_tags")
+
+    def purge(self):
+        """Borrar las entradas caducadas y, si sobran, las que caducan antes"""
+        with self._transaction() as db:
+            db.execute("DELETE FROM cache WHERE expires IS NOT NULL AND expires <= ?", (time.time(),))
+            db.execute("""
+                DELETE FROM cache WHERE key IN (
+                    SELECT key FROM cache ORDER BY COALESCE(expires, 1e18) LIMIT MAX(0, (SELECT COUNT(*) FROM cache) - ?)
+                )""", (self.max_entries,))
+            db.execute("DELETE FROM cache_tags WHERE key NOT IN (SELECT key FROM cache)")
+
+    def _acquire(self, key, ttl):
+        token = os.urandom(8).hex()
+        now = time.time()
+        with self._transaction() as db:
+            db.execute("DELETE FROM locks WHERE key = ? AND expires <= ?", (key, now))
+            cursor = db.execute("INSERT OR IGNORE INTO locks (key, token, expires) VALUES (?, ?, ?)", (key, token, now + ttl))
+            return token if cursor.rowcount == 1 else None
+
+    def _release(self, key, token):
+        with self._transaction() as db:
+            db.execute("DELETE FROM locks WHERE key = ? AND token = ?", (key, token))
+
+
+class RedisCache(CacheBackend):
+    """Adaptador para Redis (o cualquier servidor con su protocolo).
+
+    El paquete ``redis`` solo se importa al crear el backend sin ``client``;
+    se puede pasar cualquier cliente compatible con redis-py (p. ej. un
+    sustituto local en pruebas).
+    """
+
+    name = 'redis'
+
+    def __init__(self, url=None, client=None, prefix=None):
+        self.prefix = Config.CACHE_KEY_PREFIX if prefix is None else prefix
+        if client is None:
+            try:
+                import redis
+            except ImportError as e:
+                raise RuntimeError("CACHE_BACKEND=redis necesita el paquete 'redis' (pip install redis)") from e
+            client = redis.Redis.from_url(url or Config.CACHE_REDIS_URL)
+        self.client = client
+
+    def _key(self, key):
+        return f"{self.prefix}{key}"
+
+    def _tag_key(self, tag):
+        return f"{self.prefix}tag:{tag}"
+
+    def get(self, key, default=None):
+        raw = self.client.get(self._key(key))
+        return default if raw is None else pickle.loads(raw)
+
+    def set(self, key, value, ttl=None, tags=()):
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        ttl_ms = max(1, int(ttl * 1000)) if ttl else None
+        tag_keys = [self._tag_key(tag) for tag in tags]
+        remaining = []
+        if tag_keys and ttl_ms:
+            # Lo que le queda a cada etiqueta (-1: sin caducidad, -2: no existe)
+            pipe = self.client.pipeline()
+            for tag_key in tag_keys:
+                pipe.pttl(tag_key)
+            remaining = pipe.execute()
+
+        pipe = self.client.pipeline()
+        if ttl_ms:
+            pipe.set(self._key(key), payload, px=ttl_ms)
+        else:
+            pipe.set(self._key(key), payload)
+        for i, tag_key in enumerate(tag_keys):
+            pipe.sadd(tag_key, key)
+            # La etiqueta vive lo que su entrada más duradera: caduca con ellas
+            # en vez de acumular claves ya desaparecidas
+            if ttl_ms is None:
+                pipe.persist(tag_key)
+            elif remaining[i] != -1 and remaining[i] < ttl_ms:
+                pipe.pexpire(tag_key, ttl_ms)
+        pipe.execute()
+
+    def delete(self, key):
+        self.client.delete(self._key(key))
+
+    def incr(self, key, delta=1):
+        return int(self.client.incrby(self._key(f"counter:{key}"), delta))
+
+    def get_counter(self, key):
+        raw = self.client.get(self._key(f"counter:{key}"))
+        return int(raw) if raw is not None else 0
+
+    def set_counter(self, key, value):
+        self.client.set(self._key(f"counter:{key}"), int(value))
+
+    def invalidate_tags(self, *tags):
+        for tag in tags:
+            tag_key = self._tag_key(tag)
+            keys = [self._key(k.decode() if isinstance(k, bytes) else k) for k in self.client.smembers(tag_key)]
+            pipe = self.client.pipeline()
+            if keys:
+                pipe.delete(*keys)
+            pipe.delete(tag_key)
+            pipe.execute()
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=f"{self.prefix}*"))
+        if keys:
+            self.client.delete(*keys)
+
+    def _acquire(self, key, ttl):
+        token = os.urandom(8).hex()
+        acquired = self.client.set(self._key(f"lock:{key}"), token, nx=True, px=max(1, int(ttl * 1000)))
+        return token if acquired else None
+
+    def _release(self, key, token):
+        lock_key = self._key(f"lock:{key}")
+        current = self.client.get(lock_key)
+        if current is not None and (current.decode() if isinstance(current, bytes) else current) == token:
+            self.client.delete(lock_key)
+
+
+BACKENDS = {
+    MemoryCache.name: MemoryCache,
+    SQLiteCache.name: SQLiteCache,
+    RedisCache.name: RedisCache,
+}
+
+
+def create_cache(backend=None):
+    """Crear el backend indicado (por defecto ``Config.CACHE_BACKEND``)"""
+    backend = (backend or Config.CACHE_BACKEND).lower()
+    try:
+        cls = BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"CACHE_BACKEND desconocido: {backend!r} (opciones: {', '.join(BACKENDS)})")
+    return cls()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Caché compartido por todas las capas de caché de la aplicación"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = create_cache()
+                print(f"🗃️ Caché de la aplicación: {_cache.name}")
+    return _cache
+
+
+def reset_after_fork():
+    """Rehacer el estado propio del proceso tras un fork (post_fork de gunicorn).
+
+    Los backends ya lo detectan solos en el siguiente uso; esto solo evita que
+    el worker herede un lock tomado en el padre.
+    """
+    global _cache_lock
+    _cache_lock = threading.Lock()
+    if isinstance(_cache, MemoryCache):
+        _cache._check_fork()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=reset_after_fork)
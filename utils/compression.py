@@ -0,0 +1,88 @@
+import gzip
+
+from flask import request
+
+from config import Config
+
+try:
+    import brotli
+except ImportError:
+    # Opcional: sin el paquete solo se negocia gzip
+    brotli = None
+
+
+# Tipos que merece la pena comprimir (imágenes, fuentes, etc. ya van comprimidos)
+COMPRESSIBLE_MIMETYPES = {
+    'text/html', 'text/css', 'text/plain', 'text/javascript', 'text/csv',
+    'application/json', 'application/javascript', 'image/svg+xml',
+}
+
+
+def choose_encoding(accept_encodings):
+    """Codificación a usar según ``Accept-Encoding`` (``br``, ``gzip`` o None).
+
+    A igual calidad se prefiere brotli (más pequeño) si está instalado.
+    """
+    candidates = []
+    if brotli is not None and Config.COMPRESSION_BROTLI:
+        candidates.append(('br', 1))
+    candidates.append(('gzip', 0))
+    best = None
+    for encoding, preference in candidates:
+        quality = accept_encodings[encoding]
+        if quality > 0 and (best is None or (quality, preference) > best[0]):
+            best = ((quality, preference), encoding)
+    return best[1] if best else None
+
+
+def compress(data, encoding, level=None):
+    """Comprimir ``data`` (bytes) con ``gzip`` o ``br``"""
+    if encoding == 'br':
+        return brotli.compress(data, quality=Config.BROTLI_QUALITY if level is None else level)
+    # mtime=0: el mismo cuerpo comprime siempre igual
+    return gzip.compress(data, compresslevel=Config.GZIP_LEVEL if level is None else level, mtime=0)
+
+
+def compress_response(response):
+    """Comprimir la respuesta si el cliente lo acepta y compensa.
+
+    No se tocan las respuestas en streaming o de ficheros (``direct_passthrough``),
+    las que ya traen ``Content-Encoding``, las de tipos no comprimibles ni las
+    menores de ``COMPRESSION_MIN_SIZE`` bytes.
+    """
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return response
+    # La representación depende de Accept-Encoding aunque esta vez no se comprima
+    response.vary.add('Accept-Encoding')
+
+    if (response.status_code < 200 or response.status_code in (204, 206, 304)
+            or response.is_streamed or response.direct_passthrough
+            or 'Content-Encoding' in response.headers
+            or request.method == 'HEAD'):
+        return response
+
+    encoding = choose_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+
+    data = response.get_data()
+    if len(data) < Config.COMPRESSION_MIN_SIZE:
+        return response
+
+    response.set_data(compress(data, encoding))
+    response.headers['Content-Encoding'] = encoding
+    # Los bytes cambian: un ETag fuerte ya no identifica este cuerpo
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_app(app):
+    """Registrar la compresión de respuestas (gzip / brotli) en ``after_request``"""
+    if not Config.COMPRESSION:
+        return
+
+    @app.after_request
+    def compress_after_request(response):
+        return compress_response(response)
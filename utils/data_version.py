@@ -0,0 +1,103 @@
+import hashlib
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+from utils.cache import get_cache
+from utils.database import Database
+
+
+class UserDataVersions:
+    """Versión de los datos de cada usuario, compartida por todos los workers.
+
+    Todas las escrituras de gastos, ingresos, presupuestos y ahorros llaman a
+    ``touch(usuario_id)``. La versión sirve para invalidar cachés por usuario
+    (``models.user_summary``) y para las respuestas condicionales de las APIs
+    (``utils.http_cache``).
+
+    - Las versiones son contadores atómicos del caché de la aplicación
+      (``utils.cache``): con un backend compartido, una escritura en un worker
+      invalida lo que tengan los demás.
+    - ``touch`` sube la versión al escribir y otra vez tras el commit: una
+      lectura que se cuele entre ambos momentos queda con una versión vieja.
+    - ``epoch`` identifica al almacén de los contadores: si se pierden (caché
+      en memoria y reinicio) las versiones vuelven a empezar, pero los ETag no
+      coinciden con los anteriores.
+    """
+
+    GLOBAL = 'version:global'   # cambios que afectan a todos (p. ej. categorías)
+
+    def __init__(self, cache=None):
+        self.cache = cache or get_cache()
+
+    @staticmethod
+    def _version_key(usuario_id):
+        return f"version:usuario:{usuario_id}"
+
+    @staticmethod
+    def _modified_key(usuario_id):
+        return f"modificado:usuario:{usuario_id}"
+
+    def _origin(self):
+        """Epoch y momento de arranque del almacén de contadores"""
+        return self.cache.get_or_set('version:origen', lambda: {
+            'epoch': os.urandom(8).hex(),
+            'inicio': int(time.time()),
+        })
+
+    @property
+    def epoch(self):
+        return self._origin()['epoch']
+
+    @property
+    def started_at(self):
+        return datetime.fromtimestamp(self._origin()['inicio'], timezone.utc)
+
+    def version(self, usuario_id):
+        """Versión actual de los datos del usuario"""
+        return self.cache.get_counter(self._version_key(usuario_id))
+
+    def last_modified(self, usuario_id):
+        """Momento de la última escritura conocida (o del arranque del almacén)"""
+        timestamp = max(
+            self.cache.get_counter(self._modified_key(usuario_id)),
+            self.cache.get_counter(self.GLOBAL + ':modificado'),
+            self._origin()['inicio'],
+        )
+        return datetime.fromtimestamp(timestamp, timezone.utc)
+
+    def etag(self, usuario_id, *parts):
+        """ETag de una respuesta del usuario: versión de sus datos más ``parts``
+        (ruta y parámetros, que distinguen respuestas de la misma versión)"""
+        global_version = self.cache.get_counter(self.GLOBAL)
+        key = "|".join(str(part) for part in (self.epoch, global_version, usuario_id, self.version(usuario_id), *parts))
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()[:20]
+
+    def touch(self, usuario_id):
+        """Marcar que los datos del usuario cambian (ahora y al confirmar)"""
+        self._bump(usuario_id)
+        Database().on_commit(lambda: self._bump(usuario_id))
+
+    def touch_all(self):
+        """Marcar un cambio que afecta a los datos de todos los usuarios"""
+        self.cache.incr(self.GLOBAL)
+        self.cache.set_counter(self.GLOBAL + ':modificado', int(time.time()))
+
+    def _bump(self, usuario_id):
+        self.cache.incr(self._version_key(usuario_id))
+        self.cache.set_counter(self._modified_key(usuario_id), int(time.time()))
+
+
+_versions = None
+_versions_lock = threading.Lock()
+
+
+def get_data_versions():
+    """Versiones de datos por usuario compartidas por el proceso"""
+    global _versions
+    if _versions is None:
+        with _versions_lock:
+            if _versions is None:
+                _versions = UserDataVersions()
+    return _versions
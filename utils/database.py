@@ -1,17 +1,504 @@
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
 import pymysql
+from pymysql.constants import CLIENT
+from flask import g, has_request_context, request, session as user_session
 from config import Config
-import socket
+from utils.timing import record_pool_wait, record_query
 
-class Database:
-    def get_connection(self):
-        """Obtener conexión a la base de datos con SSL corregido"""
-        
-        # Mostrar entorno actual
-        if Config.IS_RAILWAY:
-            print("🟢 Database: Conectando a Railway MySQL")
+
+class TimedDictCursor(pymysql.cursors.DictCursor):
+    """DictCursor que suma cada sentencia al tiempo de base de datos de la
+    petición en curso (``utils.timing``), también las de cursores abiertos a mano"""
+
+    def execute(self, query, args=None):
+        start = time.perf_counter()
+        try:
+            return super().execute(query, args)
+        finally:
+            record_query(time.perf_counter() - start)
+
+    def nextset(self):
+        # Siguiente resultado de un multi-statement (execute_batch): otra sentencia
+        start = time.perf_counter()
+        has_next = super().nextset()
+        record_query(time.perf_counter() - start, count=1 if has_next else 0)
+        return has_next
+
+
+class PoolTimeout(Exception):
+    """No se obtuvo una conexión libre del pool dentro del tiempo de espera"""
+
+
+class TransactionAborted(Exception):
+    """La transacción de la unidad de trabajo se perdió antes del commit"""
+
+
+# Errores tras los que la transacción ya no existe en el servidor: interbloqueo
+# (InnoDB la revierte entera) y conexión perdida
+TRANSACTION_ABORTING_ERRORS = {1213, 2006, 2013}
+
+
+def aborts_transaction(error):
+    """True si ``error`` deja sin transacción la conexión donde ocurrió"""
+    return (isinstance(error, pymysql.err.MySQLError) and bool(error.args)
+            and error.args[0] in TRANSACTION_ABORTING_ERRORS)
+
+
+class ConnectionPool:
+    """Pool de conexiones acotado y seguro entre hilos.
+
+    - Mantiene entre ``min_size`` y ``max_size`` conexiones abiertas.
+    - Hace ping a las conexiones que llevan ``ping_interval`` segundos sin usarse.
+    - Cierra conexiones ociosas más de ``max_idle`` segundos (respetando el mínimo)
+      y las que superan ``max_lifetime`` segundos de vida.
+    - Tras un ``fork`` (gunicorn --preload) el hijo descarta las conexiones heredadas.
+    """
+
+    def __init__(self, factory, min_size=1, max_size=10, timeout=10,
+                 max_idle=300, max_lifetime=3600, ping_interval=30):
+        if max_size < 1:
+            raise ValueError("max_size debe ser al menos 1")
+        self.factory = factory
+        self.min_size = max(0, min(min_size, max_size))
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.ping_interval = ping_interval
+        self._init_state()
+
+    def _init_state(self):
+        self._pid = os.getpid()
+        self._cond = threading.Condition(threading.Lock())
+        self._idle = deque()    # (conexion, creada, ultimo_uso)
+        self._in_use = {}       # id(conexion) -> creada
+        self._size = 0          # conexiones abiertas (ociosas + en uso)
+        self._waiting = 0
+        self._stats = {
+            'checkouts': 0,
+            'timeouts': 0,
+            'wait_time_total': 0.0,
+            'wait_time_max': 0.0,
+            'created': 0,
+            'closed': 0,
+            'ping_failures': 0,
+            'evicted_idle': 0,
+            'evicted_lifetime': 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Checkout / checkin
+    # ------------------------------------------------------------------
+    def acquire(self):
+        """Obtener una conexión viva del pool (bloquea hasta ``timeout``)"""
+        self._check_fork()
+        start = time.monotonic()
+        deadline = start + self.timeout
+        entry = None
+        expired = []
+
+        with self._cond:
+            while True:
+                expired.extend(self._evict_idle_locked(time.monotonic()))
+                if self._idle:
+                    # LIFO: reutilizar la conexión usada más recientemente
+                    entry = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats['timeouts'] += 1
+                    raise PoolTimeout(
+                        f"Pool agotado: {self.max_size} conexiones en uso tras {self.timeout}s de espera"
+                    )
+                self._waiting += 1
+                try:
+                    self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+
+        waited = time.monotonic() - start
+        record_pool_wait(waited)
+        for stale in expired:
+            self._close(stale)
+        if entry is None:
+            connection, created = self._open_reserved()
         else:
-            print("🔵 Database: Conectando a Local MySQL")
-        
+            connection, created = self._validate(entry)
+
+        with self._cond:
+            self._in_use[id(connection)] = created
+            self._stats['checkouts'] += 1
+            self._stats['wait_time_total'] += waited
+            if waited > self._stats['wait_time_max']:
+                self._stats['wait_time_max'] = waited
+        return connection
+
+    def release(self, connection, discard=False):
+        """Devolver una conexión al pool (o cerrarla si ``discard``)"""
+        if os.getpid() != self._pid:
+            # Conexión heredada de otro proceso: no es nuestra
+            return
+        now = time.monotonic()
+        with self._cond:
+            created = self._in_use.pop(id(connection), None)
+            if created is None:
+                return
+            expired = now - created >= self.max_lifetime
+            if discard or expired or not connection.open:
+                if expired:
+                    self._stats['evicted_lifetime'] += 1
+                self._size -= 1
+                self._cond.notify()
+                to_close = connection
+            else:
+                self._idle.append((connection, created, now))
+                self._cond.notify()
+                to_close = None
+        if to_close is not None:
+            self._close(to_close)
+
+    @contextmanager
+    def connection(self):
+        """Context manager: toma una conexión y la devuelve al salir"""
+        connection = self.acquire()
+        discard = False
+        try:
+            yield connection
+        except pymysql.OperationalError:
+            discard = True
+            raise
+        finally:
+            self.release(connection, discard=discard)
+
+    # ------------------------------------------------------------------
+    # Mantenimiento
+    # ------------------------------------------------------------------
+    def fill(self):
+        """Abrir conexiones hasta ``min_size`` (calentamiento)"""
+        self._check_fork()
+        while True:
+            with self._cond:
+                if self._size >= self.min_size:
+                    return
+                self._size += 1
+            connection, created = self._open_reserved()
+            with self._cond:
+                self._idle.appendleft((connection, created, time.monotonic()))
+                self._cond.notify()
+
+    def close_all(self):
+        """Cerrar todas las conexiones ociosas"""
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for connection, _, _ in idle:
+            self._close(connection)
+
+    def reset_after_fork(self):
+        """Descartar el estado heredado del proceso padre sin tocar sus sockets"""
+        self._init_state()
+
+    def stats(self):
+        """Estadísticas del pool"""
+        with self._cond:
+            stats = dict(self._stats)
+            stats.update({
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': len(self._in_use),
+                'waiting': self._waiting,
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+            })
+        checkouts = stats['checkouts']
+        stats['wait_time_avg'] = stats['wait_time_total'] / checkouts if checkouts else 0.0
+        return stats
+
+    # ------------------------------------------------------------------
+    # Internos
+    # ------------------------------------------------------------------
+    def _check_fork(self):
+        if os.getpid() != self._pid:
+            self.reset_after_fork()
+
+    def _open_reserved(self):
+        """Abrir una conexión para un hueco ya reservado en ``_size``"""
+        try:
+            connection = self.factory()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._stats['created'] += 1
+        return connection, time.monotonic()
+
+    def _validate(self, entry):
+        """Comprobar vida útil y hacer ping a una conexión ociosa"""
+        connection, created, last_used = entry
+        now = time.monotonic()
+        if now - created >= self.max_lifetime:
+            with self._cond:
+                self._stats['evicted_lifetime'] += 1
+            self._close(connection)
+            return self._open_reserved()
+        if now - last_used >= self.ping_interval:
+            try:
+                connection.ping(reconnect=False)
+            except Exception:
+                with self._cond:
+                    self._stats['ping_failures'] += 1
+                self._close(connection)
+                return self._open_reserved()
+        return connection, created
+
+    def _evict_idle_locked(self, now):
+        """Sacar del pool las conexiones ociosas demasiado tiempo (con el lock tomado).
+
+        Devuelve las conexiones a cerrar; se cierran fuera del lock.
+        """
+        expired = []
+        # Las más antiguas están a la izquierda
+        while self._idle and self._size > self.min_size:
+            connection, created, last_used = self._idle[0]
+            if now - last_used < self.max_idle and now - created < self.max_lifetime:
+                break
+            self._idle.popleft()
+            self._size -= 1
+            if now - created >= self.max_lifetime:
+                self._stats['evicted_lifetime'] += 1
+            else:
+                self._stats['evicted_idle'] += 1
+            expired.append(connection)
+        return expired
+
+    def _close(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._stats['closed'] += 1
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Pool compartido por todas las instancias de ``Database`` del proceso"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    Database.get_connection,
+                    min_size=Config.DB_POOL_MIN_SIZE,
+                    max_size=Config.DB_POOL_MAX_SIZE,
+                    timeout=Config.DB_POOL_TIMEOUT,
+                    max_idle=Config.DB_POOL_MAX_IDLE,
+                    max_lifetime=Config.DB_POOL_MAX_LIFETIME,
+                    ping_interval=Config.DB_POOL_PING_INTERVAL,
+                )
+    return _pool
+
+
+def _reset_pool_after_fork():
+    global _pool_lock
+    _pool_lock = threading.Lock()
+    if _pool is not None:
+        _pool.reset_after_fork()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_pool_after_fork)
+
+
+class RequestSession:
+    """Unidad de trabajo de una petición HTTP: una conexión y una transacción.
+
+    La conexión se pide al pool la primera vez que un modelo la necesita y se
+    confirma en ``after_request``, antes de enviar la respuesta (o se revierte si
+    la vista falló). ``failed`` marca que la transacción ya se perdió en el
+    servidor (``aborts_transaction``): el commit falla en lugar de confirmar
+    solo lo que vino después.
+    """
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.connection = None
+        self.failed = False
+        self._savepoints = 0
+        # Lecturas memoizadas con utils.memo.request_memoized
+        self.memo = {}
+        self.memo_stats = {}      # 'Clase.metodo' -> [aciertos, fallos]
+        self.memo_generation = 0  # cambia con cada escritura
+        self._on_commit = []
+
+    def on_commit(self, callback):
+        """Ejecutar ``callback`` cuando la transacción se confirme (se descarta si se revierte)"""
+        self._on_commit.append(callback)
+
+    def invalidate_memo(self):
+        """Olvidar las lecturas memoizadas (tras una escritura en esta sesión)"""
+        self.memo.clear()
+        self.memo_generation += 1
+
+    def memo_report(self):
+        """Resumen de aciertos y fallos de la memoización (None si no hubo lecturas)"""
+        if not self.memo_stats:
+            return None
+        hits = sum(counters[0] for counters in self.memo_stats.values())
+        misses = sum(counters[1] for counters in self.memo_stats.values())
+        detail = ", ".join(
+            f"{name} {counters[0]}/{counters[1]}"
+            for name, counters in sorted(self.memo_stats.items(), key=lambda item: -item[1][0])
+        )
+        return f"{hits} aciertos, {misses} fallos ({detail})"
+
+    def get_connection(self):
+        if self.connection is None:
+            connection = self.pool.acquire()
+            try:
+                connection.begin()
+            except Exception:
+                self.pool.release(connection, discard=True)
+                raise
+            self.connection = connection
+        return self.connection
+
+    def savepoint(self):
+        """Abrir un punto de guardado (``transaction()`` anidado) y devolver su nombre"""
+        self._savepoints += 1
+        name = f"sp_{self._savepoints}"
+        with self.get_connection().cursor() as cursor:
+            cursor.execute(f"SAVEPOINT {name}")
+        return name
+
+    def rollback_to(self, name):
+        """Deshacer lo escrito desde el punto de guardado ``name``"""
+        self.invalidate_memo()
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute(f"ROLLBACK TO SAVEPOINT {name}")
+        except Exception as e:
+            # Sin el punto de guardado (interbloqueo, conexión caída) no queda nada que confirmar
+            self.failed = True
+            print(f"❌ Error volviendo al punto de guardado {name}: {e}")
+
+    def release(self, name):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"RELEASE SAVEPOINT {name}")
+
+    def close(self, commit=True, raise_errors=False):
+        """Confirmar o revertir la transacción y devolver la conexión al pool"""
+        connection, self.connection = self.connection, None
+        callbacks, self._on_commit = self._on_commit, []
+        if connection is None:
+            return
+        discard = False
+        committed = False
+        try:
+            if commit and self.failed:
+                raise TransactionAborted("La transacción se perdió por un error anterior; no se confirma nada")
+            if commit:
+                connection.commit()
+                committed = True
+            else:
+                connection.rollback()
+        except Exception as e:
+            discard = True
+            print(f"❌ Error cerrando la transacción de la petición: {e}")
+            try:
+                connection.rollback()
+            except Exception:
+                pass
+            if raise_errors:
+                raise
+        finally:
+            self.pool.release(connection, discard=discard)
+
+        if committed:
+            for callback in callbacks:
+                try:
+                    callback()
+                except Exception as e:
+                    print(f"❌ Error tras confirmar la transacción: {e}")
+
+
+_local = threading.local()
+
+
+def current_session():
+    """Unidad de trabajo activa: la de ``Database.transaction()`` en este hilo o la
+    de la petición en curso (None si no hay ninguna)"""
+    session = getattr(_local, 'session', None)
+    if session is not None:
+        return session
+    if not Config.DB_REQUEST_SESSION or not has_request_context():
+        return None
+    session = g.get('_db_session')
+    if session is None:
+        session = g._db_session = RequestSession(get_pool())
+    return session
+
+
+def init_app(app):
+    """Confirmar la sesión de base de datos de cada petición antes de enviar la respuesta.
+
+    - ``after_request``: commit si la respuesta no es un error 5xx (si lo es,
+      rollback). Si el commit falla (interbloqueo, espera de bloqueo, conexión
+      caída) la excepción sigue su curso y el usuario recibe un 500 en vez del
+      "guardado" que preparó la vista; sus mensajes flash se descartan.
+    - ``teardown_request``: red de seguridad si ``after_request`` no llegó a
+      correr (excepción no capturada en la vista u otro hook): rollback.
+    """
+    def report_memo(session):
+        if app.debug or Config.REQUEST_MEMO_DEBUG:
+            report = session.memo_report()
+            if report:
+                print(f"🧠 Memo {request.method} {request.path}: {report}")
+
+    @app.after_request
+    def commit_db_session(response):
+        session = g.pop('_db_session', None)
+        if session is None:
+            return response
+        report_memo(session)
+        if response.status_code >= 500:
+            session.close(commit=False)
+            return response
+        try:
+            session.close(commit=True, raise_errors=True)
+        except Exception:
+            # Los avisos de "guardado" de la vista ya no son ciertos
+            user_session.pop('_flashes', None)
+            raise
+        return response
+
+    @app.teardown_request
+    def close_db_session(exc):
+        session = g.pop('_db_session', None)
+        if session is not None:
+            report_memo(session)
+            session.close(commit=exc is None)
+
+
+class Database:
+    @staticmethod
+    def get_connection():
+        """Abrir una conexión física nueva a la base de datos (la usa el pool)"""
         connection_config = {
             'host': Config.MYSQL_HOST,
             'user': Config.MYSQL_USER,
@@ -19,18 +506,22 @@ class Database:
             'database': Config.MYSQL_DB,
             'port': Config.MYSQL_PORT,
             'charset': 'utf8mb4',
-            'cursorclass': pymysql.cursors.DictCursor,
+            'cursorclass': TimedDictCursor,
             'connect_timeout': 10,
             'read_timeout': 10,
             'write_timeout': 10,
+            # Con el pool cada sentencia suelta se confirma sola; así una conexión
+            # reutilizada nunca arrastra una vista de lectura antigua
+            'autocommit': True,
+            # Permite enviar varias lecturas en un solo viaje (execute_batch)
+            'client_flag': CLIENT.MULTI_STATEMENTS,
         }
-        
+
         # ✅ CONFIGURACIÓN SSL CORREGIDA PARA RAILWAY
         if Config.IS_RAILWAY:
             # Opción 1: Probar sin SSL primero (más probable que funcione)
             connection_config['ssl'] = False
-            print("   🔓 SSL deshabilitado - Modo seguro")
-            
+
             # Opción 2: Si necesitas SSL, usa esta configuración
             # connection_config['ssl'] = {
             #     'ssl': True,
@@ -38,97 +529,202 @@ class Database:
             #     'ssl_verify_cert': False,
             #     'ssl_verify_identity': False
             # }
-            # print("   🔐 SSL con verificación deshabilitada")
-        
+
         try:
-            # ✅ PRIMERO: Verificar conectividad básica
-            print(f"   🔍 Probando conectividad a {Config.MYSQL_HOST}:{Config.MYSQL_PORT}...")
-            sock = socket.create_connection((Config.MYSQL_HOST, Config.MYSQL_PORT), timeout=10)
-            sock.close()
-            print("   ✅ Conectividad OK - Puerto accesible")
-            
-            # ✅ SEGUNDO: Intentar conexión MySQL
-            print("   🔌 Estableciendo conexión MySQL...")
-            start_time = socket.time() if hasattr(socket, 'time') else __import__('time').time()
-            
-            connection = pymysql.connect(**connection_config)
-            
-            end_time = socket.time() if hasattr(socket, 'time') else __import__('time').time()
-            connection_time = end_time - start_time
-            
-            print(f"   ✅ Conexión MySQL exitosa ({connection_time:.2f}s)")
-            return connection
-            
-        except socket.timeout:
-            error_msg = f"❌ Timeout: No se puede conectar a {Config.MYSQL_HOST}:{Config.MYSQL_PORT}"
-            print(error_msg)
-            raise Exception(error_msg)
-        except socket.gaierror as e:
-            error_msg = f"❌ Error DNS: No se puede resolver {Config.MYSQL_HOST}"
-            print(error_msg)
-            raise Exception(error_msg)
+            return pymysql.connect(**connection_config)
         except pymysql.OperationalError as e:
             error_code, error_msg = e.args
             print(f"❌ Error operacional MySQL [{error_code}]: {error_msg}")
-            
+
             # Si es error de SSL, sugerir solución
             if "SSL" in str(e).upper() or "TLS" in str(e).upper():
                 print("💡 SOLUCIÓN: El problema es SSL. Se ha deshabilitado automáticamente.")
-            
+
             raise e
         except Exception as e:
             print(f"❌ Error de conexión MySQL: {e}")
             print(f"💡 Tipo de error: {type(e).__name__}")
             raise e
 
+    @property
+    def pool(self):
+        return get_pool()
+
+    def connection(self):
+        """Context manager con una conexión del pool"""
+        return self.pool.connection()
+
     def execute_query(self, query, params=None, fetch=False, fetch_one=False):
-        """Ejecutar consulta en la base de datos con manejo mejorado de errores"""
-        connection = self.get_connection()
+        """Ejecutar consulta en la base de datos con manejo mejorado de errores.
+
+        Dentro de una petición se usa la conexión y la transacción de la sesión
+        de la petición; fuera de ella cada consulta toma su propia conexión del pool.
+        """
+        session = current_session()
+        if session is not None:
+            connection = session.get_connection()
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute(query, params or ())
+
+                    if fetch:
+                        return cursor.fetchall()
+                    if fetch_one:
+                        return cursor.fetchone()
+                    # Escritura: las lecturas memoizadas de la sesión ya no valen
+                    session.invalidate_memo()
+                    # El commit lo hace el after_request de init_app
+                    return cursor.lastrowid
+            except Exception as e:
+                if aborts_transaction(e):
+                    session.failed = True
+                print(f"❌ Error en consulta: {e}")
+                raise e
+
+        with self.connection() as connection:
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute(query, params or ())
+
+                    if fetch:
+                        result = cursor.fetchall()
+                    elif fetch_one:
+                        result = cursor.fetchone()
+                    else:
+                        result = cursor.lastrowid
+                        connection.commit()
+
+                    return result
+            except Exception as e:
+                connection.rollback()
+                print(f"❌ Error en consulta: {e}")
+                raise e
+
+    @contextmanager
+    def transaction(self):
+        """Agrupar varias escrituras en una sola transacción.
+
+        Dentro de una petición (o de otra ``transaction()``) se une a la unidad de
+        trabajo existente con un punto de guardado: si el bloque lanza una
+        excepción se deshace solo lo que escribió el bloque, y el resto de la
+        petición se confirma si el llamador la captura. Fuera de ella abre una
+        unidad propia en este hilo y la confirma al salir del bloque (o la
+        revierte si hubo una excepción).
+        """
+        outer = current_session()
+        if outer is not None:
+            savepoint = outer.savepoint()
+            try:
+                yield
+            except BaseException:
+                outer.rollback_to(savepoint)
+                raise
+            outer.release(savepoint)
+            return
+
+        session = RequestSession(self.pool)
+        _local.session = session
         try:
-            with connection.cursor() as cursor:
-                cursor.execute(query, params or ())
-                
-                if fetch:
-                    result = cursor.fetchall()
-                elif fetch_one:
-                    result = cursor.fetchone()
-                else:
-                    result = cursor.lastrowid
-                    connection.commit()
-                
-                return result
-        except Exception as e:
-            connection.rollback()
-            print(f"❌ Error en consulta: {e}")
-            raise e
+            yield
+        except BaseException:
+            session.close(commit=False)
+            raise
+        else:
+            session.close(commit=True, raise_errors=True)
         finally:
-            connection.close()
+            _local.session = None
+
+    def on_commit(self, callback):
+        """Ejecutar ``callback`` tras confirmar la unidad de trabajo activa
+        (o ya mismo si no hay ninguna: cada sentencia suelta se confirma sola)"""
+        session = current_session()
+        if session is not None:
+            session.on_commit(callback)
+        else:
+            callback()
+
+    def execute_batch(self, queries, fresh=False):
+        """Ejecutar varias lecturas en un solo viaje a la base de datos.
+
+        ``queries`` es una lista de ``(query, params)`` (o solo ``query``). Las
+        sentencias se envían juntas como multi-statement y se devuelve una lista
+        con el resultado (lista de filas) de cada una, en el mismo orden.
+
+        Con ``fresh=True`` se lee con una conexión propia del pool, fuera de la
+        transacción de la petición: se ve todo lo confirmado hasta este momento
+        aunque la petición abriera su vista de lectura antes.
+        """
+        if not queries:
+            return []
+
+        session = None if fresh else current_session()
+        if session is not None:
+            try:
+                return self._run_batch(session.get_connection(), queries)
+            except Exception as e:
+                if aborts_transaction(e):
+                    session.failed = True
+                print(f"❌ Error en lote de consultas: {e}")
+                raise e
+
+        with self.connection() as connection:
+            try:
+                return self._run_batch(connection, queries)
+            except Exception as e:
+                print(f"❌ Error en lote de consultas: {e}")
+                # Un multi-statement a medias deja resultados pendientes: no reutilizar
+                self.pool.release(connection, discard=True)
+                raise e
+
+    @staticmethod
+    def _run_batch(connection, queries):
+        with connection.cursor() as cursor:
+            statements = []
+            for item in queries:
+                query, params = (item, None) if isinstance(item, str) else item
+                statements.append(cursor.mogrify(query.strip().rstrip(';'), params))
+
+            cursor.execute(";\n".join(statements))
+            results = [list(cursor.fetchall())]
+            while cursor.nextset():
+                results.append(list(cursor.fetchall()))
+            return results
 
     def test_connection_quick(self):
         """Método rápido para testear conexión sin bloquear"""
         try:
-            conn = self.get_connection()
-            conn.close()
+            with self.connection() as connection:
+                connection.ping(reconnect=False)
             return True
         except Exception as e:
             print(f"❌ Test conexión rápida falló: {e}")
             return False
 
+    @staticmethod
+    def pool_stats():
+        """Estadísticas del pool de conexiones del proceso"""
+        return get_pool().stats()
+
+    @staticmethod
+    def reset_pool():
+        """Reiniciar el pool (p. ej. en el post_fork de gunicorn)"""
+        _reset_pool_after_fork()
+
     def get_database_size(self):
         """Obtener tamaño de la base de datos (si es posible)"""
         try:
             if not Config.IS_RAILWAY:
                 return "Solo disponible en Railway"
-                
+
             query = """
-            SELECT 
+            SELECT
                 table_schema as database_name,
                 ROUND(SUM(data_length + index_length) / 1024 / 1024, 2) as size_mb
-            FROM information_schema.tables 
+            FROM information_schema.tables
             WHERE table_schema = %s
             GROUP BY table_schema
             """
             result = self.execute_query(query, (Config.MYSQL_DB,), fetch_one=True)
             return f"{result['size_mb']} MB" if result else "No disponible"
         except:
-            return "No se pudo obtener"
\ No newline at end of file
+            return "No se pudo obtener"
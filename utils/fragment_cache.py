@@ -0,0 +1,127 @@
+import hashlib
+import threading
+
+from flask import g, has_request_context, session
+from jinja2 import nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+
+from config import Config
+from utils.cache import get_cache
+from utils.data_version import get_data_versions
+from utils.metrics import record_cache
+
+
+class FragmentCache:
+    """HTML ya renderizado de trozos de plantilla, por usuario.
+
+    - La clave lleva el usuario de la sesión (siempre, no depende de la
+      plantilla), el nombre del fragmento y las partes que pasa la plantilla:
+      la versión de datos del usuario y lo que cambie el contenido (mes,
+      cursor, día...). Cuando el usuario escribe, la versión cambia y el
+      fragmento se vuelve a renderizar; las entradas viejas caducan solas.
+    - Se guarda en el caché de la aplicación (``utils.cache``), así que con un
+      backend compartido lo aprovechan todos los workers.
+    - Si la vista no pudo cargar los datos (``skip_fragment_cache()``) el
+      fragmento se renderiza pero no se guarda.
+    """
+
+    def __init__(self, cache=None, ttl=None):
+        self.cache = cache or get_cache()
+        self.ttl = Config.FRAGMENT_CACHE_TTL if ttl is None else ttl
+        self._lock = threading.Lock()
+        self._stats = {}    # fragmento -> [aciertos, fallos]
+
+    def render(self, template_name, name, parts, caller):
+        """Fragmento guardado o, si no hay, ``caller()`` (que lo renderiza)"""
+        usuario_id = session.get('user_id') if has_request_context() else None
+        if not Config.FRAGMENT_CACHE or usuario_id is None or g.get('fragment_cache_skip'):
+            return caller()
+
+        digest = hashlib.sha1("|".join(str(part) for part in parts).encode('utf-8')).hexdigest()[:16]
+        key = f"fragmento:{usuario_id}:{template_name}:{name}:{digest}"
+        html = self.cache.get(key)
+        if html is not None:
+            self._count(name, 0)
+            return Markup(html)
+
+        self._count(name, 1)
+        html = caller()
+        # La vista puede marcar el error mientras se renderiza el propio fragmento
+        if not g.get('fragment_cache_skip'):
+            self.cache.set(key, str(html), ttl=self.ttl)
+        return html
+
+    def _count(self, name, index):
+        record_cache('fragmentos', index == 0)
+        with self._lock:
+            self._stats.setdefault(name, [0, 0])[index] += 1
+
+    def stats(self):
+        """Aciertos, fallos y tasa de aciertos del proceso, en total y por fragmento"""
+        with self._lock:
+            snapshot = {name: list(counts) for name, counts in self._stats.items()}
+
+        def summary(hits, misses):
+            total = hits + misses
+            return {'aciertos': hits, 'fallos': misses, 'tasa_aciertos': round(hits / total, 3) if total else None}
+
+        return {
+            **summary(sum(c[0] for c in snapshot.values()), sum(c[1] for c in snapshot.values())),
+            'fragmentos': {name: summary(*counts) for name, counts in sorted(snapshot.items())},
+        }
+
+
+class FragmentCacheExtension(Extension):
+    """Etiqueta ``{% cache nombre, version, ... %}...{% endcache %}`` de Jinja.
+
+    El primer argumento nombra el fragmento y el resto forman su versión::
+
+        {% cache 'dashboard:ultimos_gastos', data_version %}
+            ...
+        {% endcache %}
+    """
+
+    tags = {'cache'}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        args = [parser.parse_expression()]
+        while parser.stream.skip_if('comma'):
+            args.append(parser.parse_expression())
+        body = parser.parse_statements(('name:endcache',), drop_needle=True)
+        call = self.call_method('_render', [nodes.Const(parser.name), args[0], nodes.List(args[1:])])
+        return nodes.CallBlock(call, [], [], body).set_lineno(lineno)
+
+    def _render(self, template_name, name, parts, caller):
+        return get_fragment_cache().render(template_name, name, parts, caller)
+
+
+def skip_fragment_cache():
+    """No guardar fragmentos en esta petición (datos incompletos por un error)"""
+    if has_request_context():
+        g.fragment_cache_skip = True
+
+
+def init_app(app):
+    """Registrar ``{% cache %}`` y la variable ``data_version`` de las plantillas"""
+    app.jinja_env.add_extension(FragmentCacheExtension)
+
+    @app.context_processor
+    def inject_data_version():
+        usuario_id = session.get('user_id')
+        return {'data_version': get_data_versions().etag(usuario_id) if usuario_id is not None else None}
+
+
+_fragments = None
+_fragments_lock = threading.Lock()
+
+
+def get_fragment_cache():
+    """Caché de fragmentos de plantilla compartido por el proceso"""
+    global _fragments
+    if _fragments is None:
+        with _fragments_lock:
+            if _fragments is None:
+                _fragments = FragmentCache()
+    return _fragments
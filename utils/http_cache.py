@@ -0,0 +1,88 @@
+import functools
+import inspect
+from datetime import datetime, timezone
+
+from flask import request, session, make_response
+
+from utils.data_version import get_data_versions
+from utils.metrics import record_cache
+
+
+def conditional_on_user_data(view):
+    """Respuestas condicionales (ETag / Last-Modified) para APIs JSON por usuario.
+
+    El ETag sale de la versión de datos del usuario, de la URL completa (ruta
+    y parámetros) y del día. Si el cliente envía ``If-None-Match`` con ese ETag
+    (o, sin él, un ``If-Modified-Since`` no anterior a la última escritura,
+    si esta no fue en el segundo en curso) se responde 304 sin ejecutar la
+    vista: ni consultas ni serialización.
+
+    La versión se lee antes de ejecutar la vista: si una escritura se confirma
+    mientras tanto, el siguiente sondeo ya lleva otro ETag y descarga los datos.
+
+    Sirve igual para vistas ``async`` (las APIs del servidor ASGI, ``asgi.py``).
+    """
+
+    if inspect.iscoroutinefunction(view):
+        @functools.wraps(view)
+        async def async_wrapper(*args, **kwargs):
+            usuario_id = session.get('user_id')
+            if usuario_id is None:
+                return await view(*args, **kwargs)
+            etag, last_modified, not_modified = _validators(usuario_id)
+            if not_modified:
+                return _mark(make_response('', 304), etag, last_modified)
+            response = make_response(await view(*args, **kwargs))
+            return _mark(response, etag, last_modified) if response.status_code == 200 else response
+
+        return async_wrapper
+
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        usuario_id = session.get('user_id')
+        if usuario_id is None:
+            return view(*args, **kwargs)
+        etag, last_modified, not_modified = _validators(usuario_id)
+        if not_modified:
+            return _mark(make_response('', 304), etag, last_modified)
+        response = make_response(view(*args, **kwargs))
+        return _mark(response, etag, last_modified) if response.status_code == 200 else response
+
+    return wrapper
+
+
+def _validators(usuario_id):
+    """ETag, Last-Modified y si la copia del cliente sigue valiendo"""
+    versions = get_data_versions()
+    # El día también cuenta: hay respuestas que dependen de la fecha actual
+    # (mes por defecto, días restantes de una meta)
+    today = datetime.now().astimezone()
+    day_start = today.replace(hour=0, minute=0, second=0, microsecond=0).astimezone(timezone.utc)
+    etag = versions.etag(usuario_id, request.full_path, today.date())
+    last_modified = max(versions.last_modified(usuario_id), day_start)
+
+    # Last-Modified tiene resolución de segundos: otra escritura en el segundo
+    # en curso no lo cambiaría. Entonces no se envía ni se atiende
+    # If-Modified-Since (queda el ETag)
+    if last_modified >= today.astimezone(timezone.utc).replace(microsecond=0):
+        last_modified = None
+
+    if request.if_none_match:
+        # El ETag manda: Last-Modified solo tiene resolución de segundos
+        not_modified = request.if_none_match.contains_weak(etag)
+    else:
+        since = request.if_modified_since
+        not_modified = since is not None and last_modified is not None and since >= last_modified
+    record_cache('etag', not_modified)
+    return etag, last_modified, not_modified
+
+
+def _mark(response, etag, last_modified):
+    # Débil: el cuerpo puede viajar comprimido o no con el mismo ETag
+    response.set_etag(etag, weak=True)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    # Solo para este usuario y siempre revalidando con el servidor
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
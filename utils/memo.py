@@ -0,0 +1,52 @@
+import copy
+import functools
+
+from config import Config
+from utils.database import current_session
+from utils.metrics import record_cache
+
+
+def request_memoized(method):
+    """Memoizar una lectura de modelo o controlador durante la unidad de trabajo.
+
+    - La clave es el método (``Clase.metodo``) y sus argumentos, sin ``self``:
+      dos instancias del mismo modelo comparten resultados.
+    - Los resultados viven en la sesión de base de datos activa (la de la
+      petición o la de ``Database.transaction()``); sin sesión no se memoiza.
+    - Cualquier escritura hecha con esa sesión vacía la memoria
+      (``Database.execute_query``), así una lectura posterior ve sus cambios.
+    - Se devuelve una copia: los llamadores pueden modificar filas (formatear
+      fechas, convertir Decimal) sin alterar lo memoizado.
+    - Argumentos no hashables (listas, dicts) ejecutan la lectura sin memoizar.
+    """
+    name = method.__qualname__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        session = current_session() if Config.REQUEST_MEMO else None
+        if session is None:
+            return method(self, *args, **kwargs)
+
+        key = (name, args, tuple(sorted(kwargs.items())))
+        try:
+            hit = key in session.memo
+        except TypeError:
+            return method(self, *args, **kwargs)
+
+        counters = session.memo_stats.setdefault(name, [0, 0])  # [aciertos, fallos]
+        record_cache('memo_peticion', hit)
+        if hit:
+            counters[0] += 1
+            return copy.deepcopy(session.memo[key])
+
+        counters[1] += 1
+        generation = session.memo_generation
+        result = method(self, *args, **kwargs)
+        # Si la propia lectura escribió (p. ej. sembrar una fila), no guardarla
+        if session.memo_generation == generation:
+            session.memo[key] = result
+            return copy.deepcopy(result)
+        return result
+
+    return wrapper
+
@@ -0,0 +1,243 @@
+import glob
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import Response, request
+
+from config import Config
+from utils import timing
+
+# Límites (segundos) de los histogramas
+REQUEST_BUCKETS = tuple(ms / 1000 for ms in timing.LATENCY_BUCKETS_MS)
+QUERY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+POOL_WAIT_BUCKETS = (0.0001, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10)
+BCRYPT_BUCKETS = (0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 2, 5)
+
+MULTIPROC_ENV = 'PROMETHEUS_MULTIPROC_DIR'
+
+
+class Metrics:
+    """Métricas de Prometheus del proceso.
+
+    - Peticiones (número y latencia por blueprint y ruta), consultas a MySQL,
+      esperas por conexión, cachés y bcrypt se anotan en el momento.
+    - El estado del pool y la memoria del worker se muestrean como mucho cada
+      ``METRICS_SAMPLE_INTERVAL`` segundos (al terminar una petición y al leer
+      ``/metrics``).
+    - Con ``PROMETHEUS_MULTIPROC_DIR`` (lo pone ``gunicorn.conf.py``) cada
+      worker escribe sus valores en ese directorio y ``/metrics`` devuelve la
+      suma de todos, la atienda el worker que la atienda.
+    """
+
+    def __init__(self):
+        # Importar aquí: prometheus_client lee PROMETHEUS_MULTIPROC_DIR al cargarse
+        import prometheus_client as prom
+
+        self.prom = prom
+        self.registry = prom.CollectorRegistry(auto_describe=True)
+        self.multiprocess = bool(os.environ.get(MULTIPROC_ENV))
+        self._sampled_at = 0.0
+        self._lock = threading.Lock()
+
+        def metric(cls, name, doc, labels=(), **kwargs):
+            return cls(f"presupuesto_{name}", doc, labels, registry=self.registry, **kwargs)
+
+        self.requests = metric(prom.Counter, 'http_requests', "Peticiones atendidas",
+                               ('blueprint', 'route', 'method', 'status'))
+        self.request_latency = metric(prom.Histogram, 'http_request_duration_seconds', "Duración de las peticiones",
+                                      ('blueprint', 'route', 'method'), buckets=REQUEST_BUCKETS)
+        self.queries = metric(prom.Counter, 'db_queries', "Sentencias enviadas a MySQL")
+        self.query_latency = metric(prom.Histogram, 'db_query_duration_seconds',
+                                    "Duración de cada viaje a MySQL", buckets=QUERY_BUCKETS)
+        self.pool_wait = metric(prom.Histogram, 'db_pool_wait_seconds',
+                                "Espera hasta obtener una conexión del pool", buckets=POOL_WAIT_BUCKETS)
+        self.pool_connections = metric(prom.Gauge, 'db_pool_connections', "Conexiones del pool por estado",
+                                       ('pool', 'state'), multiprocess_mode='livesum')
+        self.pool_max_size = metric(prom.Gauge, 'db_pool_max_size', "Tamaño máximo de los pools",
+                                    ('pool',), multiprocess_mode='livesum')
+        self.pool_waiting = metric(prom.Gauge, 'db_pool_waiting', "Hilos esperando conexión",
+                                   multiprocess_mode='livesum')
+        self.cache = metric(prom.Counter, 'cache_requests', "Consultas a cachés de la aplicación",
+                            ('cache', 'result'))
+        self.bcrypt = metric(prom.Histogram, 'bcrypt_duration_seconds', "Duración de bcrypt",
+                             ('operation',), buckets=BCRYPT_BUCKETS)
+        self.memory = metric(prom.Gauge, 'worker_memory_bytes', "Memoria residente de cada worker",
+                             multiprocess_mode='liveall')
+
+        timing.add_observer('query', self.observe_query)
+        timing.add_observer('pool_wait', self.pool_wait.observe)
+        timing.add_observer('request', self.observe_request)
+
+    # ------------------------------------------------------------------
+    # Anotaciones
+    # ------------------------------------------------------------------
+    def observe_query(self, seconds, count):
+        if count:
+            self.queries.inc(count)
+            self.query_latency.observe(seconds)
+
+    def observe_request(self, request_timing, method, route, blueprint, total_ms):
+        status = str(request_timing.status or 500)
+        self.requests.labels(blueprint, route, method, status).inc()
+        self.request_latency.labels(blueprint, route, method).observe(total_ms / 1000)
+        self.sample()
+
+    def cache_lookup(self, cache, hit):
+        self.cache.labels(cache, 'hit' if hit else 'miss').inc()
+
+    # ------------------------------------------------------------------
+    # Muestreo y exposición
+    # ------------------------------------------------------------------
+    def sample(self, force=False):
+        """Estado del pool y memoria del worker (como mucho cada ``METRICS_SAMPLE_INTERVAL``)"""
+        now = time.monotonic()
+        if not force and now - self._sampled_at < Config.METRICS_SAMPLE_INTERVAL:
+            return
+        if not self._lock.acquire(blocking=False):
+            return  # otro hilo ya está muestreando
+        try:
+            self._sampled_at = now
+            from utils.database import Database
+            stats = Database.pool_stats()
+            self.pool_connections.labels('sync', 'in_use').set(stats['in_use'])
+            self.pool_connections.labels('sync', 'idle').set(stats['idle'])
+            self.pool_max_size.labels('sync').set(stats['max_size'])
+            self.pool_waiting.set(stats['waiting'])
+            if Config.WEB_ASGI:
+                from utils.async_database import get_async_database
+                stats = get_async_database().stats()
+                self.pool_connections.labels('async', 'in_use').set(stats['size'] - stats['idle'])
+                self.pool_connections.labels('async', 'idle').set(stats['idle'])
+                self.pool_max_size.labels('async').set(stats['max_size'])
+            self.memory.set(resident_memory())
+        finally:
+            self._lock.release()
+
+    def generate(self):
+        """Texto de Prometheus con las métricas de todos los workers"""
+        self.sample(force=True)
+        if self.multiprocess:
+            from prometheus_client import multiprocess
+            registry = self.prom.CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+            return self.prom.generate_latest(registry)
+        return self.prom.generate_latest(self.registry)
+
+
+def resident_memory():
+    """Memoria residente del proceso en bytes"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0  # Windows
+    # Sin /proc (macOS): el máximo alcanzado, en bytes en macOS y en KB en el resto
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+_metrics = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics():
+    """Métricas del proceso (None si están desactivadas o falta prometheus_client)"""
+    global _metrics
+    if _metrics is None and Config.METRICS:
+        with _metrics_lock:
+            if _metrics is None:
+                try:
+                    _metrics = Metrics()
+                except ImportError:
+                    print("⚠️ METRICS activado pero prometheus_client no está instalado: /metrics desactivado")
+                    Config.METRICS = False
+    return _metrics
+
+
+def record_cache(cache, hit):
+    """Anotar un acierto o fallo de ``cache`` (sin efecto si no hay métricas)"""
+    if _metrics is not None:
+        _metrics.cache_lookup(cache, hit)
+
+
+@contextmanager
+def bcrypt_timer(operation):
+    """Medir una operación de bcrypt (``hash`` o ``verify``)"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if _metrics is not None:
+            _metrics.bcrypt.labels(operation).observe(time.perf_counter() - start)
+
+
+# ----------------------------------------------------------------------
+# Directorio compartido entre workers (gunicorn.conf.py)
+# ----------------------------------------------------------------------
+_prepared = False
+
+
+def prepare_multiprocess_dir():
+    """Fijar ``PROMETHEUS_MULTIPROC_DIR`` y vaciarlo antes de cargar la app.
+
+    Si no viene en el entorno se usa uno temporal del máster. Los ficheros de
+    una ejecución anterior se borran una sola vez: al recargar (HUP) gunicorn
+    vuelve a leer su configuración y los workers vivos siguen escribiendo ahí.
+    """
+    global _prepared
+    if _prepared:
+        return os.environ[MULTIPROC_ENV]
+    path = os.environ.get(MULTIPROC_ENV) or os.path.join(
+        tempfile.gettempdir(), f"presupuesto-metrics-{os.getpid()}")
+    if os.path.isdir(path):
+        for stale in glob.glob(os.path.join(path, '*.db')):
+            os.remove(stale)
+    else:
+        os.makedirs(path)
+    os.environ[MULTIPROC_ENV] = path
+    _prepared = True
+    return path
+
+
+def mark_process_dead(pid):
+    """Olvidar los gauges de un worker que terminó (child_exit)"""
+    if os.environ.get(MULTIPROC_ENV) and Config.METRICS:
+        try:
+            from prometheus_client import multiprocess
+            multiprocess.mark_process_dead(pid)
+        except ImportError:
+            pass
+
+
+def remove_multiprocess_dir():
+    """Borrar el directorio temporal al parar gunicorn (solo el que creó el máster)"""
+    path = os.environ.get(MULTIPROC_ENV, '')
+    if _prepared and os.path.basename(path) == f"presupuesto-metrics-{os.getpid()}":
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def init_app(app):
+    """Publicar ``/metrics`` (formato de texto de Prometheus).
+
+    Las métricas de peticiones y consultas salen de ``utils.timing``, que
+    debe estar activo (``REQUEST_TIMING``). Con ``METRICS_TOKEN`` la ruta
+    pide ``Authorization: Bearer <token>``.
+    """
+    metrics = get_metrics()
+    if metrics is None:
+        return
+
+    @app.route('/metrics')
+    def metrics_endpoint():
+        if Config.METRICS_TOKEN and request.headers.get('Authorization') != f"Bearer {Config.METRICS_TOKEN}":
+            return Response("No autorizado\n", status=401, mimetype='text/plain')
+        return Response(metrics.generate(), content_type=metrics.prom.CONTENT_TYPE_LATEST)
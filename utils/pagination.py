@@ -0,0 +1,64 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+
+from config import Config
+
+
+class InvalidCursor(ValueError):
+    """El cursor de paginación no es válido (manipulado o de otra versión)"""
+
+
+def encode_cursor(fecha, row_id):
+    """Cursor opaco con la posición (fecha, id) de la última fila de la página.
+
+    ``fecha`` puede ser ``date`` (fecha del movimiento) o ``datetime`` (fecha de registro).
+    """
+    payload = json.dumps([fecha.isoformat(), int(row_id)], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """Devuelve ``(fecha, id)`` o ``None`` si no hay cursor; lanza ``InvalidCursor``"""
+    if not token:
+        return None
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        fecha, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        value = datetime.fromisoformat(fecha) if 'T' in fecha else date.fromisoformat(fecha)
+        return value, int(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as e:
+        raise InvalidCursor(f"Cursor inválido: {token!r}") from e
+
+
+def page_size(value=None, default=None, maximum=None):
+    """Tamaño de página pedido, acotado a ``[1, maximum]``"""
+    default = default or Config.PAGE_SIZE_DEFAULT
+    maximum = maximum or Config.PAGE_SIZE_MAX
+    try:
+        size = int(value) if value not in (None, '') else default
+    except (TypeError, ValueError):
+        size = default
+    return max(1, min(size, maximum))
+
+
+def keyset_predicate(date_column, id_column, cursor):
+    """Filtro para continuar tras ``cursor`` en orden ``(fecha DESC, id DESC)``.
+
+    Se escribe como OR expandido en lugar de ``(fecha, id) < (%s, %s)`` para que
+    MySQL lo resuelva como rango sobre el índice (usuario_id, fecha[, id]).
+    """
+    fecha, row_id = cursor
+    sql = f"({date_column} < %s OR ({date_column} = %s AND {id_column} < %s))"
+    return sql, (fecha, fecha, row_id)
+
+
+def split_page(rows, limit, date_key='fecha', id_key='id'):
+    """Separar la página de la fila extra pedida (``limit + 1``) y calcular ``next``"""
+    rows = list(rows or [])
+    if len(rows) <= limit:
+        return rows, None
+    items = rows[:limit]
+    last = items[-1]
+    return items, encode_cursor(last[date_key], last[id_key])
@@ -0,0 +1,102 @@
+from datetime import date, datetime, timedelta
+
+
+class Period:
+    """Periodo semiabierto ``[start, end)`` para filtrar columnas de fecha.
+
+    Genera predicados ``columna >= inicio AND columna < fin`` en lugar de
+    ``MONTH(columna) = ... AND YEAR(columna) = ...``: al no envolver la columna en
+    una función, MySQL puede usar los índices compuestos (usuario_id, fecha).
+    """
+
+    def __init__(self, start, end):
+        start, end = _as_date(start), _as_date(end)
+        if end <= start:
+            raise ValueError(f"Periodo vacío: {start} - {end}")
+        self.start = start
+        self.end = end
+
+    @classmethod
+    def for_month(cls, year, month):
+        """Mes completo"""
+        start = date(int(year), int(month), 1)
+        return cls(start, _add_months(start, 1))
+
+    @classmethod
+    def for_quarter(cls, year, quarter):
+        """Trimestre completo (1-4)"""
+        if not 1 <= int(quarter) <= 4:
+            raise ValueError(f"Trimestre inválido: {quarter}")
+        start = date(int(year), (int(quarter) - 1) * 3 + 1, 1)
+        return cls(start, _add_months(start, 3))
+
+    @classmethod
+    def for_year(cls, year):
+        """Año completo"""
+        return cls(date(int(year), 1, 1), date(int(year) + 1, 1, 1))
+
+    @classmethod
+    def between(cls, start, end):
+        """Rango arbitrario; ``end`` es inclusivo (como en un formulario de fechas)"""
+        return cls(start, _as_date(end) + timedelta(days=1))
+
+    @classmethod
+    def last_days(cls, days, today=None):
+        """Últimos ``days`` días incluyendo hoy"""
+        today = _as_date(today or date.today())
+        return cls(today - timedelta(days=days - 1), today + timedelta(days=1))
+
+    @classmethod
+    def last_months(cls, months, today=None):
+        """Últimos ``months`` meses naturales incluyendo el actual"""
+        today = _as_date(today or date.today())
+        current = date(today.year, today.month, 1)
+        return cls(_add_months(current, 1 - months), _add_months(current, 1))
+
+    @classmethod
+    def from_month_args(cls, month=None, year=None):
+        """Periodo de un mes si se dan ``month`` y ``year``; si no, ``None``"""
+        if month and year:
+            return cls.for_month(year, month)
+        return None
+
+    @property
+    def month_aligned(self):
+        """True si empieza y termina en primero de mes (se puede servir por meses)"""
+        return self.start.day == 1 and self.end.day == 1
+
+    def previous(self):
+        """Periodo de la misma duración inmediatamente anterior"""
+        return Period(self.start - (self.end - self.start), self.start)
+
+    def predicate(self, column):
+        """Devuelve ``(sql, params)`` con el filtro semiabierto sobre ``column``"""
+        return f"{column} >= %s AND {column} < %s", (self.start, self.end)
+
+    def __eq__(self, other):
+        return isinstance(other, Period) and (self.start, self.end) == (other.start, other.end)
+
+    def __hash__(self):
+        return hash((self.start, self.end))
+
+    def __repr__(self):
+        return f"Period({self.start.isoformat()}, {self.end.isoformat()})"
+
+
+def month_start(value):
+    """Primer día del mes de una fecha (``date``, ``datetime`` o 'YYYY-MM-DD')"""
+    value = _as_date(value)
+    return date(value.year, value.month, 1)
+
+
+def _as_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value), '%Y-%m-%d').date()
+
+
+def _add_months(value, months):
+    index = value.year * 12 + (value.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
@@ -0,0 +1,99 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from config import Config
+from utils.database import Database
+from utils.timing import propagate
+
+
+class QueryDeadlineExceeded(Exception):
+    """Alguna consulta no terminó antes del límite de tiempo de la petición"""
+
+    def __init__(self, pending, timeout):
+        self.pending = sorted(pending)
+        super().__init__(
+            f"Consultas sin terminar tras {timeout:.2f}s: {', '.join(self.pending)}"
+        )
+
+
+class ParallelQueryExecutor:
+    """Ejecuta lecturas independientes en paralelo sobre un ThreadPoolExecutor acotado.
+
+    Cada tarea corre en su propio hilo y por tanto con su propia conexión del
+    pool (fuera de la sesión de la petición): solo debe usarse para lecturas que
+    no necesiten ver escrituras aún sin confirmar de la petición en curso.
+
+    Las tareas se pasan como ``{nombre: tarea}`` donde la tarea es un callable sin
+    argumentos o una tupla ``(query, params, modo)`` con modo ``'one'`` o ``'all'``.
+    """
+
+    def __init__(self, max_workers=None, db=None):
+        self.max_workers = max_workers or Config.QUERY_EXECUTOR_WORKERS
+        self.db = db or Database()
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+
+    def _get_executor(self):
+        # Los hilos no sobreviven a un fork: cada proceso crea su propio executor
+        if self._executor is None or self._pid != os.getpid():
+            with self._lock:
+                if self._executor is None or self._pid != os.getpid():
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix='consultas'
+                    )
+                    self._pid = os.getpid()
+        return self._executor
+
+    def _as_callable(self, task):
+        if callable(task):
+            return task
+        query, params, mode = task
+        if mode == 'one':
+            return lambda: self.db.execute_query(query, params, fetch_one=True)
+        if mode == 'all':
+            return lambda: self.db.execute_query(query, params, fetch=True)
+        raise ValueError(f"Modo de consulta desconocido: {mode}")
+
+    def run(self, tasks, timeout=None):
+        """Ejecutar las tareas y devolver ``{nombre: resultado}``.
+
+        Lanza ``QueryDeadlineExceeded`` si alguna no termina en ``timeout``
+        segundos (por defecto ``Config.QUERY_DEADLINE``) y relanza la primera
+        excepción de una tarea fallida.
+        """
+        if timeout is None:
+            timeout = Config.QUERY_DEADLINE
+        executor = self._get_executor()
+        deadline = time.monotonic() + timeout
+
+        # Los hilos no ven la petición, pero sus consultas cuentan en su Server-Timing
+        futures = {
+            executor.submit(propagate(self._as_callable(task))): name
+            for name, task in tasks.items()
+        }
+        done, pending = wait(futures, timeout=max(0, deadline - time.monotonic()))
+
+        if pending:
+            for future in pending:
+                future.cancel()
+            raise QueryDeadlineExceeded([futures[f] for f in pending], timeout)
+
+        return {futures[future]: future.result() for future in done}
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_query_executor():
+    """Executor compartido por el proceso"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ParallelQueryExecutor()
+    return _executor
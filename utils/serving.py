@@ -0,0 +1,67 @@
+import os
+import time
+
+from config import Config
+from utils import cache
+from utils.database import Database, get_pool
+
+
+def worker_plan(cpu_count=None):
+    """Procesos e hilos de gunicorn según las CPU y el pool de conexiones.
+
+    - Procesos: ``2 × CPU + 1``, sin pasar de ``WEB_MAX_WORKERS`` ni de los
+      pools completos (con ``WEB_ASGI``, también el asíncrono) que caben en
+      ``DB_MAX_CONNECTIONS``.
+    - Hilos: uno por conexión del pool, descontando las que reservan las
+      lecturas en paralelo (``QUERY_EXECUTOR_WORKERS``); así un hilo no se
+      queda esperando conexión mientras otra petición la tiene.
+
+    ``WEB_CONCURRENCY`` y ``WEB_THREADS`` mandan si están puestos.
+    """
+    cpus = cpu_count or os.cpu_count() or 1
+    pool_size = Config.DB_POOL_MAX_SIZE
+    # Con ASGI cada worker tiene además el pool asíncrono de las APIs
+    connections = pool_size + (Config.ASYNC_DB_POOL_MAX_SIZE if Config.WEB_ASGI else 0)
+    workers = Config.WEB_WORKERS or max(1, min(2 * cpus + 1, Config.WEB_MAX_WORKERS,
+                                               Config.DB_MAX_CONNECTIONS // connections))
+    reserved = Config.QUERY_EXECUTOR_WORKERS if Config.QUERY_FANOUT else 0
+    threads = Config.WEB_THREADS or max(2, pool_size - reserved)
+    return {'cpus': cpus, 'workers': workers, 'threads': threads, 'db_connections': workers * connections}
+
+
+def reset_after_fork():
+    """Estado propio de cada worker (post_fork): pool de conexiones y caché"""
+    Database.reset_pool()
+    cache.reset_after_fork()
+
+
+def warm_up(app):
+    """Dejar listo un worker antes de que acepte tráfico: conexiones del pool,
+    catálogo de categorías y plantillas compiladas. Un paso que falle solo se
+    registra; la petición que lo necesite lo volverá a intentar."""
+    from models.category import get_category_catalog
+
+    def compile_templates():
+        for name in app.jinja_env.list_templates(extensions=('html',)):
+            app.jinja_env.get_template(name)
+
+    start = time.perf_counter()
+    done = []
+    for name, step in (('conexiones', get_pool().fill),
+                       ('categorías', get_category_catalog().warm),
+                       ('plantillas', compile_templates)):
+        try:
+            step()
+            done.append(name)
+        except Exception as e:
+            print(f"⚠️ Calentamiento de {name} falló: {e}")
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"🔥 Worker {os.getpid()} listo en {elapsed:.0f} ms ({', '.join(done) or 'sin calentar'})")
+
+
+def close_connections():
+    """Cerrar las conexiones ociosas al salir un worker (recarga o parada)"""
+    try:
+        get_pool().close_all()
+    except Exception as e:
+        print(f"⚠️ Error cerrando conexiones: {e}")
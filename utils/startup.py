@@ -0,0 +1,60 @@
+import os
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Mediana máxima de ``import app`` en un intérprete nuevo, en milisegundos
+# (benchmarks/cold_start_budget.py y tests/test_cold_start.py)
+COLD_START_BUDGET_MS = float(os.getenv('COLD_START_BUDGET_MS', 1000))
+
+# Se mide dentro del intérprete hijo para no contar el arranque de Python
+_COLD_START_PROBE = (
+    "import time; start = time.perf_counter(); import app; "
+    "print('COLD_START_MS', (time.perf_counter() - start) * 1000)"
+)
+
+
+class StartupProfile:
+    """Tiempo de cada fase de ``create_app`` (se guarda en ``app.extensions``
+    y se imprime en una línea al terminar el arranque)"""
+
+    def __init__(self):
+        self._started = time.perf_counter()
+        self.steps = []    # (fase, milisegundos)
+
+    @contextmanager
+    def step(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps.append((name, (time.perf_counter() - start) * 1000))
+
+    @property
+    def total_ms(self):
+        return (time.perf_counter() - self._started) * 1000
+
+    def as_dict(self):
+        return {'total_ms': round(self.total_ms, 1), 'fases_ms': {name: round(ms, 1) for name, ms in self.steps}}
+
+    def report(self):
+        steps = " · ".join(f"{name} {ms:.1f}" for name, ms in self.steps)
+        return f"{self.total_ms:.1f} ms ({steps})"
+
+
+def measure_cold_start(runs=5):
+    """Milisegundos de ``import app`` (import de módulos + ``create_app``) en
+    ``runs`` intérpretes nuevos; RuntimeError si la app no se puede importar"""
+    timings = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-c', _COLD_START_PROBE], cwd=ROOT, capture_output=True, text=True)
+        for line in result.stdout.splitlines():
+            if line.startswith('COLD_START_MS'):
+                timings.append(float(line.split()[1]))
+                break
+        else:
+            raise RuntimeError(f"No se pudo importar la app:\n{result.stderr[-2000:]}")
+    return timings
@@ -0,0 +1,317 @@
+import bisect
+import threading
+import time
+from contextvars import ContextVar, copy_context
+from functools import wraps
+
+from flask import request
+from flask.json.provider import DefaultJSONProvider
+from flask.signals import before_render_template, template_rendered
+
+from config import Config
+
+# Límites (ms) de los cubos del histograma de latencias; el último es +inf
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Endpoints que no se miden (ficheros estáticos)
+SKIPPED_ENDPOINTS = {'static', 'assets'}
+
+_current = ContextVar('request_timing', default=None)
+
+# Quién más quiere cada medición (utils.metrics): tipo -> funciones
+_observers = {'query': [], 'pool_wait': [], 'request': []}
+
+
+class RequestTiming:
+    """Tiempos de una petición: total, base de datos, plantillas y JSON.
+
+    Las consultas pueden llegar desde los hilos de ``utils.query_executor``
+    (con ``propagate``), por eso los contadores van con lock.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_count = 0
+        self.db_ms = 0.0
+        self.pool_wait_ms = 0.0
+        self.render_count = 0
+        self.render_ms = 0.0
+        self.serialize_ms = 0.0
+        self.status = None
+        self._render_starts = []
+        self._lock = threading.Lock()
+
+    @property
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def add_query(self, seconds, count=1):
+        with self._lock:
+            self.db_count += count
+            self.db_ms += seconds * 1000
+
+    def add_pool_wait(self, seconds):
+        with self._lock:
+            self.pool_wait_ms += seconds * 1000
+
+    def add_serialize(self, seconds):
+        with self._lock:
+            self.serialize_ms += seconds * 1000
+
+    def render_started(self):
+        self._render_starts.append(time.perf_counter())
+
+    def render_finished(self):
+        if self._render_starts:
+            # Plantillas anidadas (render_template dentro de otra): solo cuenta la exterior
+            started = self._render_starts.pop()
+            if not self._render_starts:
+                self.render_count += 1
+                self.render_ms += (time.perf_counter() - started) * 1000
+
+    def server_timing(self, total_ms=None):
+        """Valor de la cabecera ``Server-Timing``"""
+        total_ms = self.elapsed_ms if total_ms is None else total_ms
+        parts = [f'db;dur={self.db_ms:.1f};desc="{self.db_count} consultas"']
+        if self.pool_wait_ms >= 0.1:
+            parts.append(f'pool;dur={self.pool_wait_ms:.1f};desc="espera de conexión"')
+        if self.render_count:
+            parts.append(f'tpl;dur={self.render_ms:.1f};desc="plantillas"')
+        if self.serialize_ms:
+            parts.append(f'json;dur={self.serialize_ms:.1f};desc="JSON"')
+        parts.append(f'total;dur={total_ms:.1f}')
+        return ', '.join(parts)
+
+    def log_line(self, method, route, total_ms):
+        """Línea de log ``clave=valor`` de la petición"""
+        return (f"⏱️ method={method} ruta={route} status={self.status or '-'} total_ms={total_ms:.1f} "
+                f"db_ms={self.db_ms:.1f} db_consultas={self.db_count} pool_ms={self.pool_wait_ms:.1f} "
+                f"tpl_ms={self.render_ms:.1f} json_ms={self.serialize_ms:.1f}")
+
+
+def current_timing():
+    """Medición de la petición en curso (None fuera de una petición medida)"""
+    return _current.get()
+
+
+def add_observer(kind, func):
+    """Avisar a ``func`` de cada consulta (``'query'``: segundos, sentencias),
+    espera por conexión (``'pool_wait'``: segundos) o petición medida
+    (``'request'``: medición, método, ruta, blueprint, ms), dentro o fuera de
+    una petición salvo las últimas"""
+    _observers[kind].append(func)
+
+
+def record_query(seconds, count=1):
+    """Sumar una consulta a la petición en curso (lo llaman los cursores)"""
+    timing = _current.get()
+    if timing is not None:
+        timing.add_query(seconds, count)
+    for observer in _observers['query']:
+        observer(seconds, count)
+
+
+def record_pool_wait(seconds):
+    """Sumar la espera por una conexión del pool a la petición en curso"""
+    timing = _current.get()
+    if timing is not None and seconds:
+        timing.add_pool_wait(seconds)
+    for observer in _observers['pool_wait']:
+        observer(seconds)
+
+
+def propagate(func):
+    """Envolver ``func`` para que, en otro hilo, sume sus consultas a la petición
+    actual. Solo se copia la medición, no el contexto de Flask: el hilo no debe
+    compartir la sesión de base de datos de la petición."""
+    timing = _current.get()
+    if timing is None:
+        return func
+
+    @wraps(func)
+    def run_with_timing():
+        # Contexto nuevo (no el de Flask) con solo la medición
+        return copy_context().run(_run_with, timing, func)
+    return run_with_timing
+
+
+def _run_with(timing, func):
+    token = _current.set(timing)
+    try:
+        return func()
+    finally:
+        _current.reset(token)
+
+
+class RouteLatencies:
+    """Histograma de latencias por ruta en una ventana deslizante.
+
+    La ventana de ``window`` segundos se parte en ``slots`` franjas; cada
+    franja guarda sus propios cubos y se reutiliza cuando pasa su turno, así
+    la memoria no crece y los datos viejos salen solos. Es de cada proceso.
+    """
+
+    def __init__(self, window=None, slots=30, buckets=LATENCY_BUCKETS_MS):
+        self.window = window or Config.REQUEST_TIMING_WINDOW
+        self.slots = slots
+        self.slot_seconds = self.window / slots
+        self.buckets = tuple(buckets)
+        self._slot_ids = [None] * slots
+        self._data = [{} for _ in range(slots)]
+        self._lock = threading.Lock()
+
+    def _slot_id(self):
+        return int(time.monotonic() // self.slot_seconds)
+
+    def record(self, route, ms):
+        slot_id = self._slot_id()
+        index = slot_id % self.slots
+        bucket = bisect.bisect_left(self.buckets, ms)   # primer límite >= ms (o +inf)
+        with self._lock:
+            if self._slot_ids[index] != slot_id:
+                self._slot_ids[index] = slot_id
+                self._data[index] = {}
+            stats = self._data[index].get(route)
+            if stats is None:
+                # [cubos..., +inf], número, suma, máximo
+                stats = self._data[index][route] = [[0] * (len(self.buckets) + 1), 0, 0.0, 0.0]
+            stats[0][bucket] += 1
+            stats[1] += 1
+            stats[2] += ms
+            if ms > stats[3]:
+                stats[3] = ms
+
+    def snapshot(self):
+        """``{ruta: {count, avg_ms, p50_ms, p95_ms, p99_ms, max_ms}}`` de la ventana,
+        de la ruta más pedida a la menos. Los percentiles son el límite del cubo."""
+        oldest = self._slot_id() - self.slots
+        merged = {}
+        with self._lock:
+            for slot_id, data in zip(self._slot_ids, self._data):
+                if slot_id is None or slot_id <= oldest:
+                    continue
+                for route, (counts, count, total, maximum) in data.items():
+                    acc = merged.setdefault(route, [[0] * (len(self.buckets) + 1), 0, 0.0, 0.0])
+                    acc[0] = [a + b for a, b in zip(acc[0], counts)]
+                    acc[1] += count
+                    acc[2] += total
+                    acc[3] = max(acc[3], maximum)
+
+        result = {}
+        for route, (counts, count, total, maximum) in sorted(merged.items(), key=lambda item: -item[1][1]):
+            result[route] = {
+                'count': count,
+                'avg_ms': round(total / count, 1),
+                'p50_ms': self._percentile(counts, count, 0.50, maximum),
+                'p95_ms': self._percentile(counts, count, 0.95, maximum),
+                'p99_ms': self._percentile(counts, count, 0.99, maximum),
+                'max_ms': round(maximum, 1),
+            }
+        return result
+
+    def _percentile(self, counts, count, q, maximum):
+        target = q * count
+        seen = 0
+        for i, bucket_count in enumerate(counts):
+            seen += bucket_count
+            if seen >= target:
+                # El cubo +inf (o uno más ancho que el máximo visto) se acota con el máximo
+                limit = self.buckets[i] if i < len(self.buckets) else maximum
+                return round(min(limit, maximum), 1)
+        return round(maximum, 1)
+
+    def clear(self):
+        with self._lock:
+            self._slot_ids = [None] * self.slots
+            self._data = [{} for _ in range(self.slots)]
+
+
+_latencies = None
+_latencies_lock = threading.Lock()
+
+
+def get_route_latencies():
+    """Histograma de latencias por ruta del proceso"""
+    global _latencies
+    if _latencies is None:
+        with _latencies_lock:
+            if _latencies is None:
+                _latencies = RouteLatencies()
+    return _latencies
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """Proveedor JSON de Flask que suma el tiempo de serializar a la petición"""
+
+    def dumps(self, obj, **kwargs):
+        timing = _current.get()
+        if timing is None:
+            return super().dumps(obj, **kwargs)
+        start = time.perf_counter()
+        try:
+            return super().dumps(obj, **kwargs)
+        finally:
+            timing.add_serialize(time.perf_counter() - start)
+
+
+def route_name():
+    """Ruta de la petición en curso tal como está registrada (``/budgets/<int:id>``)"""
+    rule = request.url_rule
+    return rule.rule if rule is not None else '<sin ruta>'
+
+
+def init_app(app):
+    """Medir cada petición: cabecera ``Server-Timing``, línea de log y
+    histograma de latencias por ruta (``get_route_latencies``).
+
+    Registrarlo antes que ``utils.database.init_app``: los ``after_request`` y
+    ``teardown_request`` corren en orden inverso y así el total (también el de
+    la cabecera) incluye el commit de la petición.
+    """
+    if not Config.REQUEST_TIMING:
+        return
+
+    app.json = TimedJSONProvider(app)
+
+    @app.before_request
+    def start_request_timing():
+        if request.endpoint not in SKIPPED_ENDPOINTS:
+            _current.set(RequestTiming())
+
+    @app.after_request
+    def add_server_timing(response):
+        timing = _current.get()
+        if timing is not None:
+            timing.status = response.status_code
+            if Config.REQUEST_TIMING_HEADER:
+                response.headers['Server-Timing'] = timing.server_timing()
+        return response
+
+    @app.teardown_request
+    def finish_request_timing(exc):
+        timing = _current.get()
+        if timing is None:
+            return
+        _current.set(None)
+        if exc is not None:
+            timing.status = 500
+        total_ms = timing.elapsed_ms
+        route = route_name()
+        get_route_latencies().record(f"{request.method} {route}", total_ms)
+        for observer in _observers['request']:
+            observer(timing, request.method, route, request.blueprint or 'app', total_ms)
+        if Config.REQUEST_TIMING_LOG:
+            print(timing.log_line(request.method, route, total_ms))
+
+    def on_render_start(sender, **extra):
+        timing = _current.get()
+        if timing is not None:
+            timing.render_started()
+
+    def on_render_end(sender, **extra):
+        timing = _current.get()
+        if timing is not None:
+            timing.render_finished()
+
+    before_render_template.connect(on_render_start, app, weak=False)
+    template_rendered.connect(on_render_end, app, weak=False)